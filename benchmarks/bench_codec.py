@@ -0,0 +1,61 @@
+"""Decode and encode cost of the available JSON codecs.
+
+usage: python benchmarks/bench_codec.py [--frames N] [--repeat N]
+"""
+
+import argparse
+import json
+import sys
+import timeit
+
+from common import ROOT, load_dcl2_messages, synthetic_match
+
+sys.path.insert(0, str(ROOT))
+
+from dc3client.codec import CODECS
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    recorded = load_dcl2_messages()
+    updates = [m for m in recorded if b'"cmd":"update"' in m]
+    trajectory = [
+        json.dumps(m, separators=(",", ":")).encode()
+        for m in synthetic_match(n_ends=1, extra_ends=0, n_frames=args.frames)
+    ]
+    payloads = {
+        "dcl2 all": recorded,
+        "dcl2 update": updates,
+        "trajectory update": trajectory,
+    }
+
+    print(
+        f"{'codec':<8} {'payload':<18} {'msgs':>5} {'MB':>7} {'us/msg':>10} {'MB/s':>8}"
+    )
+    for name, codec_type in CODECS.items():
+        try:
+            codec = codec_type()
+        except ImportError:
+            print(f"{name:<8} not installed")
+            continue
+        for label, messages in payloads.items():
+            size = sum(len(m) for m in messages) / 1e6
+            seconds = min(
+                timeit.repeat(
+                    lambda: [codec.loads(m) for m in messages],
+                    number=1,
+                    repeat=args.repeat,
+                )
+            )
+            print(
+                f"{name:<8} {label:<18} {len(messages):>5} {size:>7.2f} "
+                f"{seconds / len(messages) * 1e6:>10.1f} {size / seconds:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Memory retained by match_data.update_list for a long match with trajectories.
+
+Feeds every update of a synthetic 10-end match plus extra ends, each carrying a
+full trajectory, to a client and reports the memory still allocated once the
+received messages are gone, for each of the client options in CONFIGS.
+The columnar models are the compact ones with NumPy trajectories. The lazy
+models keep the raw messages and decode the trajectories again on access.
+"endpoints" and "drop" reduce the trajectories while parsing, and "history"
+keeps the last 16 updates in memory and the rest in a journal on disk.
+The board of a state is built on first access, the "+board" rows read the
+board of every update to show what those arrays cost on top of the models.
+
+usage: python benchmarks/bench_memory.py [--ends N] [--extra-ends N] [--frames N]
+"""
+
+import argparse
+import gc
+import logging
+import sys
+import time
+import tracemalloc
+
+from common import ROOT, synthetic_match
+
+sys.path.insert(0, str(ROOT))
+
+from dc3client import SocketClient
+from dc3client.codec import default_codec
+
+# SocketClient options of each row
+CONFIGS: dict[str, dict] = {
+    "default": {},
+    "compact": {"compact": True},
+    "columnar": {"compact": True, "columnar": True},
+    "lazy": {"lazy": True},
+    "endpoints": {"trajectory": "endpoints"},
+    "drop": {"trajectory": "drop"},
+    "history": {"history": 16},
+}
+# Rows that also build the board of every update
+BOARD_CONFIGS = ("default", "compact")
+
+
+def retained(
+    messages: list[bytes], boards: bool = False, **options
+) -> tuple[int, float]:
+    """bytes kept by the update list after receiving every message
+
+    Args:
+        messages (list[bytes]): Update messages on the wire.
+        boards (bool, optional): Build the board of every update too. Defaults to False.
+        **options: SocketClient options.
+
+    Returns:
+        tuple[int, float]: retained bytes and seconds spent parsing
+    """
+    cli = SocketClient(auto_start=False, **options)
+    cli.logger.setLevel(logging.WARNING)
+    cli.is_connected = True
+
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    for message in messages:
+        raw = bytes(memoryview(message))  # a fresh copy, as the framer returns
+        cli._handle_update(default_codec.loads(raw), raw)
+    if boards:
+        for update in cli.match_data.update_list:
+            update.state.board
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ends", type=int, default=10)
+    parser.add_argument("--extra-ends", type=int, default=1)
+    parser.add_argument("--frames", type=int, default=2000)
+    args = parser.parse_args()
+
+    messages = [
+        default_codec.dumps(m)
+        for m in synthetic_match(args.ends, args.extra_ends, args.frames)
+    ]
+    wire = sum(len(m) for m in messages)
+    print(f"{len(messages)} updates, {wire / 1e6:.1f} MB on the wire")
+    print(f"{'models':<13} {'MB':>8} {'bytes/update':>13} {'parse s':>8}")
+    rows = [(label, False, options) for label, options in CONFIGS.items()]
+    rows += [(f"{label}+board", True, CONFIGS[label]) for label in BOARD_CONFIGS]
+    for label, boards, options in rows:
+        size, elapsed = retained(messages, boards, **options)
+        print(
+            f"{label:<13} {size / 1e6:>8.1f} {size / len(messages):>13.0f} "
+            f"{elapsed:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""End-to-end latency and throughput of SocketClient against the replay server.
+
+usage: python benchmarks/bench_replay.py [--games N] [--send-queue] [--multiplex] [--json]
+
+With --multiplex the games run at once on a MatchMultiplexer, with a short
+update history, and the updates spilled to disk are read back and checked
+against the log after every match is over.
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import time
+
+from common import LOG_PATH, ROOT, load_dcl2_messages
+
+sys.path.insert(0, str(ROOT))
+
+from dc3client import MatchMultiplexer, SocketClient
+from dc3client.codec import default_codec
+from dc3client.fake_server import ReplayServer
+from dc3client.protocol import parse_update
+from dc3client.serialize import to_dict
+
+# Updates kept in memory by the multiplexed clients, the others are spilled
+HISTORY = 4
+
+
+def play(host: str, port: int, send_queue: bool) -> SocketClient:
+    cli = SocketClient(host=host, port=port, rate_limit=0.0, send_queue=send_queue)
+    cli.logger.setLevel(logging.WARNING)
+    my_team = cli.get_my_team()
+    while True:
+        cli.update()
+        if cli.get_winner() is not None:
+            break
+        if cli.get_next_team() == my_team:
+            cli.move(x=0.0, y=2.4)
+    cli.close()
+    return cli
+
+
+def play_multiplexed(host: str, port: int, games: int) -> list[SocketClient]:
+    def on_update(cli: SocketClient, update) -> None:
+        if update.state.game_result.winner is None:
+            if update.next_team == cli.get_my_team():
+                cli.move(x=0.0, y=2.4)
+
+    mux = MatchMultiplexer(log_level=logging.WARNING)
+    for _ in range(games):
+        cli = SocketClient(
+            host=host, port=port, auto_start=False, rate_limit=0.0, history=HISTORY
+        )
+        cli.logger.setLevel(logging.WARNING)
+        mux.add(cli, on_update)
+    clients = mux.run()
+
+    # a finished match must still serve its spilled updates
+    expected = [
+        to_dict(parse_update(message))
+        for message in map(default_codec.loads, load_dcl2_messages())
+        if message["cmd"] == "update"
+    ]
+    for cli in clients:
+        updates, _ = cli.get_update_and_trajectory(remove_trajectory=False)
+        assert cli.match_data.update_list.in_memory == HISTORY
+        assert [to_dict(update) for update in updates] == expected
+        cli.close()
+    return clients
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--send-queue", action="store_true")
+    parser.add_argument("--multiplex", action="store_true")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    with ReplayServer(LOG_PATH, log_level=logging.WARNING) as server:
+        started = time.perf_counter()
+        received = 0
+        messages = 0
+        if args.multiplex:
+            clients = play_multiplexed(*server.address, args.games)
+        else:
+            clients = [
+                play(*server.address, args.send_queue) for _ in range(args.games)
+            ]
+        for cli in clients:
+            stats = cli.get_receive_stats()
+            received += stats.bytes_received
+            messages += stats.messages_received
+        elapsed = time.perf_counter() - started
+
+    latencies = sorted(server.latencies)
+    result = {
+        "games": args.games,
+        "seconds": elapsed,
+        "messages_per_second": messages / elapsed,
+        "bytes_per_second": received / elapsed,
+        "latency_p50_us": statistics.median(latencies) * 1e6,
+        "latency_p99_us": latencies[int(len(latencies) * 0.99)] * 1e6,
+        "latency_max_us": latencies[-1] * 1e6,
+    }
+    if args.json:
+        print(json.dumps(result))
+    else:
+        for key, value in result.items():
+            print(f"{key:<22} {value:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
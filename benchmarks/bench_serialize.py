@@ -0,0 +1,94 @@
+"""Generated serializers against the hand-written ones they replaced.
+
+Parses and converts the updates of a synthetic match with full trajectories
+with the functions generated by dc3client.serialize and with the previous
+hand-written parse_update(), convert_update() and convert_trajectory() kept in
+legacy.py, and reports the time per update of each and the speedup.
+
+The speedup varies between runs and machines. With the default arguments
+convert_update was measured between 2.8x and 5.3x faster, parse_update between
+0.9x and 1.2x, so parsing is not faster than before.
+
+usage: python benchmarks/bench_serialize.py [--frames N] [--repeat N]
+"""
+
+import argparse
+import sys
+import timeit
+from dataclasses import replace
+
+from common import ROOT, synthetic_match
+
+sys.path.insert(0, str(ROOT))
+
+import legacy
+from dc3client.models import Update
+from dc3client.serialize import decoder, encoder, to_dict
+
+
+def flatten_frames(update: Update) -> Update:
+    """update with the frames in one list, the layout of the legacy parser"""
+    trajectory = update.last_move.trajectory
+    frames = [frame for step in trajectory.frames for frame in step]
+    return replace(
+        update,
+        last_move=replace(
+            update.last_move, trajectory=replace(trajectory, frames=frames)
+        ),
+    )
+
+
+def legacy_to_message(update: Update) -> dict:
+    """previous conversion of an update with its trajectory"""
+    message = legacy.convert_update(update, remove_trajectory=True)
+    message["last_move"]["trajectory"] = legacy.convert_trajectory(
+        update.last_move.trajectory
+    )
+    return message
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    messages = [
+        m
+        for m in synthetic_match(n_ends=1, extra_ends=0, n_frames=args.frames)
+        if m["last_move"] is not None
+    ]
+    updates = [decoder(Update)(m) for m in messages]
+    # the frames keep one list per step, several stones move in a step
+    assert all(to_dict(u) == m for u, m in zip(updates, messages))
+    legacy_updates = [legacy.parse_update(m) for m in messages]
+    assert [flatten_frames(u) for u in updates] == legacy_updates
+
+    encode = encoder(Update)
+    decode = decoder(Update)
+    cases = {
+        "parse_update": (
+            lambda: [legacy.parse_update(m) for m in messages],
+            lambda: [decode(m) for m in messages],
+        ),
+        "convert_update": (
+            lambda: [legacy_to_message(u) for u in legacy_updates],
+            lambda: [encode(u) for u in updates],
+        ),
+    }
+
+    print(f"{len(messages)} updates, {args.frames} frames per trajectory")
+    print(f"{'case':<16} {'legacy ms':>10} {'generated ms':>13} {'speedup':>8}")
+    for name, (before, after) in cases.items():
+        times = [
+            min(timeit.repeat(run, number=1, repeat=args.repeat)) / len(messages)
+            for run in (before, after)
+        ]
+        print(
+            f"{name:<16} {times[0] * 1e3:>10.2f} {times[1] * 1e3:>13.2f} "
+            f"{times[0] / times[1]:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
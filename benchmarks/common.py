@@ -0,0 +1,139 @@
+"""Recorded and synthetic messages shared by the benchmarks."""
+
+import json
+import pathlib
+import random
+from typing import Any
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+LOG_PATH = next(ROOT.joinpath("data", "logs").glob("*/game.dcl2"))
+
+
+def load_dcl2_messages(path: pathlib.Path = LOG_PATH) -> list[bytes]:
+    """read the messages of a .dcl2 log as the server sends them on the wire
+
+    Args:
+        path (pathlib.Path, optional): .dcl2 log. Defaults to the bundled log.
+
+    Returns:
+        list[bytes]: one compact JSON message per record
+    """
+    messages = []
+    with open(path, "rb") as f:
+        for line in f:
+            if line.startswith(b"#") or not line.strip():
+                continue
+            record = json.loads(line)
+            messages.append(json.dumps(record["log"], separators=(",", ":")).encode())
+    return messages
+
+
+def _stone(rng: random.Random, y: float | None = None) -> dict[str, Any]:
+    return {
+        "angle": rng.uniform(-180.0, 180.0),
+        "position": {
+            "x": rng.uniform(-2.0, 2.0),
+            "y": rng.uniform(34.0, 40.0) if y is None else y,
+        },
+    }
+
+
+def _stones(rng: random.Random, shot: int) -> dict[str, list]:
+    return {
+        team: [_stone(rng) if i < (shot + 1 - t) // 2 else None for i in range(8)]
+        for t, team in enumerate(("team0", "team1"))
+    }
+
+
+def synthetic_update(
+    end: int = 0,
+    shot: int = 1,
+    n_frames: int = 2000,
+    seconds_per_frame: float = 0.001,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """build an update message whose last move carries a full trajectory
+
+    The thrown stone moves in every frame and, after a collision half way, one
+    more stone moves too, which is the typical shape of a takeout.
+
+    Args:
+        end (int, optional): Current end. Defaults to 0.
+        shot (int, optional): Current shot. Defaults to 1.
+        n_frames (int, optional): Number of trajectory frames. Defaults to 2000.
+        seconds_per_frame (float, optional): Frame interval. Defaults to 0.001.
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        dict[str, Any]: update message
+    """
+    rng = random.Random(seed)
+    start = _stones(rng, shot - 1)
+    finish = _stones(rng, shot)
+    team = "team0" if (shot - 1) % 2 == 0 else "team1"
+    index = (shot - 1) // 2
+
+    frames = []
+    for f in range(n_frames):
+        frame = [
+            {
+                "team": team,
+                "index": index,
+                "value": _stone(rng, y=38.0 * (f + 1) / n_frames),
+            }
+        ]
+        if f > n_frames // 2 and start["team0"][0] is not None:
+            frame.append({"team": "team0", "index": 0, "value": _stone(rng)})
+        frames.append(frame)
+
+    return {
+        "cmd": "update",
+        "last_move": {
+            "actual_move": {
+                "rotation": "ccw",
+                "type": "shot",
+                "velocity": {"x": rng.uniform(-0.2, 0.2), "y": 2.4},
+            },
+            "free_guard_zone_foul": False,
+            "trajectory": {
+                "seconds_per_frame": seconds_per_frame,
+                "start": start,
+                "finish": finish,
+                "frames": frames,
+            },
+        },
+        "next_team": "team1" if team == "team0" else "team0",
+        "state": {
+            "end": end,
+            "extra_end_score": {"team0": None, "team1": None},
+            "game_result": None,
+            "hammer": "team1",
+            "scores": {
+                "team0": [0] * end + [None] * (10 - end),
+                "team1": [1] * end + [None] * (10 - end),
+            },
+            "shot": shot,
+            "stones": finish,
+            "thinking_time_remaining": {"team0": 200.0, "team1": 200.0},
+        },
+    }
+
+
+def synthetic_match(
+    n_ends: int = 10, extra_ends: int = 1, n_frames: int = 2000
+) -> list[dict[str, Any]]:
+    """build every update message of a long match with full trajectories
+
+    Args:
+        n_ends (int, optional): Number of regular ends. Defaults to 10.
+        extra_ends (int, optional): Number of extra ends. Defaults to 1.
+        n_frames (int, optional): Number of trajectory frames per shot. Defaults to 2000.
+
+    Returns:
+        list[dict[str, Any]]: update messages
+    """
+    return [
+        synthetic_update(end, shot, n_frames, seed=end * 16 + shot)
+        for end in range(n_ends + extra_ends)
+        for shot in range(1, 17)
+    ]
@@ -0,0 +1,594 @@
+"""Hand-written parsers and converters that serialize.py replaced, kept as the
+baseline of bench_serialize.py.
+
+convert_update() of this version fails on a trajectory, the benchmark converts
+the trajectory with convert_trajectory() instead.
+"""
+
+from dataclasses import fields
+from typing import Any
+
+from dc3client.board import parse_board
+from dc3client.models import (
+    ActualMove,
+    Concede,
+    Coordinate,
+    ExtraEndScore,
+    Finish,
+    Frame,
+    GameResult,
+    LastMove,
+    Position,
+    Scores,
+    Start,
+    State,
+    Stones,
+    ThinkingTimeRemaining,
+    Trajectory,
+    Update,
+    Velocity,
+)
+
+
+def parse_stones(message_recv: list) -> list[Coordinate]:
+    """Convert stone positions to data class
+
+    Args:
+        message_recv (list): List of stone positions
+
+    Returns:
+        list[Coordinate]: List of data classes for stone positions
+    """
+    team_stone: list[Coordinate] = []
+    for data in message_recv:
+        if data is None:
+            team_stone.append(
+                Coordinate(angle=None, position=[Position(x=None, y=None)])
+            )
+
+        else:
+            team_stone.append(
+                Coordinate(
+                    angle=data["angle"],
+                    position=[
+                        Position(x=data["position"]["x"], y=data["position"]["y"])
+                    ],
+                )
+            )
+
+    return team_stone
+
+
+def parse_state(state_recv: dict[str, Any]) -> State:
+    """Convert the state of an update message to data class
+
+    Args:
+        state_recv (dict[str, Any]): "state" of the update message
+
+    Returns:
+        State: match state
+    """
+    if state_recv["game_result"] is None:
+        winner = None
+        reason = None
+    else:
+        winner = state_recv["game_result"]["winner"]
+        reason = state_recv["game_result"]["reason"]
+
+    game_result = GameResult(
+        winner=winner,
+        reason=reason,
+    )
+
+    extra_end_score = ExtraEndScore(
+        team0=state_recv["extra_end_score"]["team0"],
+        team1=state_recv["extra_end_score"]["team1"],
+    )
+
+    scores = Scores(
+        team0=state_recv["scores"]["team0"],
+        team1=state_recv["scores"]["team1"],
+    )
+
+    stones = Stones(
+        team0=parse_stones(state_recv["stones"]["team0"]),
+        team1=parse_stones(state_recv["stones"]["team1"]),
+    )
+
+    thinking_time_remaining = ThinkingTimeRemaining(
+        team0=state_recv["thinking_time_remaining"]["team0"],
+        team1=state_recv["thinking_time_remaining"]["team1"],
+    )
+
+    state = State(
+        end=state_recv["end"],
+        extra_end_score=extra_end_score,
+        game_result=game_result,
+        hammer=state_recv["hammer"],
+        scores=scores,
+        shot=state_recv["shot"],
+        stones=stones,
+        thinking_time_remaining=thinking_time_remaining,
+    )
+    # this version built the board of every state
+    state._board = parse_board(state_recv["stones"])
+    return state
+
+
+def parse_actual_move(move_recv: dict[str, Any]) -> ActualMove | Concede:
+    """Convert the actual move of the last move to data class
+
+    Args:
+        move_recv (dict[str, Any]): "actual_move" of the last move
+
+    Returns:
+        ActualMove | Concede: shot or concede
+    """
+    cmd_type = move_recv["type"]
+    if cmd_type == "shot":
+        velocity = Velocity(x=move_recv["velocity"]["x"], y=move_recv["velocity"]["y"])
+
+        return ActualMove(
+            rotation=move_recv["rotation"],
+            type=cmd_type,
+            velocity=velocity,
+        )
+
+    # cmd_type == "concede"
+    if cmd_type != "concede":
+        raise Exception(f"cmd_type is not concede. cmd_type : {cmd_type}")
+    return Concede()
+
+
+def parse_trajectory(last_move_recv: dict[str, Any]) -> Trajectory:
+    """Convert the trajectory of the last move to data class
+
+    Args:
+        last_move_recv (dict[str, Any]): "last_move" of the update message
+
+    Returns:
+        Trajectory: trajectory, empty if the message has none or the move is a concede
+    """
+    start_team0_position = []
+    start_team1_position = []
+    finish_team0_position = []
+    finish_team1_position = []
+    frame_data = []
+
+    if last_move_recv.get("trajectory") is None:
+        seconds_per_frame = None
+
+    else:
+        seconds_per_frame = last_move_recv["trajectory"]["seconds_per_frame"]
+
+        if last_move_recv["actual_move"]["type"] == "shot":
+            start_team0_position = parse_stones(
+                last_move_recv["trajectory"]["start"]["team0"]
+            )
+
+            start_team1_position = parse_stones(
+                last_move_recv["trajectory"]["start"]["team1"]
+            )
+
+            finish_team0_position = parse_stones(
+                last_move_recv["trajectory"]["finish"]["team0"]
+            )
+
+            finish_team1_position = parse_stones(
+                last_move_recv["trajectory"]["finish"]["team1"]
+            )
+
+            for frames in last_move_recv["trajectory"]["frames"]:
+                for frame in frames:
+                    frame_data.append(parse_frame(frame))
+
+    start = Start(
+        team0=start_team0_position,
+        team1=start_team1_position,
+    )
+
+    finish = Finish(
+        team0=finish_team0_position,
+        team1=finish_team1_position,
+    )
+
+    return Trajectory(
+        seconds_per_frame=seconds_per_frame,
+        start=start,
+        finish=finish,
+        frames=frame_data,
+    )
+
+
+def parse_update(message_recv: dict[str, Any]) -> Update | None:
+    """Convert update message to data class
+
+    Args:
+        message_recv (dict[str, Any]): update message
+
+    Returns:
+        Update | None: match information, None if the message is not an update
+    """
+    if message_recv["cmd"] != "update":
+        return None
+
+    last_move_recv = message_recv["last_move"]
+    return Update(
+        cmd=message_recv["cmd"],
+        last_move=(
+            None
+            if last_move_recv is None
+            else LastMove(
+                actual_move=parse_actual_move(last_move_recv["actual_move"]),
+                free_guard_zone_foul=last_move_recv["free_guard_zone_foul"],
+                trajectory=parse_trajectory(last_move_recv),
+            )
+        ),
+        next_team=message_recv["next_team"],
+        state=parse_state(message_recv["state"]),
+    )
+
+
+def parse_frame(frame: dict[str, Any] | None) -> Frame:
+    """Convert one trajectory frame entry to data class
+
+    Args:
+        frame (dict[str, Any] | None): frame entry
+
+    Returns:
+        Frame: position and angle of the stone that moved
+    """
+    if frame is None or frame["value"] is None:
+        return Frame(
+            team=None if frame is None else frame["team"],
+            index=None if frame is None else frame["index"],
+            value=Coordinate(
+                angle=None,
+                position=[Position(x=None, y=None)],
+            ),
+        )
+
+    return Frame(
+        team=frame["team"],
+        index=frame["index"],
+        value=Coordinate(
+            angle=frame["value"]["angle"],
+            position=[
+                Position(
+                    x=frame["value"]["position"]["x"],
+                    y=frame["value"]["position"]["y"],
+                )
+            ],
+        ),
+    )
+
+
+def convert_update(
+    update_data: Update, remove_trajectory: bool = True
+) -> dict[str, Any]:
+    """convert Update to dict
+
+    Args:
+        update_data (Update): Update
+        remove_trajectory (bool): Delete trajectory data from Update? Defaults to True.
+
+    Returns:
+        dict: converted Update
+    """
+    update_dict: dict = {}
+    for field in fields(update_data):
+        update_value = getattr(update_data, field.name)
+        if field.name == "state":
+            update_dict[field.name] = {}
+            for field in fields(update_value):
+                if field.name == "_board":  # derived from stones
+                    continue
+                state_value = getattr(update_value, field.name)
+                update_dict["state"][field.name] = {}
+
+                if field.name == "extra_end_score":
+                    update_dict["state"][field.name] = {}
+                    for field in fields(state_value):
+                        extra_end_score_value = getattr(state_value, field.name)
+                        update_dict["state"]["extra_end_score"][
+                            field.name
+                        ] = extra_end_score_value
+
+                elif field.name == "game_result":
+                    update_dict["state"][field.name] = {}
+                    for field in fields(state_value):
+                        game_result_value = getattr(state_value, field.name)
+                        update_dict["state"]["game_result"][
+                            field.name
+                        ] = game_result_value
+
+                elif field.name == "scores":
+                    update_dict["state"][field.name] = {}
+                    for field in fields(state_value):
+                        scores_value = getattr(state_value, field.name)
+                        update_dict["state"]["scores"][field.name] = scores_value
+
+                elif field.name == "stones":
+                    for field in fields(state_value):
+                        stones_value = getattr(state_value, field.name)
+                        update_dict["state"]["stones"][field.name] = []
+                        state_stones_team_list = []
+                        for i in stones_value:
+                            state_stone_team_dict: dict = {}
+                            for team in fields(i):
+                                team_value = getattr(i, team.name)
+                                if team.name == "position":
+                                    for pos in team_value:
+                                        state_stone_team_dict["position"] = {}
+                                        for position in fields(pos):
+                                            team_position_value = getattr(
+                                                pos, position.name
+                                            )
+                                            state_stone_team_dict["position"][
+                                                position.name
+                                            ] = team_position_value
+
+                                else:
+                                    state_stone_team_dict[team.name] = team_value
+                            state_stones_team_list.append(state_stone_team_dict)
+                        update_dict["state"]["stones"][
+                            field.name
+                        ] = state_stones_team_list
+
+                elif field.name == "thinking_time_remaining":
+                    update_dict["state"][field.name] = {}
+                    for field in fields(state_value):
+                        thinking_time_remaining_value = getattr(state_value, field.name)
+                        update_dict["state"]["thinking_time_remaining"][
+                            field.name
+                        ] = thinking_time_remaining_value
+
+                else:
+                    update_dict["state"][field.name] = state_value
+
+        elif field.name == "last_move":
+            if update_value is None:
+                update_dict[field.name] = None
+                continue
+
+            update_dict[field.name] = {}
+            for field in fields(update_value):
+                last_move_value = getattr(update_value, field.name)
+                if field.name == "actual_move":
+                    update_dict["last_move"][field.name] = {}
+                    for field in fields(last_move_value):
+                        actual_move_value = getattr(last_move_value, field.name)
+                        if field.name == "velocity":
+                            update_dict["last_move"]["actual_move"][field.name] = {}
+                            for field in fields(actual_move_value):
+                                velocity_value = getattr(actual_move_value, field.name)
+                                update_dict["last_move"]["actual_move"]["velocity"][
+                                    field.name
+                                ] = velocity_value
+                        else:
+                            update_dict["last_move"]["actual_move"][
+                                field.name
+                            ] = actual_move_value
+
+                elif field.name == "trajectory":
+                    if remove_trajectory is True:
+                        update_dict["last_move"][field.name] = None
+                    else:
+                        update_dict["last_move"][field.name] = {}
+                        for field in fields(last_move_value):
+                            trajectory_value = getattr(last_move_value, field.name)
+                            if field.name == "start":
+                                update_dict["last_move"]["trajectory"][field.name] = {}
+                                for field in fields(trajectory_value):
+                                    start_value = getattr(trajectory_value, field.name)
+                                    update_dict["last_move"]["trajectory"]["start"][
+                                        field.name
+                                    ] = []
+                                    start_team_list = []
+                                    for field in fields(start_value):
+                                        start_team_dict = {}
+                                        start_team_value = getattr(
+                                            start_value, field.name
+                                        )
+                                        if field.name == "position":
+                                            start_team_dict["position"] = {}
+                                            for field in fields(start_team_value):
+                                                start_team0_position_value = getattr(
+                                                    start_team_value, field.name
+                                                )
+                                                start_team_dict["position"][
+                                                    field.name
+                                                ] = start_team0_position_value
+
+                                        else:
+                                            start_team_dict[field.name] = (
+                                                start_team_value
+                                            )
+                                        start_team_list.append(start_team_dict)
+                                    update_dict["last_move"]["trajectory"]["start"][
+                                        field.name
+                                    ] = start_team_list
+
+                            elif field.name == "finish":
+                                update_dict["last_move"]["trajectory"][field.name] = {}
+                                for field in fields(trajectory_value):
+                                    finish_value = getattr(trajectory_value, field.name)
+                                    update_dict["last_move"]["trajectory"]["finish"][
+                                        field.name
+                                    ] = []
+                                    finish_team0_list = []
+                                    for field in fields(finish_value):
+                                        finish_team_dict = {}
+                                        finish_team_value = getattr(
+                                            finish_value, field.name
+                                        )
+                                        if field.name == "position":
+                                            finish_team_dict["position"] = {}
+                                            for field in fields(finish_team_value):
+                                                finish_team_position_value = getattr(
+                                                    finish_team_value,
+                                                    field.name,
+                                                )
+                                                finish_team_dict["position"][
+                                                    field.name
+                                                ] = finish_team_position_value
+                                        else:
+                                            finish_team_dict[field.name] = (
+                                                finish_team_value
+                                            )
+                                        finish_team0_list.append(finish_team_dict)
+                                    update_dict["last_move"]["trajectory"]["finish"][
+                                        field.name
+                                    ] = finish_team0_list
+
+                            elif field.name == "frames":
+                                update_dict["last_move"]["trajectory"][field.name] = []
+
+                                for field in fields(trajectory_value):
+                                    frames_list = []
+                                    frames_dict = {}
+                                    frames_value = getattr(trajectory_value, field.name)
+
+                                    if field.name == "value":
+                                        frames_dict[field.name] = {}
+                                        for field in fields(frames_value):
+                                            frames_value_value = getattr(
+                                                frames_value, field.name
+                                            )
+
+                                            if field.name == "position":
+                                                frames_dict["value"][field.name] = {}
+                                                for field in fields(frames_value_value):
+                                                    frames_value_position_value = (
+                                                        getattr(
+                                                            frames_value_value,
+                                                            field.name,
+                                                        )
+                                                    )
+                                                    frames_dict["value"]["position"][
+                                                        field.name
+                                                    ] = frames_value_position_value
+                                            else:
+                                                frames_dict["value"][
+                                                    field.name
+                                                ] = frames_value_value
+                                    else:
+                                        frames_dict[field.name] = frames_value
+
+                                    frames_list.append(frames_dict)
+                                    update_dict["last_move"]["trajectory"][
+                                        "frames"
+                                    ].append(frames_list)
+                            else:
+                                update_dict["last_move"]["trajectory"][
+                                    field.name
+                                ] = trajectory_value
+                else:
+                    update_dict["last_move"][field.name] = last_move_value
+        else:
+            update_dict[field.name] = update_value
+
+    return update_dict
+
+
+def convert_trajectory(trajectory_data: Trajectory) -> dict[str, Any]:
+    """convert trajectory to dict
+
+    Args:
+        trajectory_data (Trajectory): trajectory
+
+    Returns:
+        dict[str, Any]: dict of trajectory
+    """
+    trajectory_dict = {}
+
+    for field in fields(trajectory_data):
+        value = getattr(trajectory_data, field.name)
+
+        if field.name == "start":
+            trajectory_dict[field.name] = {}
+            for field in fields(value):
+                start_value = getattr(value, field.name)
+                # if field.name == "team0":
+                trajectory_dict["start"][field.name] = []
+                start_team_list = []
+                for i in start_value:
+                    start_team_dict = {}
+                    for start_field in fields(i):
+                        start_team_value = getattr(i, start_field.name)
+
+                        if start_field.name == "position":
+                            for j in start_team_value:
+                                start_team_dict["position"] = {}
+                                for pos_field in fields(j):
+                                    start_team_position_value = getattr(
+                                        j, pos_field.name
+                                    )
+                                    start_team_dict["position"][
+                                        pos_field.name
+                                    ] = start_team_position_value
+                        else:
+                            start_team_dict[start_field.name] = start_team_value
+                    start_team_list.append(start_team_dict)
+                trajectory_dict["start"][field.name] = start_team_list
+
+        elif field.name == "finish":
+            trajectory_dict[field.name] = {}
+            for field in fields(value):
+                finish_value = getattr(value, field.name)
+                trajectory_dict["finish"][field.name] = []
+                finish_team_list = []
+                for i in finish_value:
+                    finish_team_dict = {}
+                    for field in fields(i):
+                        finish_team_value = getattr(i, field.name)
+
+                        if field.name == "position":
+                            for j in finish_team_value:
+                                finish_team_dict["position"] = {}
+                                for finish_field in fields(j):
+                                    finish_team_position_value = getattr(
+                                        j, finish_field.name
+                                    )
+                                    finish_team_dict["position"][
+                                        finish_field.name
+                                    ] = finish_team_position_value
+                        else:
+                            finish_team_dict[field.name] = finish_team_value
+                    finish_team_list.append(finish_team_dict)
+                trajectory_dict["finish"][field.name] = finish_team_list
+
+        elif field.name == "frames":
+            trajectory_dict[field.name] = []
+            for i in value:
+                frames_dict = {}
+                frames_list = []
+                for field in fields(i):
+                    frame_value = getattr(i, field.name)
+                    if field.name == "value":
+                        frames_dict[field.name] = {}
+                        for frame_field in fields(frame_value):
+                            frame_data_value = getattr(frame_value, frame_field.name)
+
+                            if frame_field.name == "position":
+                                frames_dict["value"][frame_field.name] = {}
+                                for j in frame_data_value:
+                                    for frame_field in fields(j):
+                                        frame_data_position_value = getattr(
+                                            j, frame_field.name
+                                        )
+                                        frames_dict["value"]["position"][
+                                            frame_field.name
+                                        ] = frame_data_position_value
+
+                            else:
+                                frames_dict["value"][
+                                    frame_field.name
+                                ] = frame_data_value
+                    else:
+                        frames_dict[field.name] = frame_value
+                frames_list.append(frames_dict)
+                trajectory_dict["frames"] += frames_list
+        else:
+            trajectory_dict[field.name] = value
+    return trajectory_dict
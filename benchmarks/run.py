@@ -0,0 +1,293 @@
+"""Benchmark suite for the parsing, conversion and transport hot paths.
+
+Every case is driven by the messages of the bundled .dcl2 log or by a synthetic
+long match with full trajectories, and reports ops/sec, peak traced memory and
+the memory blocks left allocated per op as JSON, so that two runs can be compared.
+
+usage:
+    python benchmarks/run.py [-k NAME] [--frames N] [--output result.json]
+    python benchmarks/run.py --compare baseline.json [--threshold 0.1]
+"""
+
+import argparse
+import json
+import logging
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from common import ROOT, load_dcl2_messages, synthetic_match
+
+sys.path.insert(0, str(ROOT))
+
+from dc3client import SocketClient
+from dc3client.codec import default_codec
+from dc3client.protocol import parse_is_ready, parse_update
+from dc3client.trajectory import parse_columnar_trajectory
+
+BENCHMARKS: dict[str, Callable[["Context"], tuple[Callable[[], Any], int]]] = {}
+
+
+def benchmark(name: str):
+    """register a case, which returns the operation to time and its op count"""
+
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+
+    return register
+
+
+class Context:
+    """Messages shared by the cases, built once"""
+
+    def __init__(self, n_frames: int, n_ends: int) -> None:
+        self.recorded = load_dcl2_messages()
+        self.dcl2_updates = [m for m in self.recorded if b'"cmd":"update"' in m]
+        self.is_ready = next(m for m in self.recorded if b'"cmd":"is_ready"' in m)
+        self.match = [
+            default_codec.dumps(m)
+            for m in synthetic_match(n_ends=n_ends, extra_ends=1, n_frames=n_frames)
+        ]
+
+    def client(self, **kwargs) -> SocketClient:
+        cli = SocketClient(auto_start=False, **kwargs)
+        cli.logger.setLevel(logging.WARNING)
+        cli.is_connected = True
+        return cli
+
+
+class _BytesSocket:
+    """Socket stand-in that serves a fixed byte string to recv_into"""
+
+    def __init__(self, data: bytes, chunk: int = 65536) -> None:
+        self.data = memoryview(data)
+        self.chunk = chunk
+        self.offset = 0
+
+    def recv_into(self, buffer) -> int:
+        size = min(len(buffer), self.chunk, len(self.data) - self.offset)
+        buffer[:size] = self.data[self.offset : self.offset + size]
+        self.offset += size
+        return size
+
+
+def _update(messages: list[bytes], **kwargs) -> tuple[Callable[[], Any], int]:
+    def run():
+        cli = _CONTEXT.client(**kwargs)
+        for message in messages:
+            cli.framer.feed(message + b"\n")
+            cli.update()
+        return cli
+
+    return run, len(messages)
+
+
+@benchmark("update/dcl2")
+def update_dcl2(ctx: Context):
+    return _update(ctx.dcl2_updates)
+
+
+@benchmark("update/trajectory")
+def update_trajectory(ctx: Context):
+    return _update(ctx.match[:16])
+
+
+@benchmark("update/trajectory-lazy")
+def update_trajectory_lazy(ctx: Context):
+    return _update(ctx.match[:16], lazy=True)
+
+
+@benchmark("convert_update/dcl2")
+def convert_update_dcl2(ctx: Context):
+    cli = ctx.client()
+    updates = [parse_update(default_codec.loads(m)) for m in ctx.dcl2_updates]
+    return lambda: [cli.convert_update(u) for u in updates], len(updates)
+
+
+@benchmark("convert_update/trajectory")
+def convert_update_trajectory(ctx: Context):
+    cli = ctx.client()
+    updates = [parse_update(default_codec.loads(m)) for m in ctx.match[:16]]
+    return lambda: [cli.convert_update(u) for u in updates], len(updates)
+
+
+@benchmark("convert_update/trajectory-full")
+def convert_update_trajectory_full(ctx: Context):
+    cli = ctx.client()
+    updates = [parse_update(default_codec.loads(m)) for m in ctx.match[:16]]
+    return lambda: [cli.convert_update(u, False) for u in updates], len(updates)
+
+
+@benchmark("parse_update/trajectory")
+def parse_update_trajectory(ctx: Context):
+    messages = [default_codec.loads(m) for m in ctx.match[:16]]
+    return lambda: [parse_update(m) for m in messages], len(messages)
+
+
+@benchmark("convert_trajectory/trajectory")
+def convert_trajectory(ctx: Context):
+    cli = ctx.client()
+    updates = [parse_update(default_codec.loads(m)) for m in ctx.match[:16]]
+    trajectories = [u.last_move.trajectory for u in updates]
+    return lambda: [cli.convert_trajectory(t) for t in trajectories], len(updates)
+
+
+@benchmark("parse_columnar_trajectory/trajectory")
+def columnar_trajectory(ctx: Context):
+    trajectories = [
+        default_codec.loads(m)["last_move"]["trajectory"] for m in ctx.match[:16]
+    ]
+    return (
+        lambda: [parse_columnar_trajectory(t) for t in trajectories],
+        len(trajectories),
+    )
+
+
+@benchmark("decode_positions/trajectory")
+def decode_positions(ctx: Context):
+    trajectories = [
+        parse_update(default_codec.loads(m), columnar=True).last_move.trajectory
+        for m in ctx.match[:16]
+    ]
+    return lambda: [t.positions() for t in trajectories], len(trajectories)
+
+
+@benchmark("convert_is_ready/dcl2")
+def convert_is_ready(ctx: Context):
+    cli = ctx.client()
+    is_ready = parse_is_ready(default_codec.loads(ctx.is_ready))
+    return lambda: cli.convert_is_ready(is_ready), 1
+
+
+@benchmark("get_update_and_trajectory/match")
+def get_update_and_trajectory(ctx: Context):
+    cli = ctx.client()
+    for message in ctx.match:
+        cli.framer.feed(message + b"\n")
+        cli.update()
+    return lambda: cli.get_update_and_trajectory(remove_trajectory=False), 1
+
+
+def _receive(messages: list[bytes]) -> tuple[Callable[[], Any], int]:
+    data = b"".join(m + b"\n" for m in messages)
+
+    def run():
+        cli = _CONTEXT.client()
+        cli.socket = _BytesSocket(data)  # type: ignore
+        for _ in messages:
+            cli.receive()
+        cli.socket = None
+
+    return run, len(messages)
+
+
+@benchmark("receive/dcl2")
+def receive_dcl2(ctx: Context):
+    return _receive(ctx.recorded)
+
+
+@benchmark("receive/trajectory")
+def receive_trajectory(ctx: Context):
+    return _receive(ctx.match[:16])
+
+
+def measure(
+    run: Callable[[], Any], ops: int, min_time: float = 0.5
+) -> dict[str, float]:
+    """time an operation and trace its memory
+
+    Args:
+        run (Callable[[], Any]): Operation to measure.
+        ops (int): Number of ops done by one call.
+        min_time (float, optional): Minimum total time of the timed calls. Defaults to 0.5.
+
+    Returns:
+        dict[str, float]: ops_per_sec, mean_us, peak_bytes and retained_blocks
+    """
+    run()  # warm up
+
+    calls = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < min_time or calls < 3:
+        run()
+        calls += 1
+
+    blocks = sys.getallocatedblocks()
+    tracemalloc.start()
+    result = run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    retained_blocks = sys.getallocatedblocks() - blocks
+    del result
+
+    return {
+        "ops_per_sec": calls * ops / elapsed,
+        "mean_us": elapsed / (calls * ops) * 1e6,
+        "peak_bytes": peak / ops,
+        "retained_blocks": retained_blocks / ops,
+    }
+
+
+def compare(result: dict, baseline: dict, threshold: float) -> list[str]:
+    """list the cases whose ops/sec dropped by more than threshold"""
+    regressions = []
+    base = {case["name"]: case for case in baseline["results"]}
+    for case in result["results"]:
+        if (old := base.get(case["name"])) is None:
+            continue
+        ratio = case["ops_per_sec"] / old["ops_per_sec"]
+        if ratio < 1.0 - threshold:
+            regressions.append(f"{case['name']}: {ratio:.2f}x of baseline")
+    return regressions
+
+
+_CONTEXT: Context
+
+
+def main() -> None:
+    global _CONTEXT
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="keyword", default="", help="run matching cases")
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--ends", type=int, default=10)
+    parser.add_argument("--min-time", type=float, default=0.5)
+    parser.add_argument("--output", help="write the result to this file")
+    parser.add_argument("--compare", help="baseline result to compare with")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    _CONTEXT = Context(n_frames=args.frames, n_ends=args.ends)
+    result: dict[str, Any] = {
+        "python": platform.python_version(),
+        "codec": default_codec.name,
+        "frames": args.frames,
+        "results": [],
+    }
+    for name, case in BENCHMARKS.items():
+        if args.keyword not in name:
+            continue
+        run, ops = case(_CONTEXT)
+        result["results"].append({"name": name, **measure(run, ops, args.min_time)})
+        print(json.dumps(result["results"][-1]), file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=4)
+    else:
+        print(json.dumps(result, indent=4))
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(result, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,4 @@
 from .dc3client import *
 from .models import *
+from .async_client import AsyncSocketClient
+from .multiplexer import MatchMultiplexer
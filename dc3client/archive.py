@@ -0,0 +1,425 @@
+"""Compact binary match archive whose arrays are read through a memory map.
+
+A match archive (``.dc3a``) holds one row per update of a match as NumPy arrays
+instead of JSON: the boards as float32, end, shot, hammer and scores as small
+ints, the moves as (vx, vy) and a rotation code, and the trajectories as one
+columnar frame table with row offsets per update. The file is laid out as::
+
+    MAGIC (8 bytes) | header length (uint64 LE) | JSON header | arrays
+
+The JSON header keeps the dc and is_ready messages and, for every array, its
+dtype, shape and offset from the start of the array section. Every array
+starts on a 64 byte boundary, so ``MatchArchive`` maps the file once and hands
+out views of it, and only the pages that are read are loaded.
+"""
+
+import json
+import pathlib
+from os import PathLike
+from typing import Any, Iterable
+
+import numpy as np
+
+from dc3client.board import STONES_PER_TEAM, TEAMS, parse_board
+from dc3client.compact import CompactUpdate, compact_update_to_message
+from dc3client.logs import read_dcl2
+from dc3client.lazy import LazyUpdate
+from dc3client.models import MatchData
+from dc3client.serialize import to_dict
+from dc3client.trajectory import ColumnarTrajectory, parse_columnar_trajectory
+
+MAGIC = b"DC3ARCH\x00"
+VERSION = 1
+ALIGNMENT = 64
+
+# Codes of the small int columns, -1 where the message has None
+ROTATIONS = ("cw", "ccw")
+MOVE_NONE, MOVE_SHOT, MOVE_CONCEDE = 0, 1, 2
+
+# Trajectory frame entries as in ColumnarTrajectory, with float32 values
+ARCHIVE_FRAME_DTYPE = np.dtype(
+    [
+        ("frame", np.int32),
+        ("team", np.int8),
+        ("index", np.int8),
+        ("x", np.float32),
+        ("y", np.float32),
+        ("angle", np.float32),
+    ]
+)
+
+_BOARD_SHAPE = (len(TEAMS), STONES_PER_TEAM, 3)
+_NAN_BOARD = np.full(_BOARD_SHAPE, np.nan, dtype=np.float32)
+
+
+def _code(value: str | None, names: tuple[str, ...]) -> int:
+    return -1 if value is None else names.index(value)
+
+
+def _ints(values: list[int | None]) -> list[int]:
+    return [-1 if value is None else value for value in values]
+
+
+def _has_placements(
+    trajectory_recv: dict[str, Any] | None, stones_recv: dict[str, list]
+) -> bool:
+    # start and finish hold one entry per stone of the state, even with no frames
+    # kept, while the trajectory of a concede has empty lists
+    if not trajectory_recv:
+        return False
+    return all(
+        len((trajectory_recv.get(key) or {}).get(team) or []) == len(stones_recv[team])
+        for key in ("start", "finish")
+        for team in TEAMS
+    )
+
+
+def match_arrays(
+    update_messages: Iterable[dict[str, Any]], trajectory: bool = True
+) -> dict[str, np.ndarray]:
+    """Convert the update messages of a match to the archive arrays
+
+    A trajectory reduced to its endpoints keeps its start and finish with no
+    frames, a dropped one leaves has_trajectory False.
+
+    Args:
+        update_messages (Iterable[dict[str, Any]]): update messages in the order received
+        trajectory (bool, optional): Store the trajectories. Defaults to True.
+
+    Returns:
+        dict[str, np.ndarray]: arrays with one row per update, see MatchArchive
+    """
+    boards = []
+    width = 0
+    ends, shots, hammers, next_teams = [], [], [], []
+    scores, extra_end_scores, thinking_times = [], [], []
+    moves, rotations, move_types, fouls = [], [], [], []
+    has_trajectory, spf, n_frames, starts, finishes, frames = [], [], [], [], [], []
+    offsets = [0]
+
+    for message in update_messages:
+        state = message["state"]
+        boards.append(parse_board(state["stones"]).array)
+        ends.append(state["end"])
+        shots.append(state["shot"])
+        hammers.append(_code(state["hammer"], TEAMS))
+        next_teams.append(_code(message["next_team"], TEAMS))
+        scores.append([_ints(state["scores"][team]) for team in TEAMS])
+        width = max(width, *(len(team_scores) for team_scores in scores[-1]))
+        extra_end_scores.append(_ints([state["extra_end_score"][t] for t in TEAMS]))
+        thinking_times.append([state["thinking_time_remaining"][t] for t in TEAMS])
+
+        last_move = message["last_move"]
+        move = None if last_move is None else last_move["actual_move"]
+        if move is None or move["type"] != "shot":
+            moves.append((np.nan, np.nan))
+            rotations.append(-1)
+            move_types.append(MOVE_NONE if move is None else MOVE_CONCEDE)
+        else:
+            moves.append((move["velocity"]["x"], move["velocity"]["y"]))
+            rotations.append(_code(move["rotation"], ROTATIONS))
+            move_types.append(MOVE_SHOT)
+        fouls.append(last_move is not None and last_move["free_guard_zone_foul"])
+
+        columnar = None
+        trajectory_recv = None if last_move is None else last_move.get("trajectory")
+        if trajectory and _has_placements(trajectory_recv, state["stones"]):
+            columnar = parse_columnar_trajectory(trajectory_recv)
+        has_trajectory.append(columnar is not None)
+        if columnar is None:
+            spf.append(np.nan)
+            n_frames.append(0)
+            starts.append(_NAN_BOARD)
+            finishes.append(_NAN_BOARD)
+        else:
+            spf.append(columnar.seconds_per_frame or np.nan)
+            n_frames.append(columnar.n_frames)
+            starts.append(columnar.start)
+            finishes.append(columnar.finish)
+            frames.append(columnar.frames)
+            offsets.append(offsets[-1] + len(columnar.frames))
+            continue
+        offsets.append(offsets[-1])
+
+    n = len(boards)
+    # the score lists grow with the extra ends
+    for update_scores in scores:
+        for team_scores in update_scores:
+            team_scores.extend([-1] * (width - len(team_scores)))
+
+    return {
+        "board": np.array(boards, dtype=np.float32).reshape(n, *_BOARD_SHAPE),
+        "end": np.array(ends, dtype=np.int16),
+        "shot": np.array(shots, dtype=np.int16),
+        "hammer": np.array(hammers, dtype=np.int8),
+        "next_team": np.array(next_teams, dtype=np.int8),
+        "scores": np.array(scores, dtype=np.int16).reshape(n, len(TEAMS), width),
+        "extra_end_score": np.array(extra_end_scores, dtype=np.int16).reshape(n, 2),
+        "thinking_time_remaining": np.array(thinking_times, dtype=np.float32).reshape(
+            n, 2
+        ),
+        "move": np.array(moves, dtype=np.float32).reshape(n, 2),
+        "rotation": np.array(rotations, dtype=np.int8),
+        "move_type": np.array(move_types, dtype=np.int8),
+        "free_guard_zone_foul": np.array(fouls, dtype=np.bool_),
+        "has_trajectory": np.array(has_trajectory, dtype=np.bool_),
+        "seconds_per_frame": np.array(spf, dtype=np.float32),
+        "n_frames": np.array(n_frames, dtype=np.int32),
+        "trajectory_start": np.array(starts, dtype=np.float32).reshape(
+            n, *_BOARD_SHAPE
+        ),
+        "trajectory_finish": np.array(finishes, dtype=np.float32).reshape(
+            n, *_BOARD_SHAPE
+        ),
+        "frame_offsets": np.array(offsets, dtype=np.int64),
+        "frames": (
+            np.concatenate(frames).astype(ARCHIVE_FRAME_DTYPE)
+            if frames
+            else np.empty(0, dtype=ARCHIVE_FRAME_DTYPE)
+        ),
+    }
+
+
+def _aligned(size: int) -> int:
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+def write_arrays(
+    path: str | PathLike, arrays: dict[str, np.ndarray], header: dict[str, Any]
+) -> None:
+    """Write arrays and a JSON header in the archive container
+
+    Args:
+        path (str | PathLike): output file
+        arrays (dict[str, np.ndarray]): arrays to store
+        header (dict[str, Any]): JSON serializable fields of the header
+    """
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        layout[name] = {
+            "dtype": np.lib.format.dtype_to_descr(array.dtype),
+            "shape": list(array.shape),
+            "offset": offset,
+        }
+        offset = _aligned(offset + array.nbytes)
+
+    header_bytes = json.dumps(
+        dict(header, version=VERSION, arrays=layout), separators=(",", ":")
+    ).encode()
+    prefix = MAGIC + len(header_bytes).to_bytes(8, "little") + header_bytes
+
+    with open(path, "wb") as f:
+        f.write(prefix + bytes(_aligned(len(prefix)) - len(prefix)))
+        for array in arrays.values():
+            # written from the buffer, so memory-mapped columns are not loaded whole
+            f.write(np.ascontiguousarray(array).reshape(-1).view(np.uint8).data)
+            f.write(bytes(_aligned(array.nbytes) - array.nbytes))
+
+
+def read_header(path: str | PathLike) -> tuple[dict[str, Any], int]:
+    """Read the JSON header of an archive container
+
+    Args:
+        path (str | PathLike): archive file
+
+    Returns:
+        tuple[dict[str, Any], int]: header and file offset of the array section
+    """
+    with open(path, "rb") as f:
+        magic = f.read(len(MAGIC))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a dc3client archive")
+        length = int.from_bytes(f.read(8), "little")
+        header = json.loads(f.read(length))
+    if header.get("version") != VERSION:
+        raise ValueError(f"Unsupported archive version : {header.get('version')}")
+    return header, _aligned(len(MAGIC) + 8 + length)
+
+
+class ArrayFile:
+    """Arrays of an archive container, as read-only views of one memory map"""
+
+    def __init__(self, path: str | PathLike) -> None:
+        """open archive container
+
+        Args:
+            path (str | PathLike): archive file
+        """
+        self.path = pathlib.Path(path)
+        self.header, self._data_offset = read_header(self.path)
+        self._layout: dict[str, dict[str, Any]] = self.header["arrays"]
+        self._map: np.memmap | None = np.memmap(self.path, dtype=np.uint8, mode="r")
+        self._arrays: dict[str, np.ndarray] = {}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(path={self.path})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._layout
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """read-only view of one array, nothing is read until it is indexed"""
+        array = self._arrays.get(name)
+        if array is None:
+            if self._map is None:
+                raise ValueError(f"{self.path} is closed")
+            layout = self._layout[name]
+            dtype = np.lib.format.descr_to_dtype(layout["dtype"])
+            shape = tuple(layout["shape"])
+            start = self._data_offset + layout["offset"]
+            count = int(np.prod(shape, dtype=np.int64))
+            array = self._map[start : start + count * dtype.itemsize]
+            array = array.view(dtype).reshape(shape)
+            self._arrays[name] = array
+        return array
+
+    def names(self) -> list[str]:
+        """names of the stored arrays"""
+        return list(self._layout)
+
+    def close(self) -> None:
+        """drop the memory map, views already handed out stay valid"""
+        self._arrays.clear()
+        self._map = None
+
+
+class MatchArchive(ArrayFile):
+    """One match read from a .dc3a archive
+
+    Every array has one row per update, in the order received:
+
+    - board (N, 2, 8, 3) float32: x, y and angle of every stone, NaN when not in play
+    - end, shot (N,) int16, hammer and next_team (N,) int8: team index
+    - scores (N, 2, ends) and extra_end_score (N, 2) int16, -1 for no score
+    - thinking_time_remaining (N, 2) float32
+    - move (N, 2) float32: (vx, vy) of the last shot, NaN without one
+    - rotation (N,) int8: index in ROTATIONS, -1 without a shot
+    - move_type (N,) int8: MOVE_NONE, MOVE_SHOT or MOVE_CONCEDE
+    - free_guard_zone_foul (N,) bool
+    - has_trajectory (N,) bool, seconds_per_frame (N,) float32, n_frames (N,) int32
+    - trajectory_start, trajectory_finish (N, 2, 8, 3) float32
+    - frames (F,) ARCHIVE_FRAME_DTYPE, the frames of update i are
+      frames[frame_offsets[i]:frame_offsets[i + 1]]
+    """
+
+    def __len__(self) -> int:
+        """number of updates"""
+        return self._layout["end"]["shape"][0]
+
+    @property
+    def dc(self) -> dict[str, Any] | None:
+        """dc message"""
+        return self.header.get("dc")
+
+    @property
+    def is_ready(self) -> dict[str, Any] | None:
+        """is_ready message"""
+        return self.header.get("is_ready")
+
+    @property
+    def game_result(self) -> dict[str, Any] | None:
+        """game_result of the last update"""
+        return self.header.get("game_result")
+
+    def trajectory(self, index: int) -> ColumnarTrajectory | None:
+        """trajectory of the shot before one update, as views of the archive
+
+        Args:
+            index (int): update number
+
+        Returns:
+            ColumnarTrajectory | None: trajectory with float32 values, None if the update has none
+        """
+        if not self["has_trajectory"][index]:
+            return None
+        spf = float(self["seconds_per_frame"][index])
+        offsets = self["frame_offsets"]
+        return ColumnarTrajectory(
+            seconds_per_frame=None if spf != spf else spf,
+            start=self["trajectory_start"][index],
+            finish=self["trajectory_finish"][index],
+            frames=self["frames"][offsets[index] : offsets[index + 1]],
+            n_frames=int(self["n_frames"][index]),
+        )
+
+
+def write_match_archive(
+    path: str | PathLike,
+    update_messages: Iterable[dict[str, Any]],
+    dc: dict[str, Any] | None = None,
+    is_ready: dict[str, Any] | None = None,
+    trajectory: bool = True,
+) -> None:
+    """Write the messages of one match to a .dc3a archive
+
+    Args:
+        path (str | PathLike): output file
+        update_messages (Iterable[dict[str, Any]]): update messages in the order received
+        dc (dict[str, Any] | None, optional): dc message. Defaults to None.
+        is_ready (dict[str, Any] | None, optional): is_ready message. Defaults to None.
+        trajectory (bool, optional): Store the trajectories. Defaults to True.
+    """
+    update_messages = list(update_messages)
+    arrays = match_arrays(update_messages, trajectory)
+    game_result = (
+        update_messages[-1]["state"]["game_result"] if update_messages else None
+    )
+    header = {"dc": dc, "is_ready": is_ready, "game_result": game_result}
+    write_arrays(path, arrays, header)
+
+
+def _update_message(update: Any) -> dict[str, Any]:
+    if isinstance(update, CompactUpdate):
+        return compact_update_to_message(update, remove_trajectory=False)
+    if isinstance(update, LazyUpdate):
+        return update.to_message(remove_trajectory=False)
+    return to_dict(update)
+
+
+def archive_match_data(
+    path: str | PathLike, match_data: MatchData, trajectory: bool = True
+) -> None:
+    """Write the match a client received to a .dc3a archive
+
+    Args:
+        path (str | PathLike): output file
+        match_data (MatchData): match data of a client, with Update, CompactUpdate or LazyUpdate
+        trajectory (bool, optional): Store the trajectories. Defaults to True.
+    """
+    write_match_archive(
+        path,
+        (_update_message(update) for update in match_data.update_list),
+        dc=None if match_data.server_dc is None else to_dict(match_data.server_dc),
+        is_ready=None if match_data.is_ready is None else to_dict(match_data.is_ready),
+        trajectory=trajectory,
+    )
+
+
+def archive_dcl2(
+    path: str | PathLike, dcl2_path: str | PathLike, trajectory: bool = True
+) -> None:
+    """Write the match of a .dcl2 log to a .dc3a archive
+
+    Args:
+        path (str | PathLike): output file
+        dcl2_path (str | PathLike): .dcl2 server log, or a RawJournal of a client
+        trajectory (bool, optional): Store the trajectories. Defaults to True.
+    """
+    messages: dict[str, Any] = {}
+    updates = []
+    for record in read_dcl2(dcl2_path):
+        message = record["log"]
+        if message["cmd"] == "update":
+            updates.append(message)
+        elif message["cmd"] in ("dc", "is_ready"):
+            messages.setdefault(message["cmd"], message)
+    write_match_archive(
+        path, updates, messages.get("dc"), messages.get("is_ready"), trajectory
+    )
@@ -0,0 +1,285 @@
+import asyncio
+import logging
+from os import PathLike
+from typing import Any
+
+from dc3client.codec import JSONCodec, default_codec
+from dc3client.compact import CompactUpdate
+from dc3client.deadline import Deadline
+from dc3client.lazy import LazyUpdate
+from dc3client.dc3client import MatchHandler
+from dc3client.framing import ReceiveStats
+from dc3client.journal import RawJournal
+from dc3client.models import StoneRotation, Update
+from dc3client.ponder import Ponderer, SearchFunction
+from dc3client.protocol import (
+    encode_concede,
+    encode_dc_ok,
+    encode_move,
+    encode_ready_ok,
+)
+from dc3client.ratelimit import TokenBucket
+from dc3client.recorder import MatchRecorder
+
+
+class AsyncSocketClient(MatchHandler):
+    def __init__(
+        self,
+        host: str = "dc3-server",
+        port: int = 10000,
+        client_name: str = "AI0",
+        rate_limit: float = 0.2,
+        timeout: float = 60,
+        limit: int = 2**26,
+        log_level: int = logging.INFO,
+        codec: JSONCodec | None = None,
+        ponder: SearchFunction | Ponderer | None = None,
+        compact: bool = False,
+        lazy: bool = False,
+        columnar: bool = False,
+        trajectory: str = "full",
+        history: int | None = None,
+        history_path: str | PathLike | None = None,
+        record: str | PathLike | MatchRecorder | None = None,
+        journal: str | PathLike | RawJournal | None = None,
+    ) -> None:
+        """initialize asyncio socket client
+
+        Unlike SocketClient, connecting is a coroutine, so the game is started with
+        ``await client.start_game()`` (or ``async with client:``) instead of auto_start.
+
+        Args:
+            host (str, optional): URL of the server of Digital Curling 3. Defaults to "dc3-server".
+            port (int, optional): Connection port to Digital Curling Server. Defaults to 10000.
+            client_name (str, optional): Identification name of the client. Defaults to "AI0".
+            rate_limit (float, optional): Minimum time interval to send data to the server. Defaults to 0.2.
+            timeout (float, optional): Time to client timeout. Defaults to 60.
+            limit (int, optional): Maximum size of one message in bytes. Defaults to 64 MiB.
+            log_level (int, optional): Minimum level of logging. Defaults to logging.INFO.
+            codec (JSONCodec | None, optional): JSON codec for messages. Defaults to the fastest installed codec.
+            ponder (SearchFunction | Ponderer | None, optional): Search run while the opponent is thinking, see set_ponder(). Defaults to None.
+            compact (bool, optional): Store updates as frozen, slotted CompactUpdate with flat stone positions. Defaults to False.
+            lazy (bool, optional): Store updates as LazyUpdate, which builds state, last_move and trajectory on first access. Defaults to False.
+            columnar (bool, optional): Store trajectories as ColumnarTrajectory, a few NumPy arrays per shot. Defaults to False.
+            trajectory (str, optional): Keep trajectories in "full", only their start and finish with "endpoints", or "drop" them while parsing. Defaults to "full".
+            history (int | None, optional): Keep only this many updates in memory and spill older ones to a journal on disk. Defaults to None, keep all.
+            history_path (str | PathLike | None, optional): Journal of the spilled updates. Defaults to a temporary file.
+            record (str | PathLike | MatchRecorder | None, optional): Stream every received message to this NDJSON file, see set_recorder(). Defaults to None.
+            journal (str | PathLike | RawJournal | None, optional): Tee every raw received and sent line, with a monotonic timestamp, to this file in the layout of the .dcl2 server logs. Defaults to None.
+        """
+        self.server = (host, port)
+        self.timeout = timeout
+        self.limit = limit
+        self.codec = codec or default_codec
+
+        self.reader: asyncio.StreamReader | None = None
+        self.writer: asyncio.StreamWriter | None = None
+        self.receive_stats = ReceiveStats()
+        if journal is None or isinstance(journal, RawJournal):
+            self.journal = journal
+        else:
+            self.journal = RawJournal(journal)
+
+        self.logger = logging.getLogger("socket_client")
+        self.logger.setLevel(log_level)
+        if not self.logger.handlers:
+            formatter = logging.Formatter(
+                "%(asctime)s - %(levelname)s:%(name)s - %(message)s"
+            )
+            stream_handler = logging.StreamHandler()
+            stream_handler.setFormatter(formatter)
+            self.logger.addHandler(stream_handler)
+
+        self._init_match(
+            client_name,
+            compact,
+            lazy,
+            columnar,
+            trajectory,
+            history,
+            history_path,
+        )
+        self.set_ponder(ponder)
+        self.set_recorder(record)
+
+        # Rate limit on the monotonic clock
+        self.limiter = TokenBucket(rate_limit)
+        self._send_lock = asyncio.Lock()
+
+    @property
+    def rate_limit(self) -> float:
+        """Rate limit time interval"""
+        return self.limiter.interval
+
+    @rate_limit.setter
+    def rate_limit(self, value: float) -> None:
+        self.limiter.interval = value
+
+    async def __aenter__(self) -> "AsyncSocketClient":
+        await self.start_game()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def connect(self) -> None:
+        """open connection to the server"""
+        self.logger.info(f"Connect to {self.server}")
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(*self.server, limit=self.limit),
+            timeout=self.timeout,
+        )
+        self.logger.info(f"Connect to {self.server} success")
+
+    async def close(self) -> None:
+        """stop pondering, then close the recording, update history and connection"""
+        if self.ponderer is not None:
+            self.ponderer.close()
+        if self.recorder is not None:
+            self.recorder.close()
+        self._close_history()
+        if self.journal is not None:
+            self.journal.close()
+        if self.writer is None:
+            return
+        self.logger.info("Shutdown socket")
+        try:
+            self.writer.close()
+            await self.writer.wait_closed()
+            self.logger.info("Shutdown socket success")
+        except (ConnectionError, OSError) as e:
+            self.logger.error(f"Shutdown socket failed {e}")
+        finally:
+            self.reader = None
+            self.writer = None
+
+    async def start_game(self) -> None:
+        """connect and go through dc, is_ready and new_game"""
+        await self.connect()
+        await self.dc_recv()
+        await self.dc_ok()
+        await self.is_ready_recv()
+        await self.ready_ok()
+        await self.get_new_game()
+
+    async def send(self, message: str | bytes) -> None:
+        """send message to server without blocking the event loop
+
+        Args:
+            message (str | bytes): newline terminated message
+        """
+        if isinstance(message, str):
+            message = message.encode("utf-8")
+
+        if self.writer is None:
+            raise Exception("Not connected to server")
+
+        async with self._send_lock:
+            if (wait_time := self.limiter.reserve()) > 0.0:
+                self.logger.debug(f"Rate limit {self.rate_limit} seconds")
+                self.logger.debug(f"Please wait {wait_time} seconds")
+                await asyncio.sleep(wait_time)
+            self.writer.write(message)
+            await self.writer.drain()
+            if self.journal is not None:
+                self.journal.sent(message)
+            self.logger.info(f"Send message : {message.decode('utf-8')}")
+
+    async def receive(self) -> dict[str, Any]:
+        """receive message from server until "\\n"
+
+        Returns:
+            dict[str, Any]: received message
+        """
+        return self.codec.loads(await self.receive_raw())
+
+    async def receive_raw(self) -> bytes:
+        """receive one message from server without decoding it
+
+        Returns:
+            bytes: received message without the trailing newline, as SocketClient.receive_raw()
+        """
+        if self.reader is None:
+            raise Exception("Not connected to server")
+
+        line = await asyncio.wait_for(self.reader.readline(), timeout=self.timeout)
+        if not line:
+            raise ConnectionError("Connection closed by server")
+        self.receive_stats.add(nbytes=len(line), nmessages=1)
+        message = line.removesuffix(b"\n")
+        if self.journal is not None:
+            self.journal.received(message)
+        return message
+
+    def get_receive_stats(self) -> ReceiveStats:
+        """get throughput of the receive path
+
+        Returns:
+            ReceiveStats: received bytes and messages, and their rates per second
+        """
+        return self.receive_stats
+
+    async def dc_recv(self) -> None:
+        """receive dc"""
+        self._handle_dc(await self.receive())
+
+    async def dc_ok(self) -> None:
+        """send dc_ok"""
+        await self.send(encode_dc_ok(self.client_name, self.codec))
+
+    async def is_ready_recv(self) -> None:
+        """receive is_ready"""
+        self._handle_is_ready(await self.receive())
+
+    async def ready_ok(self, player_order: list = [0, 1, 2, 3]) -> None:
+        """send ready_ok"""
+        await self.send(encode_ready_ok(player_order, self.codec))
+
+    async def get_new_game(self) -> None:
+        """receive new_game"""
+        self._handle_new_game(await self.receive())
+
+    async def update(self) -> Update | CompactUpdate | LazyUpdate | None:
+        """receive update
+
+        Returns:
+            Update | None: received update, None if another message arrived
+        """
+        if self.is_connected is False:
+            raise Exception("Not connected to server")
+
+        raw = await self.receive_raw()
+        return self._handle_update(self.codec.loads(raw), raw)
+
+    async def move(
+        self,
+        x: float = 0.0,
+        y: float = 2.4,
+        rotation: StoneRotation = StoneRotation.outturn,
+    ) -> None:
+        """Shot Stone
+
+        Args:
+            x (float, optional): Velocity in x-axis direction. Defaults to 0.0.
+            y (float, optional): Velocity in y-axis direction. Defaults to 2.4.
+            rotation (StoneRotation, optional): Rotation of stone. Defaults to StoneRotation.outturn.
+        """
+        if self._record_move(x, y, rotation):
+            await self.send(encode_move(x, y, rotation, self.codec))
+
+    async def _move_at_deadline(
+        self,
+        deadline: Deadline,
+        x: float = 0.0,
+        y: float = 2.4,
+        rotation: StoneRotation = StoneRotation.outturn,
+    ) -> None:
+        """send the move of Deadline.send_best_at_deadline() if its turn is current"""
+        if self._record_move(x, y, rotation, deadline):
+            await self.send(encode_move(x, y, rotation, self.codec))
+
+    async def concede(self) -> None:
+        """Concede"""
+        if self.deadline is not None:
+            self.deadline.cancel()
+        await self.send(encode_concede(self.codec))
@@ -0,0 +1,172 @@
+"""NumPy view of the stones on the sheet and the geometry of the sheet.
+
+A board is a ``(2, 8, 3)`` float array indexed by team (team0, team1), stone
+index and x, y, angle. Stones that are not in play are NaN. It is built straight
+from the stones of the wire message, without the Coordinate data classes.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+# Geometry of the sheet in meters, on the coordinate system of the server
+TEE_X = 0.0
+TEE_Y = 38.405
+HOUSE_RADIUS = 1.829
+STONE_RADIUS = 0.145
+HOG_LINE_Y = 32.004
+SHEET_WIDTH = 4.75
+
+TEAMS = ("team0", "team1")
+STONES_PER_TEAM = 8
+
+_ABSENT = (np.nan, np.nan, np.nan)
+
+
+@dataclass(slots=True, eq=False)
+class Board:
+    """Positions and angles of every stone as arrays"""
+
+    # (2, 8, 3) x, y and angle, NaN for stones not in play
+    array: np.ndarray
+    # (2, 8) True for stones in play
+    in_play: np.ndarray
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Board):
+            return NotImplemented
+        return np.array_equal(self.array, other.array, equal_nan=True)
+
+    @property
+    def x(self) -> np.ndarray:
+        """(2, 8) x coordinates"""
+        return self.array[..., 0]
+
+    @property
+    def y(self) -> np.ndarray:
+        """(2, 8) y coordinates"""
+        return self.array[..., 1]
+
+    @property
+    def angle(self) -> np.ndarray:
+        """(2, 8) angles"""
+        return self.array[..., 2]
+
+    def team(self, team: str) -> np.ndarray:
+        """(8, 3) x, y and angle of one team
+
+        Args:
+            team (str): "team0" or "team1"
+        """
+        return self.array[TEAMS.index(team)]
+
+
+@dataclass(slots=True, frozen=True)
+class SheetGeometry:
+    """Geometry of the sheet, the width is a setting of the match"""
+
+    sheet_width: float = SHEET_WIDTH
+    tee_x: float = TEE_X
+    tee_y: float = TEE_Y
+    house_radius: float = HOUSE_RADIUS
+    stone_radius: float = STONE_RADIUS
+    hog_line_y: float = HOG_LINE_Y
+
+    @classmethod
+    def from_is_ready(cls, is_ready: Any) -> "SheetGeometry":
+        """geometry of the sheet of a match
+
+        Args:
+            is_ready (Any): IsReady data class or is_ready message
+
+        Returns:
+            SheetGeometry: geometry with the sheet width of the match setting
+        """
+        if isinstance(is_ready, dict):
+            return cls(sheet_width=is_ready["game"]["setting"]["sheet_width"])
+        return cls(sheet_width=is_ready.game.setting.sheet_width)
+
+
+def parse_board(stones_recv: dict[str, list]) -> Board:
+    """Convert the stones of the wire message to Board
+
+    Args:
+        stones_recv (dict[str, list]): {"team0": [...], "team1": [...]}, None for stones not in play
+
+    Returns:
+        Board: board of the stones
+    """
+    array = np.array(
+        [
+            (
+                _ABSENT
+                if stone is None
+                else (stone["position"]["x"], stone["position"]["y"], stone["angle"])
+            )
+            for team in TEAMS
+            for stone in stones_recv[team]
+        ],
+        dtype=np.float64,
+    ).reshape(len(TEAMS), STONES_PER_TEAM, 3)
+    return Board(array=array, in_play=~np.isnan(array[..., 0]))
+
+
+def board_from_stones(stones: Any) -> Board:
+    """Convert the stones of a State or CompactState to Board
+
+    Args:
+        stones (Any): Stones of Coordinate, or CompactStones of StonePosition
+
+    Returns:
+        Board: board of the stones
+    """
+    values = []
+    for team in TEAMS:
+        for stone in getattr(stones, team):
+            if (position := getattr(stone, "position", None)) is not None:
+                values.append((position[0].x, position[0].y, stone.angle))
+            else:
+                values.append((stone.x, stone.y, stone.angle))
+    # None of a stone not in play becomes NaN
+    array = np.array(values, dtype=np.float64).reshape(len(TEAMS), STONES_PER_TEAM, 3)
+    return Board(array=array, in_play=~np.isnan(array[..., 0]))
+
+
+def board_to_stones(board: Board) -> dict[str, list[dict[str, Any] | None]]:
+    """Convert Board back to the stones of the wire message
+
+    Args:
+        board (Board): board of the stones
+
+    Returns:
+        dict[str, list[dict[str, Any] | None]]: {"team0": [...], "team1": [...]}
+    """
+    return {
+        team: [
+            (
+                {"angle": float(angle), "position": {"x": float(x), "y": float(y)}}
+                if in_play
+                else None
+            )
+            for (x, y, angle), in_play in zip(board.array[t], board.in_play[t])
+        ]
+        for t, team in enumerate(TEAMS)
+    }
+
+
+def stones_in_house(
+    array: np.ndarray, geometry: SheetGeometry | None = None
+) -> np.ndarray:
+    """Count the stones of each team in the house, touching the outer ring counts
+
+    Args:
+        array (np.ndarray): (..., 2, 8, 3) boards, NaN for stones not in play
+        geometry (SheetGeometry | None, optional): Geometry of the sheet. Defaults to the standard sheet.
+
+    Returns:
+        np.ndarray: (..., 2) number of stones in the house
+    """
+    g = geometry or SheetGeometry()
+    distance = np.hypot(array[..., 0] - g.tee_x, array[..., 1] - g.tee_y)
+    return np.count_nonzero(distance <= g.house_radius + g.stone_radius, axis=-1)
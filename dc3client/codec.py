@@ -0,0 +1,82 @@
+"""JSON codecs used for every message sent to and received from the server.
+
+orjson is used when it is installed (``pip install dc3client[fast]``), and the
+standard library json module is used otherwise.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+class JSONCodec:
+    """JSON codec based on the standard library"""
+
+    name = "json"
+
+    def loads(self, data: bytes | str) -> Any:
+        """decode one JSON document
+
+        Args:
+            data (bytes | str): JSON document
+
+        Returns:
+            Any: decoded object
+        """
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        """encode one object as compact UTF-8 JSON
+
+        Args:
+            obj (Any): object to encode
+
+        Returns:
+            bytes: JSON document
+        """
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+class OrjsonCodec(JSONCodec):
+    """JSON codec based on orjson"""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+
+    def loads(self, data: bytes | str) -> Any:
+        return orjson.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+CODECS: dict[str, type[JSONCodec]] = {
+    JSONCodec.name: JSONCodec,
+    OrjsonCodec.name: OrjsonCodec,
+}
+
+
+def get_codec(name: str | None = None) -> JSONCodec:
+    """get a JSON codec
+
+    Args:
+        name (str | None, optional): "json" or "orjson". Defaults to the fastest installed codec.
+
+    Returns:
+        JSONCodec: codec instance
+    """
+    if name is None:
+        name = OrjsonCodec.name if orjson is not None else JSONCodec.name
+    if name not in CODECS:
+        raise ValueError(f"Unknown codec : {name}")
+    return CODECS[name]()
+
+
+default_codec = get_codec()
@@ -0,0 +1,352 @@
+"""Frozen, slotted variants of the update models with flat stone positions.
+
+``Coordinate`` keeps a stone as an angle plus a one-element ``list[Position]``,
+which costs four objects per stone. ``StonePosition`` holds x, y and angle
+directly, and an absent stone is the shared ``ABSENT_STONE`` instance, so a
+long match with trajectories retained takes a fraction of the memory. The
+field names follow ``dc3client.models`` wherever the layout allows it.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from dc3client.board import Board, board_from_stones
+from dc3client.models import (
+    ActualMove,
+    Concede,
+    ExtraEndScore,
+    GameResult,
+    Scores,
+    ThinkingTimeRemaining,
+)
+from dc3client.protocol import parse_actual_move
+from dc3client.trajectory import (
+    ColumnarTrajectory,
+    columnar_trajectory_to_message,
+    parse_columnar_trajectory,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class StonePosition:
+    """Position and angle of one stone, None for a stone not in play"""
+
+    x: float | None
+    y: float | None
+    angle: float | None
+
+
+ABSENT_STONE = StonePosition(x=None, y=None, angle=None)
+
+# Share the team names of the frames instead of keeping one string per frame
+_TEAM_NAMES = {"team0": "team0", "team1": "team1"}
+
+
+@dataclass(frozen=True, slots=True)
+class CompactStones:
+    """Stone positions of each team"""
+
+    team0: tuple[StonePosition, ...]
+    team1: tuple[StonePosition, ...]
+
+
+_NO_STONES = CompactStones(team0=(), team1=())
+
+
+@dataclass(frozen=True, slots=True)
+class CompactState:
+    """Match state"""
+
+    end: int
+    extra_end_score: ExtraEndScore
+    game_result: GameResult
+    hammer: str
+    scores: Scores
+    shot: int
+    stones: CompactStones
+    thinking_time_remaining: ThinkingTimeRemaining
+    _board: Board | None = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def board(self) -> Board:
+        """NumPy view of the stones, built on first access"""
+        if self._board is None:
+            object.__setattr__(self, "_board", board_from_stones(self.stones))
+        return self._board  # type: ignore
+
+
+@dataclass(frozen=True, slots=True)
+class CompactFrame:
+    """Stone that moved in one trajectory frame, x, y and angle are None once removed"""
+
+    team: str | None
+    index: int | None
+    x: float | None
+    y: float | None
+    angle: float | None
+
+
+@dataclass(frozen=True, slots=True)
+class CompactTrajectory:
+    """Trajectory of the last shot"""
+
+    seconds_per_frame: float | None
+    start: CompactStones
+    finish: CompactStones
+    # one tuple per simulation step, with the stones that moved in the step,
+    # earlier versions kept every frame in one flat tuple
+    frames: tuple[tuple[CompactFrame, ...], ...]
+
+
+@dataclass(frozen=True, slots=True)
+class CompactLastMove:
+    """Results of previous shot"""
+
+    actual_move: ActualMove | Concede
+    free_guard_zone_foul: bool
+    trajectory: CompactTrajectory | ColumnarTrajectory | None
+
+
+@dataclass(frozen=True, slots=True)
+class CompactUpdate:
+    """Match information on each shot"""
+
+    cmd: str
+    next_team: str
+    state: CompactState
+    last_move: CompactLastMove | None
+
+
+def parse_compact_stone(data: dict[str, Any] | None) -> StonePosition:
+    """Convert one stone of the wire format to StonePosition"""
+    if data is None:
+        return ABSENT_STONE
+    position = data["position"]
+    return StonePosition(x=position["x"], y=position["y"], angle=data["angle"])
+
+
+def parse_compact_stones(message_recv: dict[str, list]) -> CompactStones:
+    """Convert the stones of both teams to CompactStones
+
+    Args:
+        message_recv (dict[str, list]): {"team0": [...], "team1": [...]}
+
+    Returns:
+        CompactStones: stone positions
+    """
+    return CompactStones(
+        team0=tuple(map(parse_compact_stone, message_recv["team0"])),
+        team1=tuple(map(parse_compact_stone, message_recv["team1"])),
+    )
+
+
+def parse_compact_frame(frame: dict[str, Any] | None) -> CompactFrame:
+    """Convert one trajectory frame entry to CompactFrame"""
+    if frame is None:
+        return CompactFrame(team=None, index=None, x=None, y=None, angle=None)
+    team = frame.get("team")
+    stone = parse_compact_stone(frame.get("value"))
+    return CompactFrame(
+        team=_TEAM_NAMES.get(team, team),  # type: ignore
+        index=frame.get("index"),
+        x=stone.x,
+        y=stone.y,
+        angle=stone.angle,
+    )
+
+
+def parse_compact_state(state_recv: dict[str, Any]) -> CompactState:
+    """Convert the state of an update message to CompactState
+
+    Args:
+        state_recv (dict[str, Any]): "state" of the update message
+
+    Returns:
+        CompactState: match state
+    """
+    game_result = state_recv["game_result"] or {}
+    return CompactState(
+        end=state_recv["end"],
+        extra_end_score=ExtraEndScore(**state_recv["extra_end_score"]),
+        game_result=GameResult(
+            winner=game_result.get("winner"), reason=game_result.get("reason")
+        ),
+        hammer=state_recv["hammer"],
+        scores=Scores(**state_recv["scores"]),
+        shot=state_recv["shot"],
+        stones=parse_compact_stones(state_recv["stones"]),
+        thinking_time_remaining=ThinkingTimeRemaining(
+            **state_recv["thinking_time_remaining"]
+        ),
+    )
+
+
+def parse_compact_trajectory(
+    trajectory_recv: dict[str, Any] | None,
+) -> CompactTrajectory | None:
+    """Convert the trajectory of the last move to CompactTrajectory
+
+    Args:
+        trajectory_recv (dict[str, Any] | None): "trajectory" of the last move
+
+    Returns:
+        CompactTrajectory | None: trajectory, None if the message has none, empty for the one of a concede
+    """
+    if trajectory_recv is None:
+        return None
+    if "start" not in trajectory_recv:
+        # a concede only carries seconds_per_frame, as in decode_trajectory()
+        return CompactTrajectory(
+            seconds_per_frame=trajectory_recv.get("seconds_per_frame"),
+            start=_NO_STONES,
+            finish=_NO_STONES,
+            frames=(),
+        )
+    return CompactTrajectory(
+        seconds_per_frame=trajectory_recv["seconds_per_frame"],
+        start=parse_compact_stones(trajectory_recv["start"]),
+        finish=parse_compact_stones(trajectory_recv["finish"]),
+        frames=tuple(
+            tuple(parse_compact_frame(frame) for frame in step)
+            for step in trajectory_recv["frames"]
+        ),
+    )
+
+
+def parse_compact_update(
+    message_recv: dict[str, Any], columnar: bool = False
+) -> CompactUpdate | None:
+    """Convert update message to CompactUpdate
+
+    Args:
+        message_recv (dict[str, Any]): update message
+        columnar (bool, optional): Build ColumnarTrajectory instead of CompactTrajectory. Defaults to False.
+
+    Returns:
+        CompactUpdate | None: match information, None if the message is not an update
+    """
+    if message_recv["cmd"] != "update":
+        return None
+
+    last_move = None
+    if (last_move_recv := message_recv["last_move"]) is not None:
+        parse = parse_columnar_trajectory if columnar else parse_compact_trajectory
+        last_move = CompactLastMove(
+            actual_move=parse_actual_move(last_move_recv["actual_move"]),
+            free_guard_zone_foul=last_move_recv["free_guard_zone_foul"],
+            trajectory=parse(last_move_recv.get("trajectory")),
+        )
+
+    return CompactUpdate(
+        cmd=message_recv["cmd"],
+        next_team=message_recv["next_team"],
+        state=parse_compact_state(message_recv["state"]),
+        last_move=last_move,
+    )
+
+
+def _stone_to_message(stone: StonePosition) -> dict[str, Any] | None:
+    if stone is ABSENT_STONE or stone.x is None:
+        return None
+    return {"angle": stone.angle, "position": {"x": stone.x, "y": stone.y}}
+
+
+def _game_result_to_message(game_result: GameResult) -> dict[str, Any] | None:
+    # None until the match is over, as in to_dict()
+    if game_result.winner is None and game_result.reason is None:
+        return None
+    return {"winner": game_result.winner, "reason": game_result.reason}
+
+
+def _frame_to_message(frame: CompactFrame) -> dict[str, Any] | None:
+    # parse_compact_frame() builds an empty frame for a None entry
+    if frame.team is None and frame.index is None:
+        return None
+    return {
+        "team": frame.team,
+        "index": frame.index,
+        "value": _stone_to_message(
+            StonePosition(x=frame.x, y=frame.y, angle=frame.angle)
+        ),
+    }
+
+
+def _stones_to_message(stones: CompactStones) -> dict[str, list]:
+    return {
+        "team0": [_stone_to_message(stone) for stone in stones.team0],
+        "team1": [_stone_to_message(stone) for stone in stones.team1],
+    }
+
+
+def compact_update_to_message(
+    update: CompactUpdate, remove_trajectory: bool = True
+) -> dict[str, Any]:
+    """Convert CompactUpdate back to the layout of the update message
+
+    Args:
+        update (CompactUpdate): update
+        remove_trajectory (bool, optional): Delete trajectory data? Defaults to True.
+
+    Returns:
+        dict[str, Any]: update message
+    """
+    state = update.state
+    message: dict[str, Any] = {
+        "cmd": update.cmd,
+        "next_team": update.next_team,
+        "state": {
+            "end": state.end,
+            "extra_end_score": {
+                "team0": state.extra_end_score.team0,
+                "team1": state.extra_end_score.team1,
+            },
+            "game_result": _game_result_to_message(state.game_result),
+            "hammer": state.hammer,
+            "scores": {"team0": state.scores.team0, "team1": state.scores.team1},
+            "shot": state.shot,
+            "stones": _stones_to_message(state.stones),
+            "thinking_time_remaining": {
+                "team0": state.thinking_time_remaining.team0,
+                "team1": state.thinking_time_remaining.team1,
+            },
+        },
+        "last_move": None,
+    }
+
+    if (last_move := update.last_move) is None:
+        return message
+
+    if isinstance(last_move.actual_move, Concede):
+        actual_move: dict[str, Any] = {"type": last_move.actual_move.type}
+    else:
+        actual_move = {
+            "rotation": last_move.actual_move.rotation,
+            "type": last_move.actual_move.type,
+            "velocity": {
+                "x": last_move.actual_move.velocity.x,
+                "y": last_move.actual_move.velocity.y,
+            },
+        }
+
+    trajectory = None
+    if remove_trajectory or last_move.trajectory is None:
+        pass
+    elif isinstance(last_move.trajectory, ColumnarTrajectory):
+        trajectory = columnar_trajectory_to_message(last_move.trajectory)
+    else:
+        trajectory = {
+            "seconds_per_frame": last_move.trajectory.seconds_per_frame,
+            "start": _stones_to_message(last_move.trajectory.start),
+            "finish": _stones_to_message(last_move.trajectory.finish),
+            "frames": [
+                [_frame_to_message(frame) for frame in step]
+                for step in last_move.trajectory.frames
+            ],
+        }
+
+    message["last_move"] = {
+        "actual_move": actual_move,
+        "free_guard_zone_foul": last_move.free_guard_zone_foul,
+        "trajectory": trajectory,
+    }
+    return message
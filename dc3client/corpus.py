@@ -0,0 +1,392 @@
+"""Multi-game training corpus stored as a few large memory-mapped arrays.
+
+``CorpusWriter`` appends the shots of many games, read from .dcl2 logs or .dc3a
+archives, column by column to temporary files and assembles them into one
+archive container (see dc3client.archive). Every column has one row per update
+of every game, and ``game_offsets`` indexes the rows of each game, so
+``Corpus`` can slice random minibatches straight from the memory map without
+parsing or opening one file per game::
+
+    build_corpus("corpus.dc3c", pathlib.Path("logs").glob("*/game.dcl2"))
+    corpus = Corpus("corpus.dc3c")
+    batch = corpus.batch(corpus.sample(256))
+"""
+
+import pathlib
+import tempfile
+from os import PathLike
+from typing import Any, Iterable
+
+import numpy as np
+
+from dc3client.archive import (
+    ARCHIVE_FRAME_DTYPE,
+    MOVE_NONE,
+    ArrayFile,
+    MatchArchive,
+    match_arrays,
+    write_arrays,
+)
+from dc3client.board import TEAMS
+from dc3client.logs import read_dcl2
+
+# Columns copied from the match arrays, one row per update
+ROW_COLUMNS = (
+    "board",
+    "end",
+    "shot",
+    "hammer",
+    "next_team",
+    "thinking_time_remaining",
+    "move",
+    "rotation",
+    "move_type",
+    "free_guard_zone_foul",
+)
+
+# Columns of the shots when trajectories are included
+TRAJECTORY_COLUMNS = (
+    "has_trajectory",
+    "seconds_per_frame",
+    "n_frames",
+    "trajectory_start",
+    "trajectory_finish",
+)
+
+
+def shot_results(arrays: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Derive the score columns of every update of one game
+
+    Args:
+        arrays (dict[str, np.ndarray]): match arrays, see MatchArchive
+
+    Returns:
+        dict[str, np.ndarray]: "score" (N, 2) int16, total of each team after the update,
+            and "end_score" (N, 2) int16, final score of each team in the end of the update, -1 if unknown
+    """
+    scores = arrays["scores"].astype(np.int32)
+    extra = arrays["extra_end_score"].astype(np.int32)
+    score = np.where(scores >= 0, scores, 0).sum(axis=2) + np.maximum(extra, 0)
+
+    n = len(arrays["end"])
+    end_score = np.full((n, len(TEAMS)), -1, dtype=np.int16)
+    if n > 0:
+        final_scores = scores[-1]
+        ends = arrays["end"].astype(np.intp)
+        regular = ends < final_scores.shape[1]
+        end_score[regular] = final_scores[:, ends[regular]].T
+        end_score[~regular] = extra[-1]
+    return {"score": score.astype(np.int16), "end_score": end_score}
+
+
+def next_moves(arrays: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Shift the moves of one game back by one update
+
+    "move" of an update is the shot that produced its board, the shot played
+    from that board is the "move" of the following update.
+
+    Args:
+        arrays (dict[str, np.ndarray]): match arrays, see MatchArchive
+
+    Returns:
+        dict[str, np.ndarray]: "next_move", "next_rotation" and "next_move_type", the move played from the board of the update,
+            NaN, -1 and MOVE_NONE on the last update
+    """
+    columns = {}
+    for name, missing in (("move", np.nan), ("rotation", -1), ("move_type", MOVE_NONE)):
+        column = np.asarray(arrays[name])
+        shifted = np.full_like(column, missing)
+        shifted[:-1] = column[1:]
+        columns[f"next_{name}"] = shifted
+    return columns
+
+
+def _winner(game_result: dict[str, Any] | None) -> int:
+    if not game_result or game_result.get("winner") not in TEAMS:
+        return -1
+    return TEAMS.index(game_result["winner"])
+
+
+class CorpusWriter:
+    """Append games to a corpus column by column, without holding them in memory"""
+
+    def __init__(self, path: str | PathLike, trajectory: bool = False) -> None:
+        """initialize corpus writer, the corpus is written by close()
+
+        Args:
+            path (str | PathLike): Output corpus file.
+            trajectory (bool, optional): Include the trajectories of the shots. Defaults to False.
+        """
+        self.path = pathlib.Path(path)
+        self.trajectory = trajectory
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp = tempfile.TemporaryDirectory(dir=self.path.parent)
+        self._files: dict[str, Any] = {}
+        self._specs: dict[str, tuple[np.dtype, tuple[int, ...]]] = {}
+        self._lengths: dict[str, int] = {}
+        self.games: list[dict[str, Any]] = []
+        self._game_offsets = [0]
+        self._frame_total = 0
+        self.closed = False
+
+    def __enter__(self) -> "CorpusWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """number of games added"""
+        return len(self.games)
+
+    def _append(self, name: str, array: np.ndarray) -> None:
+        spec = (array.dtype, array.shape[1:])
+        if name not in self._files:
+            self._files[name] = open(pathlib.Path(self._tmp.name, name), "wb")
+            self._specs[name] = spec
+            self._lengths[name] = 0
+        elif self._specs[name] != spec:
+            raise ValueError(
+                f"Column {name} changed from {self._specs[name]} to {spec}"
+            )
+        self._files[name].write(np.ascontiguousarray(array).reshape(-1).view(np.uint8))
+        self._lengths[name] += len(array)
+
+    def add(self, arrays: dict[str, np.ndarray], info: dict[str, Any]) -> None:
+        """append one game
+
+        Args:
+            arrays (dict[str, np.ndarray]): match arrays of the game, see MatchArchive
+            info (dict[str, Any]): JSON serializable description of the game, with its "game_result"
+        """
+        n = len(arrays["end"])
+        self._append_rows(arrays, len(self.games))
+        self.games.append(info)
+        self._game_offsets.append(self._game_offsets[-1] + n)
+
+    def _append_rows(self, arrays: dict[str, np.ndarray], game: int) -> None:
+        for name in ROW_COLUMNS:
+            self._append(name, np.asarray(arrays[name]))
+        for name, column in shot_results(arrays).items():
+            self._append(name, column)
+        for name, column in next_moves(arrays).items():
+            self._append(name, column)
+        self._append("game", np.full(len(arrays["end"]), game, dtype=np.int32))
+
+        if self.trajectory:
+            for name in TRAJECTORY_COLUMNS:
+                self._append(name, np.asarray(arrays[name]))
+            frames = np.asarray(arrays["frames"]).astype(ARCHIVE_FRAME_DTYPE)
+            offsets = np.asarray(arrays["frame_offsets"], dtype=np.int64)
+            self._append("frame_offsets", offsets[:-1] + self._frame_total)
+            self._append("frames", frames)
+            self._frame_total += len(frames)
+
+    def add_dcl2(self, path: str | PathLike) -> None:
+        """append the game of a .dcl2 log or a RawJournal
+
+        Args:
+            path (str | PathLike): .dcl2 file
+        """
+        dc = None
+        updates = []
+        for record in read_dcl2(path):
+            message = record["log"]
+            if message["cmd"] == "update":
+                updates.append(message)
+            elif message["cmd"] == "dc" and dc is None:
+                dc = message
+        arrays = match_arrays(updates, self.trajectory)
+        self.add(
+            arrays,
+            {
+                "source": str(path),
+                "game_id": None if dc is None else dc["game_id"],
+                "game_result": updates[-1]["state"]["game_result"] if updates else None,
+            },
+        )
+
+    def add_archive(self, path: str | PathLike) -> None:
+        """append the game of a .dc3a match archive
+
+        Args:
+            path (str | PathLike): .dc3a file
+        """
+        with MatchArchive(path) as archive:
+            arrays = {name: archive[name] for name in archive.names()}
+            self.add(
+                arrays,
+                {
+                    "source": str(path),
+                    "game_id": None if archive.dc is None else archive.dc["game_id"],
+                    "game_result": archive.game_result,
+                },
+            )
+
+    def add_file(self, path: str | PathLike) -> None:
+        """append a .dcl2 log or a .dc3a archive, chosen by its suffix"""
+        if pathlib.Path(path).suffix == ".dc3a":
+            self.add_archive(path)
+        else:
+            self.add_dcl2(path)
+
+    def close(self) -> None:
+        """write the corpus file and remove the temporary columns
+
+        A corpus without games is still written, with every column empty.
+        """
+        if self.closed:
+            return
+        if not self.games:
+            # zero rows of every column, laid out as the columns of a game
+            self._append_rows(match_arrays([], self.trajectory), 0)
+
+        columns: dict[str, np.ndarray] = {}
+        for name, f in self._files.items():
+            f.close()
+            dtype, shape = self._specs[name]
+            length = self._lengths[name]
+            if length * dtype.itemsize * int(np.prod(shape, dtype=np.int64)) == 0:
+                columns[name] = np.empty((length, *shape), dtype=dtype)
+            else:
+                columns[name] = np.memmap(
+                    f.name, dtype=dtype, mode="r", shape=(length, *shape)
+                )
+        if self.trajectory:
+            columns["frame_offsets"] = np.append(
+                columns["frame_offsets"], np.int64(self._frame_total)
+            )
+        columns["game_offsets"] = np.array(self._game_offsets, dtype=np.int64)
+        columns["winner"] = np.array(
+            [_winner(game.get("game_result")) for game in self.games], dtype=np.int8
+        )
+
+        write_arrays(self.path, columns, {"kind": "corpus", "games": self.games})
+        self._files.clear()
+        columns.clear()
+        self._tmp.cleanup()
+        self.closed = True
+
+
+def build_corpus(
+    path: str | PathLike, sources: Iterable[str | PathLike], trajectory: bool = False
+) -> int:
+    """Consolidate many games into one corpus file
+
+    Args:
+        path (str | PathLike): output corpus file
+        sources (Iterable[str | PathLike]): .dcl2 logs and .dc3a archives
+        trajectory (bool, optional): Include the trajectories of the shots. Defaults to False.
+
+    Returns:
+        int: number of games
+    """
+    with CorpusWriter(path, trajectory) as writer:
+        for source in sources:
+            writer.add_file(source)
+        return len(writer)
+
+
+class Corpus(ArrayFile):
+    """Shots of many games read from a corpus file
+
+    Every column has one row per update of every game, see MatchArchive for the
+    columns shared with a match archive. "move", "rotation" and "move_type" of
+    a row are the shot that produced its "board", use the "next_" columns to
+    pair a board with the shot played from it. The corpus adds:
+
+    - game (N,) int32: game number of the row
+    - score (N, 2) int16: total score of each team after the update
+    - end_score (N, 2) int16: final score of each team in the end of the row, -1 if unknown
+    - next_move (N, 2) float32: (vx, vy) of the shot played from the board of the row, NaN on the last row of a game
+    - next_rotation (N,) int8: index in ROTATIONS of that shot, -1 on the last row of a game
+    - next_move_type (N,) int8: MOVE_NONE, MOVE_SHOT or MOVE_CONCEDE of that shot, MOVE_NONE on the last row of a game
+    - game_offsets (G + 1,) int64: rows of game g are game_offsets[g]:game_offsets[g + 1]
+    - winner (G,) int8: index of the winning team, -1 if unknown
+    """
+
+    def __len__(self) -> int:
+        """number of rows"""
+        return self._layout["game"]["shape"][0]
+
+    @property
+    def games(self) -> list[dict[str, Any]]:
+        """description of every game, with its source, game_id and game_result"""
+        return self.header["games"]
+
+    @property
+    def n_games(self) -> int:
+        """number of games"""
+        return len(self.games)
+
+    def game_rows(self, game: int) -> slice:
+        """rows of one game
+
+        Args:
+            game (int): game number
+
+        Returns:
+            slice: rows of the game, in the order received
+        """
+        offsets = self["game_offsets"]
+        return slice(int(offsets[game]), int(offsets[game + 1]))
+
+    def row(self, game: int, end: int, shot: int) -> int:
+        """row of the update after a shot
+
+        The "move" of the row is that shot and its "board" the stones after it,
+        the "next_move" of the row is the following shot.
+
+        Args:
+            game (int): game number
+            end (int): end number
+            shot (int): number of shots thrown in the end
+
+        Returns:
+            int: row number
+        """
+        rows = self.game_rows(game)
+        ends = self["end"][rows].astype(np.int64)
+        keys = ends * 256 + self["shot"][rows]
+        key = end * 256 + shot
+        index = int(np.searchsorted(keys, key))
+        if index == len(keys) or keys[index] != key:
+            raise KeyError(f"No shot {shot} in end {end} of game {game}")
+        return rows.start + index
+
+    def sample(
+        self, size: int, rng: np.random.Generator | None = None, replace: bool = True
+    ) -> np.ndarray:
+        """random row numbers for a minibatch
+
+        Args:
+            size (int): number of rows
+            rng (np.random.Generator | None, optional): Random generator. Defaults to a new default_rng().
+            replace (bool, optional): Allow a row more than once. Defaults to True.
+
+        Returns:
+            np.ndarray: (size,) row numbers
+        """
+        rng = rng or np.random.default_rng()
+        return rng.choice(len(self), size=size, replace=replace)
+
+    def batch(
+        self, rows: np.ndarray | slice, columns: Iterable[str] | None = None
+    ) -> dict[str, np.ndarray]:
+        """gather rows of per-row columns into in-memory arrays
+
+        Args:
+            rows (np.ndarray | slice): row numbers or a slice
+            columns (Iterable[str] | None, optional): Columns to gather. Defaults to every per-row column.
+
+        Returns:
+            dict[str, np.ndarray]: column name -> rows
+        """
+        if columns is None:
+            columns = [
+                name
+                for name in self.names()
+                if name not in ("frames", "game_offsets", "winner")
+                and self._layout[name]["shape"][:1] == [len(self)]
+            ]
+        return {name: np.asarray(self[name][rows]) for name in columns}
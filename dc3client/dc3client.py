@@ -1,59 +1,77 @@
 import atexit
-import json
 import logging
 import socket
 import time
-from dataclasses import fields
-from typing import Any
-
+from collections import deque
+from dataclasses import replace
+from functools import partial
+from os import PathLike
+from typing import Any, Callable
+
+from dc3client.codec import JSONCodec, default_codec
+from dc3client.compact import (
+    CompactUpdate,
+    compact_update_to_message,
+    parse_compact_update,
+)
+from dc3client.history import UpdateHistory
+from dc3client.journal import RawJournal
+from dc3client.lazy import LazyUpdate, parse_lazy_update
+from dc3client.deadline import Deadline
+from dc3client.framing import LineFramer, ReceiveStats
 from dc3client.models import (
-    ActualMove,
-    Concede,
-    Coordinate,
     DCNotFoundError,
-    ExtraEndScore,
-    ExtraEndThinkingTime,
-    Finish,
-    Frame,
-    GameResult,
     GameResultNotFoundError,
-    GameRule,
     IsReady,
     IsReadyNotFoundError,
-    LastMove,
     MatchData,
     NewGame,
-    PlayerInfo,
-    Players,
-    Position,
-    Scores,
     ServerDC,
-    Setting,
     ShotInfo,
-    Simulator,
-    Start,
-    State,
     StoneRotation,
-    Stones,
-    ThinkingTime,
-    ThinkingTimeRemaining,
     Trajectory,
     Update,
-    Velocity,
-    Version,
 )
+from dc3client.ponder import Ponderer, SearchFunction
+from dc3client.protocol import (
+    TRAJECTORY_POLICIES,
+    apply_trajectory_policy,
+    encode_concede,
+    encode_dc_ok,
+    encode_move,
+    encode_ready_ok,
+    parse_dc,
+    parse_is_ready,
+    parse_new_game,
+    parse_update,
+)
+from dc3client.ratelimit import SendQueue, TokenBucket
+from dc3client.recorder import MatchRecorder
+from dc3client.serialize import to_dict
+from dc3client.trajectory import ColumnarTrajectory
 
 
 class BaseClient:
     def __init__(
-        self, timeout: int = 10, buffer: int = 1024, log_level: int = logging.INFO
+        self,
+        timeout: int = 10,
+        buffer: int = 1024,
+        log_level: int = logging.INFO,
+        rate_limit: float = 3.0,
+        send_queue: bool = False,
+        codec: JSONCodec | None = None,
+        journal: str | PathLike | RawJournal | None = None,
     ):
         """base client initialize
 
         Args:
             timeout (int, optional): Time to client timeout. Defaults to 10.
-            buffer (int, optional): Buffer size. Defaults to 1024.
+            buffer (int, optional): Minimum size of each socket read. Defaults to 1024.
             log_level (int, optional): Minimum level of logging. Defaults to logging.INFO.
+            rate_limit (float, optional): Minimum time interval to send data to the server. Defaults to 3.0.
+            send_queue (bool, optional): Send from a writer thread so that send() returns immediately. Defaults to False.
+            codec (JSONCodec | None, optional): JSON codec for messages. Defaults to the fastest installed codec.
+            journal (str | PathLike | RawJournal | None, optional): Tee every raw received and sent line to this .dcl2 style file. Defaults to None.
         """
 
         self.socket = None  # socket object
@@ -61,24 +79,43 @@ class BaseClient:
         self.timeout = timeout  # timeout in seconds
         self.buffer = buffer  # buffer size in bytes
 
-        self.message_buffer = ""
+        self.framer = LineFramer(buffer)  # newline framing of received data
+        self.codec = codec or default_codec  # JSON codec of messages
 
         self.logger = logging.getLogger("socket_client")
 
         self.logger.setLevel(log_level)
 
-        formatter = logging.Formatter(
-            "%(asctime)s - %(levelname)s:%(name)s - %(message)s"
-        )
-        stream_handler = logging.StreamHandler()
-        stream_handler.setFormatter(formatter)
-        self.logger.addHandler(stream_handler)
+        # Add the handler only once, clients of the same process share the logger
+        if not self.logger.handlers:
+            formatter = logging.Formatter(
+                "%(asctime)s - %(levelname)s:%(name)s - %(message)s"
+            )
+            stream_handler = logging.StreamHandler()
+            stream_handler.setFormatter(formatter)
+            self.logger.addHandler(stream_handler)
+
+        # Rate limit on the monotonic clock
+        self.limiter = TokenBucket(rate_limit)
+
+        # Writer thread, started on connect when send_queue is True
+        self.use_send_queue = send_queue
+        self.send_queue: SendQueue | None = None
+
+        # Raw lines exchanged with the server, written as they are
+        if journal is None or isinstance(journal, RawJournal):
+            self.journal = journal
+        else:
+            self.journal = RawJournal(journal)
 
-        # Get current time for rate limit
-        self.last_send = time.time()
+    @property
+    def rate_limit(self) -> float:
+        """Rate limit time interval"""
+        return self.limiter.interval
 
-        # Rate limit time interval
-        self.rate_limit = 3.0
+    @rate_limit.setter
+    def rate_limit(self, value: float) -> None:
+        self.limiter.interval = value
 
     def _connect(self, address: tuple):
         self.logger.info(f"Connect to {address}")
@@ -93,16 +130,29 @@ class BaseClient:
         if self.socket is None:
             self.logger.error("Socket is None")
             raise Exception("Socket is None")
+
+        if self.use_send_queue:
+            self.send_queue = SendQueue(self._write, self.limiter, self.logger)
+
         # Close socket on exit
         atexit.register(self.__shutdown)
 
-    def send(self, message: str = ""):
+    def send(self, message: str | bytes = ""):
         """send message to server
 
+        With the send queue enabled the message is handed to the writer thread and
+        this returns immediately, otherwise it sleeps for the rest of the rate limit.
+
         Args:
-            message (str, optional): massage content. Defaults to "".
+            message (str | bytes, optional): massage content. Defaults to "".
         """
 
+        if isinstance(message, bytes):
+            data = message
+            message = message.decode("utf-8")
+        else:
+            data = message.encode("utf-8")
+
         if message == "":
             self.logger.info("In Manual Mode")
             while True:
@@ -110,19 +160,28 @@ class BaseClient:
                 self.socket.send(message.encode("utf-8"))  # type: ignore
                 self.logger.info(f"Send message : {message}")
 
+        elif self.send_queue is not None:
+            self.send_queue.put(data)
+            self.logger.info(f"Queue message : {message}")
+
         else:
-            while True:
-                if (
-                    wait_time := ((now := time.time()) - self.last_send)
-                ) > self.rate_limit:
-                    self.socket.send(message.encode("utf-8"))  # type: ignore
-                    self.logger.info(f"Send message : {message}")
-                    self.last_send = now
-                    break
-                else:
-                    self.logger.debug(f"Rate limit {self.rate_limit} seconds")
-                    self.logger.debug(f"Please wait {wait_time + .5} seconds")
-                    time.sleep(wait_time + 0.5)
+            if (wait_time := self.limiter.delay()) > 0.0:
+                self.logger.debug(f"Rate limit {self.rate_limit} seconds")
+                self.logger.debug(f"Please wait {wait_time} seconds")
+            self.limiter.acquire()
+            self._write(data)
+            self.logger.info(f"Send message : {message}")
+
+    def _write(self, data: bytes) -> None:
+        """write one message to the socket and journal it once it is sent"""
+        self.socket.sendall(data)  # type: ignore
+        if self.journal is not None:
+            self.journal.sent(data)
+
+    def flush(self) -> None:
+        """wait until every queued message has been sent"""
+        if self.send_queue is not None:
+            self.send_queue.join()
 
     def receive(self) -> dict[str, Any]:
         """receive message from server until "\n"
@@ -130,425 +189,291 @@ class BaseClient:
         Returns:
             dict[str, Any]: received message
         """
+        return self.codec.loads(self.receive_raw())
 
-        message = ""
-        while True:
-            if self.message_buffer != "":
-                message_recv = self.message_buffer
-                self.message_buffer = ""
-            else:
-                message_recv: str = self.socket.recv(self.buffer).decode("utf-8")  # type: ignore
-            message += message_recv
-            if "\n" in message_recv:
-                # split message by "\n"
-                message_split = message.split("\n")
-                # set first message to message
-                message = message_split[0]
-                # set second and later message to message_buffer
-                self.message_buffer = "\n".join(message_split[1:])
-                break
-
-        s = json.dumps(message)
-        json_data = json.loads(s)
-        dict_data = json.loads(json_data)
-        return dict_data
+    def receive_raw(self) -> bytes:
+        """receive one message from server without decoding it
+
+        Returns:
+            bytes: received message without the trailing newline
+        """
+        while (message := self.framer.next_message()) is None:
+            if self.framer.fill(self.socket) == 0:  # type: ignore
+                self.logger.error("Connection closed by server")
+                raise ConnectionError("Connection closed by server")
+
+        if self.journal is not None:
+            self.journal.received(message)
+        return message
+
+    def get_receive_stats(self) -> ReceiveStats:
+        """get throughput of the receive path
+
+        Returns:
+            ReceiveStats: received bytes and messages, and their rates per second
+        """
+        return self.framer.stats
+
+    def close(self):
+        """close connection to the server and the journal"""
+        self.__shutdown()
+        if self.journal is not None:
+            self.journal.close()
 
     def __shutdown(self):
         """shutdown socket"""
+        if self.socket is None:
+            return
         self.logger.info("Shutdown socket")
         try:
+            if self.send_queue is not None:
+                self.send_queue.close()
             self.socket.shutdown(socket.SHUT_RDWR)  # type: ignore
             self.socket.close()  # type: ignore
             self.logger.info("Shutdown socket success")
         except BaseException as e:
             self.logger.error(f"Shutdown socket failed {e}")
             pass
+        finally:
+            self.socket = None
 
 
-class SocketClient(BaseClient):
-    def __init__(
+class MatchHandler:
+    """Bookkeeping of the match data shared by every client implementation"""
+
+    def _init_match(
         self,
-        host: str = "dc3-server",
-        port: int = 10000,
-        client_name: str = "AI0",
-        auto_start: bool = True,
-        rate_limit: float = 0.2,
+        client_name: str,
+        compact: bool = False,
+        lazy: bool = False,
+        columnar: bool = False,
+        trajectory: str = "full",
+        history: int | None = None,
+        history_path: str | PathLike | None = None,
     ) -> None:
-        """initialize socket client
+        """initialize match data
 
         Args:
-            host (str, optional): URL of the server of Digital Curling 3. Defaults to "dc3-server".
-            port (int, optional): Connection port to Digital Curling Server. Defaults to 10000.
-            client_name (str, optional): Identification name of the client. Defaults to "AI0".
-            auto_start (bool, optional): Whether to start the game automatically. Defaults to True.
-            rate_limit (int, optional): Minimum time interval to send data to the server. Defaults to 3.
+            client_name (str): Identification name of the client
+            compact (bool, optional): Store updates as frozen CompactUpdate. Defaults to False.
+            lazy (bool, optional): Store updates as LazyUpdate. Defaults to False.
+            columnar (bool, optional): Store trajectories as ColumnarTrajectory. Defaults to False.
+            trajectory (str, optional): "full", "endpoints" or "drop", see apply_trajectory_policy(). Defaults to "full".
+            history (int | None, optional): Number of updates kept in memory, older ones are spilled to a journal. Defaults to None, keep all.
+            history_path (str | PathLike | None, optional): Journal of the spilled updates. Defaults to a temporary file.
         """
         self.is_connected = False
-        self.server = (host, port)
-        super().__init__(timeout=60, buffer=1024)
 
         self.obj_dict = {}
         self.match_data = MatchData()
+        self.compact = compact
+        self.lazy = lazy
+        self.columnar = columnar
+        if trajectory not in TRAJECTORY_POLICIES:
+            raise ValueError(f"Unknown trajectory policy : {trajectory}")
+        self.trajectory_policy = trajectory
+        if history is not None:
+            self.match_data.update_list = UpdateHistory(  # type: ignore
+                self._parse_update, history, history_path, self.codec  # type: ignore
+            )
 
         self.move_info: list[ShotInfo] = []
 
         # Name of the client
         self.client_name = client_name
 
-        self.rate_limit = rate_limit
+        # Deadline of our current turn and the time kept in reserve on each turn
+        self.deadline: Deadline | None = None
+        self.deadline_margin = 0.1
+        self._updates_received = 0
 
-        if auto_start:
-            self.start_game()
+        # Thinking time charged by the server beyond our own measurement
+        self.overheads: deque[float] = deque(maxlen=8)
+        self._turn_started: float | None = None
+        self._turn_remaining: float | None = None
+        self._move_sent: float | None = None
 
-    def start_game(self):
-        """start game"""
-        super()._connect(self.server)
-        self.dc_recv()
-        self.dc_ok()
-        self.is_ready_recv()
-        self.ready_ok()
-        self.get_new_game()
+        # Search run while the opponent is thinking and its latest result
+        self.ponderer: Ponderer | None = None
+        self.ponder_result: Any = None
 
-    def __stone_trajectory_parser(self, message_recv: list) -> list:
-        """Convert stone trajectory to data class
+        # Stream of the received messages to a file
+        self.recorder: MatchRecorder | None = None
 
-        Args:
-            message_recv (list): List of stone trajectory
+    def set_ponder(self, ponder: SearchFunction | Ponderer | None) -> None:
+        """enable pondering on the opponent's turns
 
-        Returns:
-            list: List of data classes for stone trajectory
+        Args:
+            ponder (SearchFunction | Ponderer | None): search(state, stop_event) run on a worker thread, a configured Ponderer, or None to disable.
         """
-        team_stone: list = []
-        for data in message_recv:
-            if data is None:
-                team_stone.append(
-                    Coordinate(angle=None, position=[Position(x=None, y=None)])
-                )
-
-            else:
-                team_stone.append(
-                    Coordinate(
-                        angle=data["angle"],
-                        position=[
-                            Position(x=data["position"]["x"], y=data["position"]["y"])
-                        ],
-                    )
-                )
-
-        return team_stone
+        if self.ponderer is not None:
+            self.ponderer.close()
+        if ponder is None or isinstance(ponder, Ponderer):
+            self.ponderer = ponder
+        else:
+            self.ponderer = Ponderer(ponder)
 
-    def dc_recv(self):
-        """receive dc"""
-        message_recv = self.receive()
+    def set_recorder(self, record: str | PathLike | MatchRecorder | None) -> None:
+        """stream the messages of the match to an NDJSON file as they are received
 
-        version = Version(
-            major=message_recv["version"]["major"],
-            minor=message_recv["version"]["minor"],
-        )
+        Args:
+            record (str | PathLike | MatchRecorder | None): Output file, gzip if it ends with ".gz", a configured MatchRecorder, or None to stop recording.
+        """
+        if self.recorder is not None:
+            self.recorder.close()
+        if record is None or isinstance(record, MatchRecorder):
+            self.recorder = record
+        else:
+            self.recorder = MatchRecorder(record, codec=self.codec)  # type: ignore
 
-        dc = ServerDC(
-            game_id=message_recv["game_id"],
-            cmd=message_recv["cmd"],
-            version=version,
-            date_time=message_recv["date_time"],
-        )
+    def _record(self, convert: Callable[..., dict[str, Any]], *args: Any) -> None:
+        """queue a received model on the recorder, converted on its writer thread"""
+        if self.recorder is not None:
+            self.recorder.record(partial(convert, *args))
 
+    def _handle_dc(self, message_recv: dict[str, Any]) -> ServerDC:
+        """store received dc"""
+        dc = parse_dc(message_recv)
         self.match_data.server_dc = dc
+        self._record(self.convert_dc, dc)
+        return dc
 
-    def dc_ok(self) -> None:
-        """send dc_ok"""
-
-        message: dict = {"cmd": "dc_ok", "name": self.client_name}
-        message_str: str = json.dumps(message)
-        message_str: str = message_str + "\n"
-        self.send(message_str)
-
-    def is_ready_recv(self):
-        """receive is_ready"""
-
-        message_recv = self.receive()
-
-        thinking_time = ThinkingTime(
-            team0=message_recv["game"]["setting"]["thinking_time"]["team0"],
-            team1=message_recv["game"]["setting"]["thinking_time"]["team1"],
-        )
-
-        extra_end_thinking_time = ExtraEndThinkingTime(
-            team0=message_recv["game"]["setting"]["extra_end_thinking_time"]["team0"],
-            team1=message_recv["game"]["setting"]["extra_end_thinking_time"]["team1"],
-        )
-
-        simulator = Simulator(
-            simulator_type=message_recv["game"]["simulator"]["type"],
-            seconds_per_frame=message_recv["game"]["simulator"]["seconds_per_frame"],
-        )
-
-        team0_players = [
-            PlayerInfo(
-                max_speed=data["max_speed"],
-                seed=None,
-                stddev_angle=data["stddev_angle"],
-                stddev_speed=data["stddev_speed"],
-                randomness=data["type"],
-            )
-            for data in message_recv["game"]["players"]["team0"]
-        ]
-
-        team1_players = [
-            PlayerInfo(
-                randomness=data["type"],
-                stddev_speed=data["stddev_speed"],
-                stddev_angle=data["stddev_angle"],
-                max_speed=data["max_speed"],
-                seed=None,
-            )
-            for data in message_recv["game"]["players"]["team1"]
-        ]
-
-        players = Players(team0=team0_players, team1=team1_players)
-
-        game_setting = Setting(
-            max_end=message_recv["game"]["setting"]["max_end"],
-            sheet_width=message_recv["game"]["setting"]["sheet_width"],
-            five_rock_rule=message_recv["game"]["setting"]["five_rock_rule"],
-            thinking_time=thinking_time,
-            extra_end_thinking_time=extra_end_thinking_time,
-        )
-
-        game = GameRule(
-            rule=message_recv["game"]["rule"],
-            setting=game_setting,
-            players=players,
-            simulator=simulator,
-        )
-
-        is_ready = IsReady(
-            cmd=message_recv["cmd"], team=message_recv["team"], game=game
-        )
-
+    def _handle_is_ready(self, message_recv: dict[str, Any]) -> IsReady:
+        """store received is_ready"""
+        is_ready = parse_is_ready(message_recv)
         self.match_data.is_ready = is_ready
+        self._record(self.convert_is_ready, is_ready)
+        return is_ready
 
-    def ready_ok(self, player_order: list = [0, 1, 2, 3]) -> None:
-        """send ready_ok"""
-        ready = {"cmd": "ready_ok", "player_order": player_order}
-        ready_str = json.dumps(ready)
-        ready_str = ready_str + "\n"
-        self.send(ready_str)
-
-    def get_new_game(self):
-        """receive new_game"""
-
-        message_recv = self.receive()
-        self.match_data.new_game = NewGame(
-            cmd=message_recv["cmd"], name=message_recv["name"]
-        )
+    def _handle_new_game(self, message_recv: dict[str, Any]) -> NewGame:
+        """store received new_game"""
+        self.match_data.new_game = parse_new_game(message_recv)
         if self.match_data.new_game is not None:
             self.is_connected = True
+            self._record(to_dict, self.match_data.new_game)
+        return self.match_data.new_game
+
+    def _handle_update(
+        self, message_recv: dict[str, Any], raw: bytes | None = None
+    ) -> Update | CompactUpdate | LazyUpdate | None:
+        """store received update, raw is the message as received for lazy mode"""
+        received = time.monotonic()
+        apply_trajectory_policy(message_recv, self.trajectory_policy)
+        if self.trajectory_policy != "full":
+            raw = None  # the reduced message is smaller than the raw bytes
+        history = self.match_data.update_list
+        if isinstance(history, UpdateHistory) and raw is None:
+            raw = self.codec.dumps(message_recv)  # type: ignore
+
+        update_info = self._parse_update(message_recv, raw)
+        if update_info is None:
+            return None
 
-    def update(self):
-        """receive update"""
-
-        if self.is_connected is False:
-            raise Exception("Not connected to server")
-
-        message_recv = self.receive()
-
-        start_team0_position = []
-        start_team1_position = []
-        finish_team0_position = []
-        finish_team1_position = []
-        frame_data = []
-
-        last_move = None
-        trajectory = None
-
-        if message_recv["cmd"] != "update":
-            return
-
-        if message_recv["state"]["game_result"] is None:
-            winner = None
-            reason = None
-        else:
-            winner = message_recv["state"]["game_result"]["winner"]
-            reason = message_recv["state"]["game_result"]["reason"]
-
-        game_result = GameResult(
-            winner=winner,
-            reason=reason,
-        )
-
-        extra_end_score = ExtraEndScore(
-            team0=message_recv["state"]["extra_end_score"]["team0"],
-            team1=message_recv["state"]["extra_end_score"]["team1"],
-        )
-
-        scores = Scores(
-            team0=message_recv["state"]["scores"]["team0"],
-            team1=message_recv["state"]["scores"]["team1"],
-        )
-
-        stones = Stones(
-            team0=self.__stone_trajectory_parser(
-                message_recv["state"]["stones"]["team0"]
-            ),
-            team1=self.__stone_trajectory_parser(
-                message_recv["state"]["stones"]["team1"]
-            ),
-        )
-
-        thinking_time_remaining = ThinkingTimeRemaining(
-            team0=message_recv["state"]["thinking_time_remaining"]["team0"],
-            team1=message_recv["state"]["thinking_time_remaining"]["team1"],
-        )
+        self.logger.info(f"next_team : {update_info.next_team}")
 
-        if message_recv["last_move"] is None:
-            free_guard_zone_foul = False
-            cmd_type = None
-            rotation = None
-            x = None
-            y = None
-            seconds_per_frame = None
+        if isinstance(history, UpdateHistory):
+            history.append(update_info, raw)  # type: ignore
         else:
-            last_move = message_recv["last_move"]
-            actual_move = message_recv["last_move"]["actual_move"]
-            free_guard_zone_foul = message_recv["last_move"]["free_guard_zone_foul"]
-            cmd_type = message_recv["last_move"]["actual_move"]["type"]
-            if cmd_type == "shot":
-                velocity = message_recv["last_move"]["actual_move"]["velocity"]
-                rotation = message_recv["last_move"]["actual_move"]["rotation"]
-                x = message_recv["last_move"]["actual_move"]["velocity"]["x"]
-                y = message_recv["last_move"]["actual_move"]["velocity"]["y"]
-
-                if message_recv["last_move"]["trajectory"] is None:
-                    seconds_per_frame = None
-
-                else:
-                    seconds_per_frame = message_recv["last_move"]["trajectory"][
-                        "seconds_per_frame"
-                    ]
-
-                    start_team0_position = self.__stone_trajectory_parser(
-                        message_recv["last_move"]["trajectory"]["start"]["team0"]
-                    )
-
-                    start_team1_position = self.__stone_trajectory_parser(
-                        message_recv["last_move"]["trajectory"]["start"]["team1"]
-                    )
-
-                    finish_team0_position = self.__stone_trajectory_parser(
-                        message_recv["last_move"]["trajectory"]["finish"]["team0"]
-                    )
-
-                    finish_team1_position = self.__stone_trajectory_parser(
-                        message_recv["last_move"]["trajectory"]["finish"]["team1"]
-                    )
-
-                    for frames in message_recv["last_move"]["trajectory"]["frames"]:
-                        for frame in frames:
-                            if frame is None or frame["value"] is None:
-                                frame_data.append(
-                                    Frame(
-                                        team=None,
-                                        index=None,
-                                        value=Coordinate(
-                                            angle=None,
-                                            position=[Position(x=None, y=None)],
-                                        ),
-                                    )
-                                )
-                            else:
-                                frame_data.append(
-                                    Frame(
-                                        team=frame["team"],
-                                        index=frame["index"],
-                                        value=Coordinate(
-                                            angle=frame["value"]["angle"],
-                                            position=[
-                                                Position(
-                                                    x=frame["value"]["position"]["x"],
-                                                    y=frame["value"]["position"]["y"],
-                                                )
-                                            ],
-                                        ),
-                                    )
-                                )
-
-                velocity = Velocity(x=x, y=y)
-
-                actual_move = ActualMove(
-                    rotation=rotation,
-                    type=cmd_type,
-                    velocity=velocity,
-                )
-
-            else:  # cmd_type == "concede"
-                if cmd_type != "concede":
-                    raise Exception(f"cmd_type is not concede. cmd_type : {cmd_type}")
-                seconds_per_frame = message_recv["last_move"]["trajectory"][
-                    "seconds_per_frame"
-                ]
-                actual_move = Concede()
-
-            start = Start(
-                team0=start_team0_position,
-                team1=start_team1_position,
+            history.append(update_info)  # type: ignore
+        if self.recorder is not None:
+            self._record(
+                self.convert_update, update_info, self.recorder.remove_trajectory
             )
-
-            finish = Finish(
-                team0=finish_team0_position,
-                team1=finish_team1_position,
-            )
-
-            trajectory = Trajectory(
-                seconds_per_frame=seconds_per_frame,
-                start=start,
-                finish=finish,
-                frames=frame_data,
+        self._start_turn(update_info, received)
+        self._ponder(update_info)
+        return update_info
+
+    def _parse_update(
+        self, message_recv: dict[str, Any], raw: bytes | None = None
+    ) -> Update | CompactUpdate | LazyUpdate | None:
+        """build the update model selected by compact, lazy and columnar"""
+        if self.lazy:
+            return parse_lazy_update(
+                message_recv,
+                self.compact,
+                raw,
+                self.codec,  # type: ignore
+                self.columnar,
             )
+        if self.compact:
+            return parse_compact_update(message_recv, self.columnar)
+        return parse_update(message_recv, self.columnar)
+
+    def _close_history(self) -> None:
+        """close the journal of the update history, a temporary journal is deleted"""
+        if isinstance(self.match_data.update_list, UpdateHistory):
+            self.match_data.update_list.close()
+
+    def _ponder(self, update_info: Update) -> None:
+        """collect the last search and ponder again on the opponent's turn"""
+        if self.ponderer is None or self.match_data.is_ready is None:
+            return
+        if self.ponderer.running:
+            self.ponder_result = self.ponderer.stop()
+        if update_info.state.game_result.winner is not None:
+            self.ponderer.close()
+        elif update_info.next_team not in (None, self.match_data.is_ready.team):
+            self.ponderer.start(update_info.state)
+
+    def _start_turn(self, update_info: Update, received: float) -> None:
+        """measure the overhead of the last turn and set the deadline of the next"""
+        if self.match_data.is_ready is None:
+            return
+        self._updates_received += 1
+        # a new update ends the previous turn, its deadline must not send anymore
+        if self.deadline is not None:
+            self.deadline.cancel()
+        my_team = self.match_data.is_ready.team
+        remaining = getattr(update_info.state.thinking_time_remaining, my_team)
+
+        if self._move_sent is not None and self._turn_started is not None:
+            charged = self._turn_remaining - remaining  # type: ignore
+            measured = self._move_sent - self._turn_started
+            self.overheads.append(max(0.0, charged - measured))
+            self._move_sent = None
+            self._turn_started = None
+
+        if (
+            update_info.next_team != my_team
+            or update_info.state.game_result.winner is not None
+        ):
+            self.deadline = None
+            return
 
-            last_move = LastMove(
-                actual_move=actual_move,
-                free_guard_zone_foul=free_guard_zone_foul,
-                trajectory=trajectory,
-            )
-
-        state = State(
-            end=message_recv["state"]["end"],
-            extra_end_score=extra_end_score,
-            game_result=game_result,
-            hammer=message_recv["state"]["hammer"],
-            scores=scores,
-            shot=message_recv["state"]["shot"],
-            stones=stones,
-            thinking_time_remaining=thinking_time_remaining,
-        )
-
-        update_info = Update(
-            cmd=message_recv["cmd"],
-            last_move=last_move,
-            next_team=message_recv["next_team"],
-            state=state,
+        budget = (
+            remaining
+            - max(self.overheads, default=0.0)
+            - self.limiter.delay()  # type: ignore
+            - self.deadline_margin
         )
+        self.deadline = Deadline(budget, start=received, turn=self._updates_received)
+        self._turn_started = received
+        self._turn_remaining = remaining
 
-        self.logger.info(f"next_team : {update_info.next_team}")
-
-        self.match_data.update_list.append(update_info)
-
-    def move(
+    def _record_move(
         self,
-        x: float = 0.0,
-        y: float = 2.4,
-        rotation: StoneRotation = StoneRotation.outturn,
-    ) -> None:
-        """Shot Stone
+        x: float,
+        y: float,
+        rotation: StoneRotation,
+        deadline: Deadline | None = None,
+    ) -> bool:
+        """store sent shot
 
         Args:
-            x (float, optional): Velocity in x-axis direction. Defaults to 0.0.
-            y (float, optional): Velocity in y-axis direction. Defaults to 2.4.
-                        rotation (StoneRotation, optional): Rotation of stone. Defaults to StoneRotation.outturn.
+            deadline (Deadline | None, optional): Deadline that sends the move, nothing is sent if its turn is over. Defaults to None.
+
+        Returns:
+            bool: False if the move of this turn has already been sent
         """
         if self.is_connected is False:
             raise Exception("Not connected to server")
+        if deadline is not None:
+            if deadline is not self.deadline or not deadline.claim():
+                return False
+        elif self.deadline is not None and not self.deadline.claim():
+            self.logger.warning("Move of this turn has already been sent")
+            return False
+        self._move_sent = time.monotonic() + self.limiter.delay()  # type: ignore
         self.move_info.append(
             ShotInfo(
                 velocity_x=x,
@@ -556,25 +481,7 @@ class SocketClient(BaseClient):
                 rotation=rotation,
             )
         )
-
-        shot = {
-            "cmd": "move",
-            "move": {
-                "type": "shot",
-                "velocity": {"x": x, "y": y},
-                "rotation": rotation,
-            },
-        }
-        s = json.dumps(shot)
-        s = s + "\n"
-        self.send(s)
-
-    def concede(self) -> None:
-        """Concede"""
-        concede = {"cmd": "move", "move": {"type": "concede"}}
-        s = json.dumps(concede)
-        s = s + "\n"
-        self.send(s)
+        return True
 
     def get_my_team(self) -> str:
         """get my team name
@@ -628,16 +535,36 @@ class SocketClient(BaseClient):
             ):
                 trajectory_list.append(update_data.last_move.trajectory)
 
-            if remove_trajectory is True:
-                data = update_data  # not to change original data
-                if data.last_move is not None:
-                    data.last_move.trajectory = None
-                update_list.append(data)
-            else:
+            if remove_trajectory is False or update_data.last_move is None:
                 update_list.append(update_data)
+            elif isinstance(update_data, LazyUpdate):
+                update_list.append(update_data.without_trajectory())
+            else:
+                # copy, not to change original data
+                update_list.append(
+                    replace(
+                        update_data,
+                        last_move=replace(update_data.last_move, trajectory=None),
+                    )
+                )
 
         return update_list, trajectory_list
 
+    def get_deadline(self) -> Deadline | None:
+        """get deadline of our current turn
+
+        The budget is our thinking_time_remaining minus the overhead the server
+        charged on previous turns, the pending rate limit wait and deadline_margin.
+
+        Returns:
+            Deadline | None: deadline, None if it is not our turn
+        """
+        return self.deadline
+
+    def get_ponder_result(self) -> Any:
+        """get the result of the search run on the opponent's last turn"""
+        return self.ponder_result
+
     def get_dc(self) -> ServerDC:
         """get dc data"""
         if self.match_data.server_dc is None:
@@ -652,96 +579,32 @@ class SocketClient(BaseClient):
 
     def convert_dc(self, dc_data: ServerDC) -> dict[str, Any]:
         """convert ServerDC to dict"""
-        dc_dict = {}
-
-        for field in fields(dc_data):
-            value = getattr(dc_data, field.name)
-            if field.name == "version":
-                dc_dict["version"] = {}
-                for field in fields(value):
-                    dc_version = getattr(value, field.name)
-                    dc_dict["version"][field.name] = dc_version
-            else:
-                dc_dict[field.name] = value
-        return dc_dict
+        return to_dict(dc_data)
 
     def convert_is_ready(self, is_ready: IsReady) -> dict[str, Any]:
         """convert IsReady to dict
 
+        The simulator and player types are written under the "type" key of the
+        message, not "simulator_type" and "randomness" as in earlier versions.
+
         Args:
             is_ready (IsReady): is_ready
 
         Returns:
             dict: converted is_ready
         """
-        is_ready_dict = {}
-        for field in fields(is_ready):
-            value = getattr(is_ready, field.name)
-            if field.name == "game":
-                is_ready_dict[field.name] = {}
-                for field in fields(value):
-                    game_value = getattr(value, field.name)
-                    if field.name == "setting":
-                        is_ready_dict["game"][field.name] = {}
-                        for field in fields(game_value):
-                            config_value = getattr(game_value, field.name)
-                            if field.name == "thinking_time":
-                                is_ready_dict["game"]["setting"][field.name] = {}
-                                for field in fields(config_value):
-                                    thinking_time_value = getattr(
-                                        config_value, field.name
-                                    )
-                                    is_ready_dict["game"]["setting"]["thinking_time"][
-                                        field.name
-                                    ] = thinking_time_value
-
-                            elif field.name == "extra_end_thinking_time":
-                                is_ready_dict["game"]["setting"][field.name] = {}
-                                for field in fields(config_value):
-                                    extra_end_thinking_time_value = getattr(
-                                        config_value, field.name
-                                    )
-                                    is_ready_dict["game"]["setting"][
-                                        "extra_end_thinking_time"
-                                    ][field.name] = extra_end_thinking_time_value
-
-                            else:
-                                is_ready_dict["game"]["setting"][
-                                    field.name
-                                ] = config_value
-                    if field.name == "simulator":
-                        is_ready_dict["game"][field.name] = {}
-                        for field in fields(game_value):
-                            simulator_value = getattr(game_value, field.name)
-                            is_ready_dict["game"]["simulator"][
-                                field.name
-                            ] = simulator_value
-
-                    if field.name == "players":
-                        is_ready_dict["game"][field.name] = {}
-                        for field in fields(game_value):
-                            team_data = getattr(game_value, field.name)
-                            is_ready_dict["game"]["players"][field.name] = []
-                            players_list = []
-                            for i in team_data:
-                                team_dict = {}
-                                for field in fields(i):
-                                    normal0 = getattr(i, field.name)
-                                    team_dict[field.name] = normal0
-                                players_list.append(team_dict)
-                            is_ready_dict["game"]["players"][field.name] = players_list
-
-                    else:
-                        is_ready_dict["game"][field.name] = game_value
-            else:
-                is_ready_dict[field.name] = value
-        return is_ready_dict
+        return to_dict(is_ready)
 
     def convert_update(
         self, update_data: Update, remove_trajectory: bool = True
     ) -> dict[str, Any]:
         """convert Update to dict
 
+        The dict follows the update message of the server, so it can be parsed back.
+        This changed the output of earlier versions: a removed stone is None instead
+        of a coordinate with None values, game_result is None until the game ends,
+        and the trajectory frames are one list per simulation step.
+
         Args:
             update_data (Update): Update
             remove_trajectory (bool): Delete trajectory data from Update? Defaults to True.
@@ -749,345 +612,200 @@ class SocketClient(BaseClient):
         Returns:
             dict: converted Update
         """
-        update_dict: dict = {}
-        for field in fields(update_data):
-            update_value = getattr(update_data, field.name)
-            if field.name == "state":
-                update_dict[field.name] = {}
-                for field in fields(update_value):
-                    state_value = getattr(update_value, field.name)
-                    update_dict["state"][field.name] = {}
-
-                    if field.name == "extra_end_score":
-                        update_dict["state"][field.name] = {}
-                        for field in fields(state_value):
-                            extra_end_score_value = getattr(state_value, field.name)
-                            update_dict["state"]["extra_end_score"][
-                                field.name
-                            ] = extra_end_score_value
-
-                    elif field.name == "game_result":
-                        update_dict["state"][field.name] = {}
-                        for field in fields(state_value):
-                            game_result_value = getattr(state_value, field.name)
-                            update_dict["state"]["game_result"][
-                                field.name
-                            ] = game_result_value
-
-                    elif field.name == "scores":
-                        update_dict["state"][field.name] = {}
-                        for field in fields(state_value):
-                            scores_value = getattr(state_value, field.name)
-                            update_dict["state"]["scores"][field.name] = scores_value
-
-                    elif field.name == "stones":
-                        for field in fields(state_value):
-                            stones_value = getattr(state_value, field.name)
-                            update_dict["state"]["stones"][field.name] = []
-                            state_stones_team_list = []
-                            for i in stones_value:
-                                state_stone_team_dict: dict = {}
-                                for team in fields(i):
-                                    team_value = getattr(i, team.name)
-                                    if team.name == "position":
-                                        for pos in team_value:
-                                            state_stone_team_dict["position"] = {}
-                                            for position in fields(pos):
-                                                team_position_value = getattr(
-                                                    pos, position.name
-                                                )
-                                                state_stone_team_dict["position"][
-                                                    position.name
-                                                ] = team_position_value
-
-                                    else:
-                                        state_stone_team_dict[team.name] = team_value
-                                state_stones_team_list.append(state_stone_team_dict)
-                            update_dict["state"]["stones"][
-                                field.name
-                            ] = state_stones_team_list
-
-                    elif field.name == "thinking_time_remaining":
-                        update_dict["state"][field.name] = {}
-                        for field in fields(state_value):
-                            thinking_time_remaining_value = getattr(
-                                state_value, field.name
-                            )
-                            update_dict["state"]["thinking_time_remaining"][
-                                field.name
-                            ] = thinking_time_remaining_value
-
-                    else:
-                        update_dict["state"][field.name] = state_value
-
-            elif field.name == "last_move":
-                if update_value is None:
-                    update_dict[field.name] = None
-                    continue
-
-                update_dict[field.name] = {}
-                for field in fields(update_value):
-                    last_move_value = getattr(update_value, field.name)
-                    if field.name == "actual_move":
-                        update_dict["last_move"][field.name] = {}
-                        for field in fields(last_move_value):
-                            actual_move_value = getattr(last_move_value, field.name)
-                            if field.name == "velocity":
-                                update_dict["last_move"]["actual_move"][field.name] = {}
-                                for field in fields(actual_move_value):
-                                    velocity_value = getattr(
-                                        actual_move_value, field.name
-                                    )
-                                    update_dict["last_move"]["actual_move"]["velocity"][
-                                        field.name
-                                    ] = velocity_value
-                            else:
-                                update_dict["last_move"]["actual_move"][
-                                    field.name
-                                ] = actual_move_value
-
-                    elif field.name == "trajectory":
-                        if remove_trajectory is True:
-                            update_dict["last_move"][field.name] = None
-                        else:
-                            update_dict["last_move"][field.name] = {}
-                            for field in fields(last_move_value):
-                                trajectory_value = getattr(last_move_value, field.name)
-                                if field.name == "start":
-                                    update_dict["last_move"]["trajectory"][
-                                        field.name
-                                    ] = {}
-                                    for field in fields(trajectory_value):
-                                        start_value = getattr(
-                                            trajectory_value, field.name
-                                        )
-                                        update_dict["last_move"]["trajectory"]["start"][
-                                            field.name
-                                        ] = []
-                                        start_team_list = []
-                                        for field in fields(start_value):
-                                            start_team_dict = {}
-                                            start_team_value = getattr(
-                                                start_value, field.name
-                                            )
-                                            if field.name == "position":
-                                                start_team_dict["position"] = {}
-                                                for field in fields(start_team_value):
-                                                    start_team0_position_value = (
-                                                        getattr(
-                                                            start_team_value, field.name
-                                                        )
-                                                    )
-                                                    start_team_dict["position"][
-                                                        field.name
-                                                    ] = start_team0_position_value
-
-                                            else:
-                                                start_team_dict[
-                                                    field.name
-                                                ] = start_team_value
-                                            start_team_list.append(start_team_dict)
-                                        update_dict["last_move"]["trajectory"]["start"][
-                                            field.name
-                                        ] = start_team_list
-
-                                elif field.name == "finish":
-                                    update_dict["last_move"]["trajectory"][
-                                        field.name
-                                    ] = {}
-                                    for field in fields(trajectory_value):
-                                        finish_value = getattr(
-                                            trajectory_value, field.name
-                                        )
-                                        update_dict["last_move"]["trajectory"][
-                                            "finish"
-                                        ][field.name] = []
-                                        finish_team0_list = []
-                                        for field in fields(finish_value):
-                                            finish_team_dict = {}
-                                            finish_team_value = getattr(
-                                                finish_value, field.name
-                                            )
-                                            if field.name == "position":
-                                                finish_team_dict["position"] = {}
-                                                for field in fields(finish_team_value):
-                                                    finish_team_position_value = (
-                                                        getattr(
-                                                            finish_team_value,
-                                                            field.name,
-                                                        )
-                                                    )
-                                                    finish_team_dict["position"][
-                                                        field.name
-                                                    ] = finish_team_position_value
-                                            else:
-                                                finish_team_dict[
-                                                    field.name
-                                                ] = finish_team_value
-                                            finish_team0_list.append(finish_team_dict)
-                                        update_dict["last_move"]["trajectory"][
-                                            "finish"
-                                        ][field.name] = finish_team0_list
-
-                                elif field.name == "frames":
-                                    update_dict["last_move"]["trajectory"][
-                                        field.name
-                                    ] = []
-
-                                    for field in fields(trajectory_value):
-                                        frames_list = []
-                                        frames_dict = {}
-                                        frames_value = getattr(
-                                            trajectory_value, field.name
-                                        )
-
-                                        if field.name == "value":
-                                            frames_dict[field.name] = {}
-                                            for field in fields(frames_value):
-                                                frames_value_value = getattr(
-                                                    frames_value, field.name
-                                                )
-
-                                                if field.name == "position":
-                                                    frames_dict["value"][
-                                                        field.name
-                                                    ] = {}
-                                                    for field in fields(
-                                                        frames_value_value
-                                                    ):
-                                                        frames_value_position_value = (
-                                                            getattr(
-                                                                frames_value_value,
-                                                                field.name,
-                                                            )
-                                                        )
-                                                        frames_dict["value"][
-                                                            "position"
-                                                        ][
-                                                            field.name
-                                                        ] = frames_value_position_value
-                                                else:
-                                                    frames_dict["value"][
-                                                        field.name
-                                                    ] = frames_value_value
-                                        else:
-                                            frames_dict[field.name] = frames_value
-
-                                        frames_list.append(frames_dict)
-                                        update_dict["last_move"]["trajectory"][
-                                            "frames"
-                                        ].append(frames_list)
-                                else:
-                                    update_dict["last_move"]["trajectory"][
-                                        field.name
-                                    ] = trajectory_value
-                    else:
-                        update_dict["last_move"][field.name] = last_move_value
-            else:
-                update_dict[field.name] = update_value
-
-        return update_dict
+        if isinstance(update_data, CompactUpdate):
+            return compact_update_to_message(update_data, remove_trajectory)
+        if isinstance(update_data, LazyUpdate):
+            return update_data.to_message(remove_trajectory)
+
+        if remove_trajectory and update_data.last_move is not None:
+            update_data = replace(
+                update_data, last_move=replace(update_data.last_move, trajectory=None)
+            )
+        return to_dict(update_data)
 
-    def convert_trajectory(self, trajectory_data: Trajectory) -> dict[str, Any]:
+    def convert_trajectory(
+        self, trajectory_data: Trajectory | ColumnarTrajectory
+    ) -> dict[str, Any]:
         """convert trajectory to dict
 
+        The frames are one list per simulation step, as in the update message.
+
         Args:
-            trajectory_data (Trajectory): trajectory
+            trajectory_data (Trajectory | ColumnarTrajectory): trajectory
 
         Returns:
             dict[str, Any]: dict of trajectory
         """
-        trajectory_dict = {}
-
-        for field in fields(trajectory_data):
-            value = getattr(trajectory_data, field.name)
-
-            if field.name == "start":
-                trajectory_dict[field.name] = {}
-                for field in fields(value):
-                    start_value = getattr(value, field.name)
-                    # if field.name == "team0":
-                    trajectory_dict["start"][field.name] = []
-                    start_team_list = []
-                    for i in start_value:
-                        start_team_dict = {}
-                        for start_field in fields(i):
-                            start_team_value = getattr(i, start_field.name)
-
-                            if start_field.name == "position":
-                                for j in start_team_value:
-                                    start_team_dict["position"] = {}
-                                    for pos_field in fields(j):
-                                        start_team_position_value = getattr(
-                                            j, pos_field.name
-                                        )
-                                        start_team_dict["position"][
-                                            pos_field.name
-                                        ] = start_team_position_value
-                            else:
-                                start_team_dict[start_field.name] = start_team_value
-                        start_team_list.append(start_team_dict)
-                    trajectory_dict["start"][field.name] = start_team_list
-
-            elif field.name == "finish":
-                trajectory_dict[field.name] = {}
-                for field in fields(value):
-                    finish_value = getattr(value, field.name)
-                    trajectory_dict["finish"][field.name] = []
-                    finish_team_list = []
-                    for i in finish_value:
-                        finish_team_dict = {}
-                        for field in fields(i):
-                            finish_team_value = getattr(i, field.name)
-
-                            if field.name == "position":
-                                for j in finish_team_value:
-                                    finish_team_dict["position"] = {}
-                                    for finish_field in fields(j):
-                                        finish_team_position_value = getattr(
-                                            j, finish_field.name
-                                        )
-                                        finish_team_dict["position"][
-                                            finish_field.name
-                                        ] = finish_team_position_value
-                            else:
-                                finish_team_dict[field.name] = finish_team_value
-                        finish_team_list.append(finish_team_dict)
-                    trajectory_dict["finish"][field.name] = finish_team_list
-
-            elif field.name == "frames":
-                trajectory_dict[field.name] = []
-                for i in value:
-                    frames_dict = {}
-                    frames_list = []
-                    for field in fields(i):
-                        frame_value = getattr(i, field.name)
-                        if field.name == "value":
-                            frames_dict[field.name] = {}
-                            for frame_field in fields(frame_value):
-                                frame_data_value = getattr(
-                                    frame_value, frame_field.name
-                                )
-
-                                if frame_field.name == "position":
-                                    frames_dict["value"][frame_field.name] = {}
-                                    for j in frame_data_value:
-                                        for frame_field in fields(j):
-                                            frame_data_position_value = getattr(
-                                                j, frame_field.name
-                                            )
-                                            frames_dict["value"]["position"][
-                                                frame_field.name
-                                            ] = frame_data_position_value
-
-                                else:
-                                    frames_dict["value"][
-                                        frame_field.name
-                                    ] = frame_data_value
-                        else:
-                            frames_dict[field.name] = frame_value
-                    frames_list.append(frames_dict)
-                    trajectory_dict["frames"] += frames_list
-            else:
-                trajectory_dict[field.name] = value
-        return trajectory_dict
+        return to_dict(trajectory_data)
+
+    def export_match(self, path: str | PathLike, remove_trajectory: bool = True):
+        """write dc, is_ready and every update to a JSON file
+
+        Args:
+            path (str | PathLike): Output file.
+            remove_trajectory (bool, optional): Delete trajectory data from Update?. Defaults to True.
+        """
+        match_dict = {
+            "dc": self.convert_dc(self.get_dc()),
+            "is_ready": self.convert_is_ready(self.get_is_ready()),
+            "update_list": [
+                self.convert_update(update_data, remove_trajectory)
+                for update_data in self.match_data.update_list
+            ],
+        }
+        with open(path, "wb") as f:
+            f.write(self.codec.dumps(match_dict))
+
+
+class SocketClient(BaseClient, MatchHandler):
+    def __init__(
+        self,
+        host: str = "dc3-server",
+        port: int = 10000,
+        client_name: str = "AI0",
+        auto_start: bool = True,
+        rate_limit: float = 0.2,
+        send_queue: bool = False,
+        codec: JSONCodec | None = None,
+        ponder: SearchFunction | Ponderer | None = None,
+        compact: bool = False,
+        lazy: bool = False,
+        columnar: bool = False,
+        trajectory: str = "full",
+        history: int | None = None,
+        history_path: str | PathLike | None = None,
+        record: str | PathLike | MatchRecorder | None = None,
+        journal: str | PathLike | RawJournal | None = None,
+    ) -> None:
+        """initialize socket client
+
+        Args:
+            host (str, optional): URL of the server of Digital Curling 3. Defaults to "dc3-server".
+            port (int, optional): Connection port to Digital Curling Server. Defaults to 10000.
+            client_name (str, optional): Identification name of the client. Defaults to "AI0".
+            auto_start (bool, optional): Whether to start the game automatically. Defaults to True.
+            rate_limit (int, optional): Minimum time interval to send data to the server. Defaults to 3.
+            send_queue (bool, optional): Return from move(), dc_ok() and ready_ok() without waiting for the rate limit. Defaults to False.
+            codec (JSONCodec | None, optional): JSON codec for messages. Defaults to the fastest installed codec.
+            ponder (SearchFunction | Ponderer | None, optional): Search run while the opponent is thinking, see set_ponder(). Defaults to None.
+            compact (bool, optional): Store updates as frozen, slotted CompactUpdate with flat stone positions. Defaults to False.
+            lazy (bool, optional): Store updates as LazyUpdate, which builds state, last_move and trajectory on first access. Defaults to False.
+            columnar (bool, optional): Store trajectories as ColumnarTrajectory, a few NumPy arrays per shot. Defaults to False.
+            trajectory (str, optional): Keep trajectories in "full", only their start and finish with "endpoints", or "drop" them while parsing. Defaults to "full".
+            history (int | None, optional): Keep only this many updates in memory and spill older ones to a journal on disk. Defaults to None, keep all.
+            history_path (str | PathLike | None, optional): Journal of the spilled updates. Defaults to a temporary file.
+            record (str | PathLike | MatchRecorder | None, optional): Stream every received message to this NDJSON file, see set_recorder(). Defaults to None.
+            journal (str | PathLike | RawJournal | None, optional): Tee every raw received and sent line, with a monotonic timestamp, to this file in the layout of the .dcl2 server logs. Defaults to None.
+        """
+        self.server = (host, port)
+        super().__init__(
+            timeout=60,
+            buffer=1024,
+            rate_limit=rate_limit,
+            send_queue=send_queue,
+            codec=codec,
+            journal=journal,
+        )
+        self._init_match(
+            client_name,
+            compact,
+            lazy,
+            columnar,
+            trajectory,
+            history,
+            history_path,
+        )
+        self.set_ponder(ponder)
+        self.set_recorder(record)
+
+        if auto_start:
+            self.start_game()
+
+    def close(self, history: bool = True):
+        """stop pondering, then close the recording, update history and connection
+
+        Args:
+            history (bool, optional): Close the update history too, its spilled updates can no longer be read. Defaults to True.
+        """
+        if self.ponderer is not None:
+            self.ponderer.close()
+        if self.recorder is not None:
+            self.recorder.close()
+        if history:
+            self._close_history()
+        super().close()
+
+    def start_game(self):
+        """start game"""
+        super()._connect(self.server)
+        self.dc_recv()
+        self.dc_ok()
+        self.is_ready_recv()
+        self.ready_ok()
+        self.get_new_game()
+
+    def dc_recv(self):
+        """receive dc"""
+        self._handle_dc(self.receive())
+
+    def dc_ok(self) -> None:
+        """send dc_ok"""
+        self.send(encode_dc_ok(self.client_name, self.codec))
+
+    def is_ready_recv(self):
+        """receive is_ready"""
+        self._handle_is_ready(self.receive())
+
+    def ready_ok(self, player_order: list = [0, 1, 2, 3]) -> None:
+        """send ready_ok"""
+        self.send(encode_ready_ok(player_order, self.codec))
+
+    def get_new_game(self):
+        """receive new_game"""
+        self._handle_new_game(self.receive())
+
+    def update(self) -> Update | CompactUpdate | LazyUpdate | None:
+        """receive update
+
+        Returns:
+            Update | None: received update, None if another message arrived
+        """
+
+        if self.is_connected is False:
+            raise Exception("Not connected to server")
+
+        raw = self.receive_raw()
+        return self._handle_update(self.codec.loads(raw), raw)
+
+    def move(
+        self,
+        x: float = 0.0,
+        y: float = 2.4,
+        rotation: StoneRotation = StoneRotation.outturn,
+    ) -> None:
+        """Shot Stone
+
+        Args:
+            x (float, optional): Velocity in x-axis direction. Defaults to 0.0.
+            y (float, optional): Velocity in y-axis direction. Defaults to 2.4.
+                        rotation (StoneRotation, optional): Rotation of stone. Defaults to StoneRotation.outturn.
+        """
+        if self._record_move(x, y, rotation):
+            self.send(encode_move(x, y, rotation, self.codec))
+
+    def _move_at_deadline(
+        self,
+        deadline: Deadline,
+        x: float = 0.0,
+        y: float = 2.4,
+        rotation: StoneRotation = StoneRotation.outturn,
+    ) -> None:
+        """send the move of Deadline.send_best_at_deadline() if its turn is current"""
+        if self._record_move(x, y, rotation, deadline):
+            self.send(encode_move(x, y, rotation, self.codec))
+
+    def concede(self) -> None:
+        """Concede"""
+        if self.deadline is not None:
+            self.deadline.cancel()
+        self.send(encode_concede(self.codec))
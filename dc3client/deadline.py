@@ -0,0 +1,148 @@
+import asyncio
+import threading
+import time
+from typing import Any
+
+from dc3client.models import ShotInfo, StoneRotation
+
+
+class Deadline:
+    """Monotonic deadline of one turn
+
+    Search loops poll ``expired()`` or ``remaining()``, which only read the
+    monotonic clock, or block on ``wait()`` / ``await wait_async()``. The best move
+    found so far can be registered with ``offer()`` and is sent automatically at
+    the deadline by ``send_best_at_deadline()``.
+    """
+
+    def __init__(
+        self, seconds: float, start: float | None = None, turn: int | None = None
+    ) -> None:
+        """initialize deadline
+
+        Args:
+            seconds (float): Time budget of the turn in seconds.
+            start (float | None, optional): Start on the time.monotonic() clock. Defaults to now.
+            turn (int | None, optional): Number of the update that started the turn. Defaults to None.
+        """
+        self.start = time.monotonic() if start is None else start
+        self.budget = max(0.0, seconds)
+        self.expires_at = self.start + self.budget
+        self.turn = turn
+
+        self.best: ShotInfo | None = None
+        self._claimed = False
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._task: asyncio.Task | None = None
+
+    def __repr__(self) -> str:
+        return (
+            f"Deadline(turn={self.turn}, budget={self.budget:.3f}, "
+            f"remaining={self.remaining():.3f})"
+        )
+
+    def remaining(self) -> float:
+        """seconds left until the deadline, never negative"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def elapsed(self) -> float:
+        """seconds since the start of the turn"""
+        return time.monotonic() - self.start
+
+    def expired(self) -> bool:
+        """whether the deadline has passed"""
+        return time.monotonic() >= self.expires_at
+
+    def done(self) -> bool:
+        """whether the move of this turn has been sent"""
+        return self._done.is_set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """block until the deadline or until the move is sent
+
+        Args:
+            timeout (float | None, optional): Maximum time to wait. Defaults to the remaining time.
+
+        Returns:
+            bool: True if the move has been sent
+        """
+        remaining = self.remaining()
+        if timeout is not None:
+            remaining = min(remaining, timeout)
+        return self._done.wait(remaining)
+
+    async def wait_async(self) -> None:
+        """sleep until the deadline without blocking the event loop"""
+        while not self._done.is_set() and (remaining := self.remaining()) > 0.0:
+            await asyncio.sleep(remaining)
+
+    def offer(
+        self,
+        x: float,
+        y: float,
+        rotation: StoneRotation = StoneRotation.outturn,
+    ) -> None:
+        """register the best move found so far
+
+        Args:
+            x (float): Velocity in x-axis direction.
+            y (float): Velocity in y-axis direction.
+            rotation (StoneRotation, optional): Rotation of stone. Defaults to StoneRotation.outturn.
+        """
+        self.best = ShotInfo(velocity_x=x, velocity_y=y, rotation=rotation)
+
+    def claim(self) -> bool:
+        """take the right to send the move of this turn
+
+        Returns:
+            bool: True for the first caller only
+        """
+        with self._lock:
+            if self._claimed:
+                return False
+            self._claimed = True
+        self._done.set()
+        return True
+
+    def cancel(self) -> None:
+        """end the turn without sending, the timer of send_best_at_deadline() stops"""
+        self.claim()
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    def send_best_at_deadline(self, client: Any) -> threading.Thread | asyncio.Task:
+        """send the best offered move at the deadline unless a move was sent before
+
+        Works with both SocketClient, on a daemon thread, and AsyncSocketClient, as
+        an asyncio task. If nothing was offered, the stone is thrown with the
+        default arguments of move(). Nothing is sent once the turn is over: after
+        move() or concede(), or when a newer update has replaced this deadline.
+
+        Args:
+            client (Any): SocketClient or AsyncSocketClient that owns this deadline.
+
+        Returns:
+            threading.Thread | asyncio.Task: the waiting thread or task
+        """
+        if asyncio.iscoroutinefunction(client.move):
+
+            async def send_async() -> None:
+                await self.wait_async()
+                await client._move_at_deadline(self, *self._best_args())
+
+            self._task = asyncio.ensure_future(send_async())
+            return self._task
+
+        def send() -> None:
+            if not self.wait():
+                client._move_at_deadline(self, *self._best_args())
+
+        thread = threading.Thread(target=send, name="dc3client-deadline", daemon=True)
+        thread.start()
+        return thread
+
+    def _best_args(self) -> tuple:
+        if self.best is None:
+            return ()
+        return (self.best.velocity_x, self.best.velocity_y, self.best.rotation)
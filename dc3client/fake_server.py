@@ -0,0 +1,208 @@
+"""Local stand-in for the Digital Curling 3 server that replays a .dcl2 log.
+
+The server sends the dc, is_ready, new_game and update records of the log over
+a real TCP socket, and waits for dc_ok, ready_ok and, on the client's turns,
+move. With ``max_speed=True`` nothing is delayed, so the end-to-end latency and
+throughput of a client can be measured without a network or a real server::
+
+    python -m dc3client.fake_server data/logs/<game>/game.dcl2 --port 10000
+"""
+
+import argparse
+import datetime
+import logging
+import pathlib
+import socket
+import threading
+import time
+from os import PathLike
+from typing import Any
+
+from dc3client.codec import JSONCodec, default_codec
+from dc3client.framing import LineFramer
+from dc3client.logs import read_dcl2
+
+REPLAY_COMMANDS = ("dc", "is_ready", "new_game", "update")
+
+
+class ReplayServer:
+    """Replay a .dcl2 log to every client that connects"""
+
+    def __init__(
+        self,
+        log_path: str | PathLike,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        team: str = "team0",
+        max_speed: bool = True,
+        timeout: float = 10,
+        codec: JSONCodec | None = None,
+        log_level: int = logging.INFO,
+    ) -> None:
+        """initialize replay server
+
+        Args:
+            log_path (str | PathLike): .dcl2 log to replay.
+            host (str, optional): Address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): Port to listen on, 0 picks a free port. Defaults to 0.
+            team (str, optional): Team assigned to the client. Defaults to "team0".
+            max_speed (bool, optional): Send without the delays recorded in the log. Defaults to True.
+            timeout (float, optional): Time to wait for a client message. Defaults to 10.
+            codec (JSONCodec | None, optional): JSON codec for messages. Defaults to the fastest installed codec.
+            log_level (int, optional): Minimum level of logging. Defaults to logging.INFO.
+        """
+        self.log_path = pathlib.Path(log_path)
+        self.team = team
+        self.max_speed = max_speed
+        self.timeout = timeout
+        self.codec = codec or default_codec
+
+        self.logger = logging.getLogger("fake_server")
+        self.logger.setLevel(log_level)
+
+        # Encode the records once, every connection sends the same bytes
+        self.records: list[tuple[str, str | None, float, bytes]] = []
+        for record in read_dcl2(self.log_path):
+            message = record["log"]
+            if message["cmd"] not in REPLAY_COMMANDS:
+                continue
+            if message["cmd"] == "is_ready":
+                message = dict(message, team=team)
+            timestamp = datetime.datetime.fromisoformat(record["date_time"])
+            self.records.append(
+                (
+                    message["cmd"],
+                    message.get("next_team"),
+                    timestamp.timestamp(),
+                    self.codec.dumps(message) + b"\n",
+                )
+            )
+
+        # Time from sending an update on the client's turn until its move arrives
+        self.latencies: list[float] = []
+        self.games_played = 0
+
+        self.socket = socket.create_server((host, port))
+        self.address: tuple[str, int] = self.socket.getsockname()[:2]
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> "ReplayServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> tuple[str, int]:
+        """start accepting clients on a background thread
+
+        Returns:
+            tuple[str, int]: host and port to connect to
+        """
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="dc3client-fake-server", daemon=True
+        )
+        self._thread.start()
+        return self.address
+
+    def stop(self) -> None:
+        """stop accepting clients"""
+        self._stopped.set()
+        try:
+            self.socket.close()
+        except OSError:
+            pass
+        if self._thread is not None:
+            self._thread.join()
+
+    def serve_forever(self) -> None:
+        """accept clients until stop() is called, one thread per client"""
+        self.logger.info(f"Replay {self.log_path} on {self.address}")
+        # wake up regularly, closing the socket does not interrupt accept()
+        self.socket.settimeout(0.1)
+        while not self._stopped.is_set():
+            try:
+                conn, address = self.socket.accept()
+            except TimeoutError:
+                continue
+            except OSError:
+                break
+            threading.Thread(
+                target=self.replay, args=(conn,), name=f"dc3client-replay-{address}"
+            ).start()
+
+    def replay(self, conn: socket.socket) -> None:
+        """replay the log to one connected client
+
+        Args:
+            conn (socket.socket): Connection to the client.
+        """
+        conn.settimeout(self.timeout)
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        framer = LineFramer()
+        latencies = []
+
+        def expect(*commands: str) -> dict[str, Any]:
+            while (message := framer.next_message()) is None:
+                if framer.fill(conn) == 0:
+                    raise ConnectionError("Connection closed by client")
+            message_recv = self.codec.loads(message)
+            if message_recv.get("cmd") not in commands:
+                raise Exception(f"Expected {commands}, got {message_recv}")
+            return message_recv
+
+        previous = None
+        try:
+            for cmd, next_team, timestamp, data in self.records:
+                if not self.max_speed and previous is not None:
+                    time.sleep(max(0.0, timestamp - previous))
+                previous = timestamp
+
+                conn.sendall(data)
+                sent = time.perf_counter()
+
+                if cmd == "dc":
+                    expect("dc_ok")
+                elif cmd == "is_ready":
+                    expect("ready_ok")
+                elif cmd == "update" and next_team == self.team:
+                    expect("move")
+                    latencies.append(time.perf_counter() - sent)
+        except Exception as e:
+            self.logger.error(f"Replay failed {e}")
+        else:
+            with self._lock:
+                self.games_played += 1
+        finally:
+            with self._lock:
+                self.latencies.extend(latencies)
+            conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay a .dcl2 log as a server")
+    parser.add_argument("log_path", type=pathlib.Path)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=10000)
+    parser.add_argument("--team", default="team0")
+    parser.add_argument("--realtime", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig()
+    server = ReplayServer(
+        args.log_path,
+        host=args.host,
+        port=args.port,
+        team=args.team,
+        max_speed=not args.realtime,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
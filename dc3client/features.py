@@ -0,0 +1,157 @@
+"""Batched feature extraction for board states.
+
+``extract_features`` turns N boards, given as a ``(N, 2, 8, 3)`` array or as a
+list of updates or states, into an ``(N, F)`` float32 matrix in one vectorised
+pass, without looping over the stones in Python::
+
+    geometry = SheetGeometry.from_is_ready(client.match_data.is_ready)
+    features = extract_features(client.match_data.update_list, geometry, team=0)
+    features[:, feature_names(team=True).index("house_count_own")]
+
+With ``team`` the teams are ordered from that team's side, the first team being
+"own" and the second "opp", otherwise team0 comes first. Values that do not
+exist, like the distance of a stone not in play, are set to ``fill``.
+"""
+
+from typing import Any, Sequence
+
+import numpy as np
+
+from dc3client.board import STONES_PER_TEAM, TEAMS, SheetGeometry
+from dc3client.scoring import score_end
+
+# Features of every stone, in the order of the stones of each team
+STONE_FEATURES = (
+    "in_play",
+    "x",
+    "y",
+    "tee_distance",
+    "in_house",
+    "in_guard_zone",
+    "nearest_opponent_distance",
+)
+# Features of the whole board
+BOARD_FEATURES = (
+    "house_count_{0}",
+    "house_count_{1}",
+    "guard_zone_count_{0}",
+    "guard_zone_count_{1}",
+    "shot_rock_{0}",
+    "shot_rock_{1}",
+    "counting_stones_{0}",
+    "counting_stones_{1}",
+)
+
+
+def feature_names(team: bool = False) -> list[str]:
+    """names of the columns of extract_features()
+
+    Args:
+        team (bool, optional): Names from one team's side ("own" and "opp") instead of team0 and team1. Defaults to False.
+
+    Returns:
+        list[str]: F names
+    """
+    sides = ("own", "opp") if team else TEAMS
+    names = [
+        f"{side}_{stone}_{feature}"
+        for side in sides
+        for stone in range(STONES_PER_TEAM)
+        for feature in STONE_FEATURES
+    ]
+    return names + [feature.format(*sides) for feature in BOARD_FEATURES]
+
+
+FEATURE_NAMES = feature_names()
+N_FEATURES = len(FEATURE_NAMES)
+
+
+def stack_boards(states: Sequence[Any]) -> np.ndarray:
+    """Stack the boards of updates or states
+
+    Args:
+        states (Sequence[Any]): Update, CompactUpdate, LazyUpdate, State or CompactState objects
+
+    Returns:
+        np.ndarray: (N, 2, 8, 3) float64 boards, NaN for stones not in play
+    """
+    boards = np.empty((len(states), len(TEAMS), STONES_PER_TEAM, 3))
+    for i, state in enumerate(states):
+        boards[i] = getattr(state, "state", state).board.array
+    return boards
+
+
+def extract_features(
+    states: np.ndarray | Sequence[Any],
+    geometry: SheetGeometry | None = None,
+    team: int | np.ndarray | None = None,
+    fill: float = -1.0,
+) -> np.ndarray:
+    """Compute the feature matrix of N boards
+
+    Args:
+        states (np.ndarray | Sequence[Any]): (N, 2, 8, 3) boards, or updates or states, see stack_boards()
+        geometry (SheetGeometry | None, optional): Geometry of the sheet, see SheetGeometry.from_is_ready(). Defaults to the standard sheet.
+        team (int | np.ndarray | None, optional): Team index, or (N,) team indices, whose stones come first. Defaults to None, team0 first.
+        fill (float, optional): Value of the features that do not exist. Defaults to -1.0.
+
+    Returns:
+        np.ndarray: (N, F) float32 features, named by feature_names()
+    """
+    g = geometry or SheetGeometry()
+    if isinstance(states, np.ndarray):
+        boards = states.astype(np.float64, copy=False)
+    else:
+        boards = stack_boards(states)
+    boards = boards.reshape(-1, len(TEAMS), STONES_PER_TEAM, 3)
+    n = len(boards)
+    if team is not None:
+        swap = np.broadcast_to(np.asarray(team) == 1, (n,))
+        boards = np.where(swap[:, None, None, None], boards[:, ::-1], boards)
+
+    x = boards[..., 0]
+    y = boards[..., 1]
+    in_play = ~np.isnan(x) & (np.abs(x - g.tee_x) <= g.sheet_width / 2)
+    tee_distance = np.where(in_play, np.hypot(x - g.tee_x, y - g.tee_y), np.inf)
+    in_house = tee_distance <= g.house_radius + g.stone_radius
+    in_guard_zone = in_play & ~in_house & (y >= g.hog_line_y) & (y < g.tee_y)
+
+    # (N, 8, 8) distances between the stones of team0 and team1
+    dx = x[:, 0, :, None] - x[:, 1, None, :]
+    dy = y[:, 0, :, None] - y[:, 1, None, :]
+    pair = np.hypot(dx, dy)
+    pair[~(in_play[:, 0, :, None] & in_play[:, 1, None, :])] = np.inf
+    nearest = np.stack([pair.min(axis=2), pair.min(axis=1)], axis=1)
+
+    # the team of the stone closest to the tee in the house scores
+    scoring_team, points = score_end(boards, g)
+    scored = scoring_team >= 0
+    shot_rock = np.zeros((n, len(TEAMS)), dtype=bool)
+    shot_rock[scored, scoring_team[scored]] = True
+    counting = np.zeros((n, len(TEAMS)), dtype=np.int64)
+    counting[scored, scoring_team[scored]] = points[scored]
+
+    stone_features = np.stack(
+        [
+            in_play,
+            np.where(in_play, (x - g.tee_x) / (g.sheet_width / 2), fill),
+            np.where(in_play, y, fill),
+            np.where(in_play, tee_distance, fill),
+            in_house,
+            in_guard_zone,
+            np.where(np.isfinite(nearest), nearest, fill),
+        ],
+        axis=-1,
+    )
+    board_features = np.concatenate(
+        [
+            in_house.sum(axis=2),
+            in_guard_zone.sum(axis=2),
+            shot_rock,
+            counting,
+        ],
+        axis=1,
+    )
+    return np.concatenate(
+        [stone_features.reshape(n, -1), board_features], axis=1
+    ).astype(np.float32)
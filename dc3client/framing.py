@@ -0,0 +1,141 @@
+import socket
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class ReceiveStats:
+    """Throughput of the receive path"""
+
+    bytes_received: int = 0
+    messages_received: int = 0
+    first_receive: float | None = None
+    last_receive: float | None = None
+
+    def add(self, nbytes: int = 0, nmessages: int = 0) -> None:
+        """count received bytes and messages
+
+        Args:
+            nbytes (int, optional): Number of received bytes. Defaults to 0.
+            nmessages (int, optional): Number of completed messages. Defaults to 0.
+        """
+        now = time.monotonic()
+        if self.first_receive is None:
+            self.first_receive = now
+        self.last_receive = now
+        self.bytes_received += nbytes
+        self.messages_received += nmessages
+
+    @property
+    def elapsed(self) -> float:
+        """seconds between the first and the last receive"""
+        if self.first_receive is None or self.last_receive is None:
+            return 0.0
+        return self.last_receive - self.first_receive
+
+    @property
+    def bytes_per_second(self) -> float:
+        """received bytes per second"""
+        if self.elapsed <= 0.0:
+            return 0.0
+        return self.bytes_received / self.elapsed
+
+    @property
+    def messages_per_second(self) -> float:
+        """received messages per second"""
+        if self.elapsed <= 0.0:
+            return 0.0
+        return self.messages_received / self.elapsed
+
+
+class LineFramer:
+    """Split a byte stream into newline delimited messages
+
+    Data is received with ``recv_into`` straight into a growable bytearray, and
+    the newline search resumes where the previous one stopped, so a message that
+    spans many chunks is scanned and copied only once.
+    """
+
+    def __init__(self, chunk_size: int = 1024) -> None:
+        """initialize framer
+
+        Args:
+            chunk_size (int, optional): Minimum free space per recv_into call. Defaults to 1024.
+        """
+        self.chunk_size = chunk_size
+        self.stats = ReceiveStats()
+
+        self._buffer = bytearray(max(chunk_size, 4096))
+        self._start = 0  # first byte of the pending message
+        self._end = 0  # end of the received data
+        self._scan = 0  # bytes before this position contain no newline
+
+    def __len__(self) -> int:
+        """number of buffered bytes that have not been returned yet"""
+        return self._end - self._start
+
+    def _reserve(self, size: int) -> None:
+        """make sure that at least size bytes are free after the received data"""
+        if len(self._buffer) - self._end >= size:
+            return
+
+        pending = self._end - self._start
+        if self._start > 0:
+            # move the pending partial message to the front of the buffer
+            self._buffer[:pending] = self._buffer[self._start : self._end]
+            self._scan -= self._start
+            self._start = 0
+            self._end = pending
+
+        if len(self._buffer) - self._end < size:
+            new_size = len(self._buffer)
+            while new_size - self._end < size:
+                new_size *= 2
+            self._buffer.extend(bytes(new_size - len(self._buffer)))
+
+    def fill(self, sock: socket.socket) -> int:
+        """receive once from the socket into the buffer
+
+        Args:
+            sock (socket.socket): Connected socket.
+
+        Returns:
+            int: number of received bytes, 0 if the connection was closed
+        """
+        self._reserve(self.chunk_size)
+        with memoryview(self._buffer) as view:
+            nbytes = sock.recv_into(view[self._end :])
+        self._end += nbytes
+        self.stats.add(nbytes=nbytes)
+        return nbytes
+
+    def feed(self, data: bytes) -> None:
+        """append already received data to the buffer
+
+        Args:
+            data (bytes): Received data.
+        """
+        self._reserve(len(data))
+        self._buffer[self._end : self._end + len(data)] = data
+        self._end += len(data)
+        self.stats.add(nbytes=len(data))
+
+    def next_message(self) -> bytes | None:
+        """pop one complete message
+
+        Returns:
+            bytes | None: message without the trailing newline, None if incomplete
+        """
+        index = self._buffer.find(b"\n", self._scan, self._end)
+        if index < 0:
+            self._scan = self._end
+            return None
+
+        with memoryview(self._buffer) as view:
+            message = bytes(view[self._start : index])
+
+        self._start = self._scan = index + 1
+        if self._start == self._end:
+            self._start = self._end = self._scan = 0
+        self.stats.add(nmessages=1)
+        return message
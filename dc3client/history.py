@@ -0,0 +1,130 @@
+"""Bounded update history that spills older updates to an on-disk journal.
+
+``UpdateHistory`` stands in for ``MatchData.update_list``. Every update is
+appended to an append-only journal as the JSON line it arrived as, but only the
+last ``max_in_memory`` parsed updates stay in memory. Older ones are read back
+from the journal and parsed again when they are indexed or iterated, so the
+accessors that walk the whole list keep working with a bounded footprint.
+"""
+
+import pathlib
+import tempfile
+from collections import deque
+from collections.abc import Sequence
+from os import PathLike
+from typing import Any, Callable, Iterator
+
+from dc3client.codec import JSONCodec, default_codec
+
+# parse(message_recv, raw) -> update, the parser the client uses for new updates
+UpdateParser = Callable[[dict[str, Any], bytes], Any]
+
+
+class UpdateHistory(Sequence):
+    """List of updates that keeps only the most recent ones in memory"""
+
+    def __init__(
+        self,
+        parse: UpdateParser,
+        max_in_memory: int = 64,
+        path: str | PathLike | None = None,
+        codec: JSONCodec | None = None,
+    ) -> None:
+        """initialize update history
+
+        Args:
+            parse (UpdateParser): Builds an update from a journal line, called as parse(message_recv, raw).
+            max_in_memory (int, optional): Number of recent updates kept in memory. Defaults to 64.
+            path (str | PathLike | None, optional): Journal file, appended to if it exists. Defaults to an anonymous temporary file.
+            codec (JSONCodec | None, optional): JSON codec of the journal. Defaults to the fastest installed codec.
+        """
+        if max_in_memory < 1:
+            raise ValueError(f"max_in_memory must be positive : {max_in_memory}")
+        self.parse = parse
+        self.max_in_memory = max_in_memory
+        self.codec = codec or default_codec
+
+        self.path = None if path is None else pathlib.Path(path)
+        if self.path is None:
+            self._file = tempfile.TemporaryFile("w+b")
+        else:
+            self._file = open(self.path, "a+b")
+        self._size = self._file.seek(0, 2)
+
+        # Journal offset of every update and the parsed recent ones
+        self._offsets: list[int] = []
+        self._recent: deque = deque(maxlen=max_in_memory)
+
+    def __repr__(self) -> str:
+        return (
+            f"UpdateHistory(len={len(self)}, in_memory={len(self._recent)}, "
+            f"path={self.path})"
+        )
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("update history index out of range")
+
+        first_recent = len(self) - len(self._recent)
+        if index >= first_recent:
+            return self._recent[index - first_recent]
+        return self.load(index)
+
+    def __iter__(self) -> Iterator[Any]:
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def closed(self) -> bool:
+        """whether the journal is closed"""
+        return self._file.closed
+
+    @property
+    def in_memory(self) -> int:
+        """number of updates held in memory"""
+        return len(self._recent)
+
+    def append(self, update: Any, raw: bytes) -> None:
+        """store a new update
+
+        Args:
+            update (Any): Parsed update.
+            raw (bytes): Message of the update without the trailing newline.
+        """
+        self._file.seek(0, 2)
+        self._file.write(raw + b"\n")
+        self._offsets.append(self._size)
+        self._size += len(raw) + 1
+        self._recent.append(update)
+
+    def load(self, index: int) -> Any:
+        """read one update back from the journal and parse it
+
+        Args:
+            index (int): Position of the update, older ones are not cached.
+
+        Returns:
+            Any: parsed update
+        """
+        if self._file.closed:
+            raise ValueError("Update history is closed, spilled updates are gone")
+        start = self._offsets[index]
+        end = self._offsets[index + 1] if index + 1 < len(self) else self._size
+        self._file.flush()
+        self._file.seek(start)
+        raw = self._file.read(end - start - 1)
+        return self.parse(self.codec.loads(raw), raw)
+
+    def close(self) -> None:
+        """close the journal, a temporary journal is deleted
+
+        The updates still in memory stay readable, the spilled ones do not.
+        """
+        self._file.close()
@@ -0,0 +1,426 @@
+"""Local SQLite index of per-shot summaries for situation queries.
+
+``ShotIndex`` loads one row per update of every game, the state after the shot,
+into a SQLite database, with the board stored next to the summary, so that a
+query returns the matching boards without reading the logs again::
+
+    with ShotIndex("shots.sqlite") as index:
+        index.add_files(pathlib.Path("data/logs").glob("*/game.dcl2"))
+        # shots in end 8 or later where team0 had the hammer and was down by 1
+        shots = index.query(
+            ("end_number", ">=", 8),
+            team=0,
+            has_hammer=True,
+            score_diff=-1,
+            view="team_shots",
+        )
+        shots["board"]  # (N, 2, 8, 3)
+
+Conditions are ``(column, operator, value)`` tuples, or ``column=value`` for
+equality, checked against the columns of the view and joined with AND, and
+the values are always passed to SQLite as parameters.
+
+Tables and views:
+
+- games: id, game_id (from ServerDC), source, team0, team1 (names), winner (0, 1 or -1), reason
+- shots: game, number (update within the game), end_number, shot_number, hammer,
+  next_team, shooter (team of the last move, -1 if none), score0, score1 (totals
+  after the update), house0, house1 (stones in the house), velocity_x,
+  velocity_y, rotation, move_type (see dc3client.archive), free_guard_zone_foul,
+  end_score0, end_score1 (score of the end, -1 if unknown), board
+- team_shots: every shot twice, once from each team, adding team, has_hammer,
+  score_diff, house_own, house_opp and won
+"""
+
+import sqlite3
+from os import PathLike
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+
+from dc3client.archive import MatchArchive, match_arrays
+from dc3client.board import STONES_PER_TEAM, TEAMS, stones_in_house
+from dc3client.corpus import shot_results
+from dc3client.logs import read_dcl2
+
+_BOARD_SHAPE = (len(TEAMS), STONES_PER_TEAM, 3)
+
+VIEWS = ("shots", "team_shots")
+OPERATORS = ("=", "!=", "<", "<=", ">", ">=", "in", "not in", "is", "is not")
+
+# (column, operator, value), the value of "in" and "not in" is a sequence
+Condition = tuple[str, str, Any]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    game_id TEXT,
+    source TEXT UNIQUE,
+    team0 TEXT,
+    team1 TEXT,
+    winner INTEGER NOT NULL,
+    reason TEXT
+);
+CREATE TABLE IF NOT EXISTS shots (
+    game INTEGER NOT NULL REFERENCES games(id) ON DELETE CASCADE,
+    number INTEGER NOT NULL,
+    end_number INTEGER NOT NULL,
+    shot_number INTEGER NOT NULL,
+    hammer INTEGER NOT NULL,
+    next_team INTEGER NOT NULL,
+    shooter INTEGER NOT NULL,
+    score0 INTEGER NOT NULL,
+    score1 INTEGER NOT NULL,
+    house0 INTEGER NOT NULL,
+    house1 INTEGER NOT NULL,
+    velocity_x REAL,
+    velocity_y REAL,
+    rotation INTEGER NOT NULL,
+    move_type INTEGER NOT NULL,
+    free_guard_zone_foul INTEGER NOT NULL,
+    end_score0 INTEGER NOT NULL,
+    end_score1 INTEGER NOT NULL,
+    board BLOB NOT NULL,
+    PRIMARY KEY (game, number)
+);
+CREATE INDEX IF NOT EXISTS games_game_id ON games (game_id);
+CREATE INDEX IF NOT EXISTS shots_situation
+    ON shots (end_number, hammer, score0, score1);
+CREATE INDEX IF NOT EXISTS shots_house ON shots (house0, house1);
+CREATE INDEX IF NOT EXISTS shots_move ON shots (move_type, rotation);
+CREATE VIEW IF NOT EXISTS team_shots AS
+    SELECT shots.*, 0 AS team, hammer = 0 AS has_hammer,
+        score0 - score1 AS score_diff, house0 AS house_own, house1 AS house_opp,
+        games.winner = 0 AS won
+    FROM shots JOIN games ON games.id = shots.game
+    UNION ALL
+    SELECT shots.*, 1 AS team, hammer = 1 AS has_hammer,
+        score1 - score0 AS score_diff, house1 AS house_own, house0 AS house_opp,
+        games.winner = 1 AS won
+    FROM shots JOIN games ON games.id = shots.game;
+"""
+
+_SHOT_COLUMNS = (
+    "game",
+    "number",
+    "end_number",
+    "shot_number",
+    "hammer",
+    "next_team",
+    "shooter",
+    "score0",
+    "score1",
+    "house0",
+    "house1",
+    "velocity_x",
+    "velocity_y",
+    "rotation",
+    "move_type",
+    "free_guard_zone_foul",
+    "end_score0",
+    "end_score1",
+    "board",
+)
+
+
+def shot_summaries(arrays: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Derive the summary columns of every update of one game
+
+    Args:
+        arrays (dict[str, np.ndarray]): match arrays, see MatchArchive
+
+    Returns:
+        dict[str, np.ndarray]: column of the shots table -> (N,) values, without game, number and board
+    """
+    results = shot_results(arrays)
+    house = stones_in_house(arrays["board"])
+    next_team = arrays["next_team"].astype(np.int64)
+    # the last move was thrown by the team to play in the previous update
+    shooter = np.concatenate([[-1], next_team[:-1]])[: len(next_team)]
+    shooter[arrays["move_type"] == 0] = -1
+    move = arrays["move"].astype(np.float64)
+    return {
+        "end_number": arrays["end"],
+        "shot_number": arrays["shot"],
+        "hammer": arrays["hammer"],
+        "next_team": next_team,
+        "shooter": shooter,
+        "score0": results["score"][:, 0],
+        "score1": results["score"][:, 1],
+        "house0": house[:, 0],
+        "house1": house[:, 1],
+        "velocity_x": move[:, 0],
+        "velocity_y": move[:, 1],
+        "rotation": arrays["rotation"],
+        "move_type": arrays["move_type"],
+        "free_guard_zone_foul": arrays["free_guard_zone_foul"],
+        "end_score0": results["end_score"][:, 0],
+        "end_score1": results["end_score"][:, 1],
+    }
+
+
+def _param(value: Any) -> Any:
+    # sqlite3 does not bind NumPy scalars
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _column(values: list[Any]) -> np.ndarray:
+    # SQLite stores NaN as NULL, a REAL column comes back with None
+    array = np.array(values)
+    if array.dtype == object:
+        try:
+            array = np.array(
+                [np.nan if value is None else value for value in values],
+                dtype=np.float64,
+            )
+        except (TypeError, ValueError):
+            pass
+    return array
+
+
+class ShotIndex:
+    """SQLite database of per-shot summaries and boards"""
+
+    def __init__(self, path: str | PathLike) -> None:
+        """initialize shot index, the database and its tables are created if missing
+
+        Args:
+            path (str | PathLike): SQLite database file, ":memory:" for one in memory.
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+
+    def __repr__(self) -> str:
+        return f"ShotIndex(path={self.path})"
+
+    def __enter__(self) -> "ShotIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """number of shots"""
+        return self.connection.execute("SELECT COUNT(*) FROM shots").fetchone()[0]
+
+    @property
+    def n_games(self) -> int:
+        """number of games"""
+        return self.connection.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+
+    def add(self, arrays: dict[str, np.ndarray], info: dict[str, Any]) -> int:
+        """index one game, replacing the game of the same source
+
+        Args:
+            arrays (dict[str, np.ndarray]): match arrays of the game, see MatchArchive
+            info (dict[str, Any]): source, game_id, team0, team1 and game_result of the game, missing ones are NULL
+
+        Returns:
+            int: id of the game in the games table
+        """
+        game_result = info.get("game_result") or {}
+        winner = game_result.get("winner")
+        summaries = shot_summaries(arrays)
+        n = len(arrays["end"])
+        boards = np.ascontiguousarray(arrays["board"], dtype=np.float32)
+
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM games WHERE source = ?", (info.get("source"),)
+            )
+            game = self.connection.execute(
+                "INSERT INTO games (game_id, source, team0, team1, winner, reason)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    info.get("game_id"),
+                    info.get("source"),
+                    info.get("team0"),
+                    info.get("team1"),
+                    TEAMS.index(winner) if winner in TEAMS else -1,
+                    game_result.get("reason"),
+                ),
+            ).lastrowid
+            columns = [np.full(n, game).tolist(), list(range(n))]
+            columns += [summaries[name].tolist() for name in _SHOT_COLUMNS[2:-1]]
+            columns.append([board.tobytes() for board in boards])
+            self.connection.executemany(
+                f"INSERT INTO shots ({', '.join(_SHOT_COLUMNS)})"
+                f" VALUES ({', '.join('?' * len(_SHOT_COLUMNS))})",
+                zip(*columns),
+            )
+        return game
+
+    def add_dcl2(self, path: str | PathLike) -> int:
+        """index the game of a .dcl2 log or a RawJournal
+
+        Args:
+            path (str | PathLike): .dcl2 file, plain or gzip
+
+        Returns:
+            int: id of the game in the games table
+        """
+        messages: dict[str, Any] = {}
+        updates = []
+        for record in read_dcl2(path):
+            message = record["log"]
+            if message["cmd"] == "update":
+                updates.append(message)
+            elif message["cmd"] in ("dc", "new_game"):
+                messages.setdefault(message["cmd"], message)
+        dc = messages.get("dc") or {}
+        names = messages.get("new_game", {}).get("name", {})
+        return self.add(
+            match_arrays(updates, trajectory=False),
+            {
+                "source": str(path),
+                "game_id": dc.get("game_id"),
+                "team0": names.get("team0"),
+                "team1": names.get("team1"),
+                "game_result": updates[-1]["state"]["game_result"] if updates else None,
+            },
+        )
+
+    def add_archive(self, path: str | PathLike) -> int:
+        """index the game of a .dc3a match archive
+
+        Args:
+            path (str | PathLike): .dc3a file
+
+        Returns:
+            int: id of the game in the games table
+        """
+        with MatchArchive(path) as archive:
+            dc = archive.dc or {}
+            return self.add(
+                {name: archive[name] for name in archive.names()},
+                {
+                    "source": str(path),
+                    "game_id": dc.get("game_id"),
+                    "game_result": archive.game_result,
+                },
+            )
+
+    def add_files(self, paths: Iterable[str | PathLike]) -> int:
+        """index .dcl2 logs and .dc3a archives, chosen by their suffix
+
+        Args:
+            paths (Iterable[str | PathLike]): files
+
+        Returns:
+            int: number of games indexed
+        """
+        count = 0
+        for path in paths:
+            if str(path).endswith(".dc3a"):
+                self.add_archive(path)
+            else:
+                self.add_dcl2(path)
+            count += 1
+        return count
+
+    def columns(self, view: str = "shots") -> list[str]:
+        """names of the columns of a view
+
+        Args:
+            view (str, optional): "shots" or "team_shots". Defaults to "shots".
+
+        Returns:
+            list[str]: column names, board included
+        """
+        if view not in VIEWS:
+            raise ValueError(f"Unknown view : {view}")
+        cursor = self.connection.execute(f"SELECT * FROM {view} LIMIT 0")
+        return [d[0] for d in cursor.description]
+
+    def _where(
+        self, view: str, conditions: Iterable[Condition], equals: dict[str, Any]
+    ) -> tuple[str, list[Any]]:
+        """WHERE clause with ? placeholders and its parameters"""
+        known = self.columns(view)
+        clauses: list[str] = []
+        params: list[Any] = []
+        for column, operator, value in [
+            *conditions,
+            *((column, "=", value) for column, value in equals.items()),
+        ]:
+            if column not in known or column == "board":
+                raise ValueError(f"Unknown column of {view} : {column}")
+            operator = " ".join(operator.lower().split())
+            if operator not in OPERATORS:
+                raise ValueError(f"Unknown operator : {operator}")
+            if operator in ("in", "not in"):
+                values = [_param(v) for v in value]
+                placeholders = ", ".join("?" * len(values))
+                clauses.append(f"{column} {operator.upper()} ({placeholders})")
+                params += values
+            else:
+                clauses.append(f"{column} {operator.upper()} ?")
+                params.append(_param(value))
+        return " AND ".join(clauses) or "1", params
+
+    def query(
+        self,
+        *conditions: Condition,
+        view: str = "shots",
+        columns: Sequence[str] | None = None,
+        limit: int | None = None,
+        **equals: Any,
+    ) -> dict[str, np.ndarray]:
+        """select shots and their boards
+
+        Args:
+            *conditions (Condition): (column, operator, value) conditions, operator one of OPERATORS.
+            view (str, optional): "shots", or "team_shots" for conditions seen from one team. Defaults to "shots".
+            columns (Sequence[str] | None, optional): Columns to return besides the board. Defaults to every column.
+            limit (int | None, optional): Maximum number of shots. Defaults to None, no limit.
+            **equals (Any): column=value conditions.
+
+        Returns:
+            dict[str, np.ndarray]: column name -> (N,) values, and "board" (N, 2, 8, 3) float32 boards
+        """
+        where, params = self._where(view, conditions, equals)
+        known = self.columns(view)
+        if columns is None:
+            columns = [name for name in known if name != "board"]
+        elif unknown := [name for name in columns if name not in known]:
+            raise ValueError(f"Unknown columns of {view} : {unknown}")
+        sql = f"SELECT {', '.join([*columns, 'board'])} FROM {view} WHERE {where}"
+        sql += " ORDER BY game, number"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        rows = self.connection.execute(sql, params).fetchall()
+
+        result = {
+            name: _column([row[i] for row in rows]) for i, name in enumerate(columns)
+        }
+        result["board"] = np.frombuffer(
+            b"".join(row[-1] for row in rows), dtype=np.float32
+        ).reshape(len(rows), *_BOARD_SHAPE)
+        return result
+
+    def count(self, *conditions: Condition, view: str = "shots", **equals: Any) -> int:
+        """number of shots matching the conditions, see query()"""
+        where, params = self._where(view, conditions, equals)
+        sql = f"SELECT COUNT(*) FROM {view} WHERE {where}"
+        return self.connection.execute(sql, params).fetchone()[0]
+
+    def close(self) -> None:
+        """close the database"""
+        self.connection.close()
+
+
+def build_index(path: str | PathLike, sources: Iterable[str | PathLike]) -> int:
+    """Index .dcl2 logs and .dc3a archives into a SQLite database
+
+    Args:
+        path (str | PathLike): SQLite database file, existing games of the same sources are replaced
+        sources (Iterable[str | PathLike]): .dcl2 logs and .dc3a archives
+
+    Returns:
+        int: number of games indexed
+    """
+    with ShotIndex(path) as index:
+        return index.add_files(sources)
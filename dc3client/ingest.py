@@ -0,0 +1,321 @@
+"""Parallel, incremental ingestion of .dcl2 log directories into match archives.
+
+Every .dcl2 log (plain or gzip) found under the input directories is written to
+a .dc3a match archive (see dc3client.archive) by a pool of worker processes.
+A manifest in the output directory records the size, mtime, hash and archive
+options of every ingested log under its resolved path, so a re-run only reads
+the logs that are new or changed, or were archived with other options, and an
+interrupted run keeps what it finished::
+
+    python -m dc3client.ingest data/logs -o data/archives --corpus data/corpus.dc3c
+
+The archives of a directory ``data/logs`` are written to
+``data/archives/logs-<hash of the directory>/<path of the log>.dc3a``, so two
+directories with the same name do not share archives, and ``--corpus``
+consolidates all of them into one corpus file (see dc3client.corpus) afterwards.
+The corpus is rebuilt from every archive whenever a log was ingested, and kept
+as it is when it already holds exactly the archives of the manifest.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import pathlib
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from os import PathLike
+from typing import Any, Iterable, Iterator
+
+from dc3client.archive import archive_dcl2
+from dc3client.corpus import Corpus, build_corpus
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 2
+LOG_PATTERNS = ("*.dcl2", "*.dcl2.gz")
+
+# Completed games between two saves of the manifest
+_SAVE_INTERVAL = 256
+
+logger = logging.getLogger("ingest")
+
+
+@dataclass(slots=True)
+class IngestReport:
+    """Outcome of one ingestion run"""
+
+    ingested: list[str] = field(default_factory=list)
+    unchanged: int = 0
+    failed: dict[str, str] = field(default_factory=dict)
+
+
+def file_hash(path: str | PathLike, chunk_size: int = 2**20) -> str:
+    """sha256 of a file, read in chunks
+
+    Args:
+        path (str | PathLike): file
+        chunk_size (int, optional): Bytes read at once. Defaults to 1 MiB.
+
+    Returns:
+        str: hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def find_logs(root: str | PathLike) -> Iterator[pathlib.Path]:
+    """find the .dcl2 logs under a directory, in sorted order
+
+    Args:
+        root (str | PathLike): directory, or a single log
+
+    Yields:
+        pathlib.Path: log file
+    """
+    root = pathlib.Path(root)
+    if root.is_file():
+        yield root
+        return
+    paths = {path for pattern in LOG_PATTERNS for path in root.rglob(pattern)}
+    yield from sorted(path for path in paths if path.is_file())
+
+
+def archive_name(source: pathlib.Path, base: pathlib.Path) -> str:
+    """relative path of the archive of a log
+
+    Args:
+        source (pathlib.Path): log file
+        base (pathlib.Path): resolved directory the log was found in
+
+    Returns:
+        str: path relative to the output directory
+    """
+    tag = hashlib.sha256(base.as_posix().encode()).hexdigest()[:8]
+    name = source.relative_to(base).as_posix().removesuffix(".gz")
+    return f"{base.name}-{tag}/{name.removesuffix('.dcl2')}.dc3a"
+
+
+def load_manifest(path: str | PathLike) -> dict[str, dict[str, Any]]:
+    """read a manifest, empty if the file does not exist or has an older layout
+
+    Args:
+        path (str | PathLike): manifest file
+
+    Returns:
+        dict[str, dict[str, Any]]: resolved log path -> size, mtime_ns, sha256, options and archive
+    """
+    try:
+        with open(path, "r") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        logger.warning(f"Ignore manifest {path} of version {manifest.get('version')}")
+        return {}
+    return manifest["files"]
+
+
+def save_manifest(path: str | PathLike, files: dict[str, dict[str, Any]]) -> None:
+    """write a manifest atomically
+
+    Args:
+        path (str | PathLike): manifest file
+        files (dict[str, dict[str, Any]]): resolved log path -> size, mtime_ns, sha256, options and archive
+    """
+    path = pathlib.Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(
+            {"version": MANIFEST_VERSION, "files": files}, f, indent=1, sort_keys=True
+        )
+    os.replace(tmp, path)
+
+
+def ingest_file(
+    source: str | PathLike,
+    archive: str | PathLike,
+    known_hash: str | None = None,
+    trajectory: bool = False,
+) -> dict[str, Any]:
+    """archive one log, runs in a worker process
+
+    Args:
+        source (str | PathLike): .dcl2 log
+        archive (str | PathLike): output .dc3a archive
+        known_hash (str | None, optional): Hash in the manifest, the archive is kept when the content did not change. Defaults to None.
+        trajectory (bool, optional): Store the trajectories. Defaults to False.
+
+    Returns:
+        dict[str, Any]: manifest entry of the log
+    """
+    archive = pathlib.Path(archive)
+    stat = os.stat(source)
+    digest = file_hash(source)
+    if digest != known_hash or not archive.exists():
+        archive.parent.mkdir(parents=True, exist_ok=True)
+        tmp = archive.with_name(archive.name + ".tmp")
+        try:
+            archive_dcl2(tmp, source, trajectory)
+        except Exception:
+            tmp.unlink(missing_ok=True)
+            raise
+        os.replace(tmp, archive)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+
+
+def ingest(
+    roots: Iterable[str | PathLike],
+    output: str | PathLike,
+    workers: int | None = None,
+    trajectory: bool = False,
+) -> IngestReport:
+    """archive the new and changed logs under some directories
+
+    Args:
+        roots (Iterable[str | PathLike]): directories searched for .dcl2 logs, their archives go to output/<directory name>-<hash of its path>
+        output (str | PathLike): output directory, holding the archives and the manifest
+        workers (int | None, optional): Worker processes, 0 archives in this process. Defaults to None, one per CPU.
+        trajectory (bool, optional): Store the trajectories. Defaults to False.
+
+    Returns:
+        IngestReport: keys of the ingested logs, number unchanged and errors of the failed ones
+    """
+    output = pathlib.Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+    manifest_path = output / MANIFEST_NAME
+    files = load_manifest(manifest_path)
+    report = IngestReport()
+
+    # an archive written with other options is rebuilt even if the log is unchanged
+    options = {"trajectory": trajectory}
+
+    # Compare size and mtime first, only the changed logs are read and hashed
+    jobs: dict[str, tuple[pathlib.Path, pathlib.Path, str | None]] = {}
+    names: dict[str, str] = {}
+    for root in map(pathlib.Path, roots):
+        top = root if root.is_dir() else root.parent
+        base = top.resolve()
+        for source in find_logs(root):
+            source = base / source.relative_to(top)
+            key = source.as_posix()
+            entry = files.get(key)
+            stat = source.stat()
+            if entry is not None and entry.get("options") != options:
+                entry = None
+            if (
+                entry is not None
+                and entry["size"] == stat.st_size
+                and entry["mtime_ns"] == stat.st_mtime_ns
+                and (output / entry["archive"]).exists()
+            ):
+                report.unchanged += 1
+                continue
+            names[key] = archive_name(source, base)
+            jobs[key] = (source, output / names[key], entry and entry["sha256"])
+
+    def done(key: str, entry: dict[str, Any]) -> None:
+        files[key] = dict(entry, options=options, archive=names[key])
+        report.ingested.append(key)
+        if len(report.ingested) % _SAVE_INTERVAL == 0:
+            save_manifest(manifest_path, files)
+
+    if workers == 0:
+        for key, (source, archive, known_hash) in jobs.items():
+            try:
+                done(key, ingest_file(source, archive, known_hash, trajectory))
+            except Exception as e:
+                logger.error(f"Failed to ingest {source} : {e!r}")
+                report.failed[key] = repr(e)
+    elif jobs:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures: dict[Future, str] = {
+                executor.submit(ingest_file, *job, trajectory): key
+                for key, job in jobs.items()
+            }
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    done(key, future.result())
+                except Exception as e:
+                    logger.error(f"Failed to ingest {jobs[key][0]} : {e!r}")
+                    report.failed[key] = repr(e)
+
+    save_manifest(manifest_path, files)
+    return report
+
+
+def manifest_archives(output: str | PathLike) -> list[pathlib.Path]:
+    """archives listed in the manifest of an output directory, in sorted key order
+
+    Args:
+        output (str | PathLike): output directory of ingest()
+
+    Returns:
+        list[pathlib.Path]: .dc3a archives
+    """
+    output = pathlib.Path(output)
+    files = load_manifest(output / MANIFEST_NAME)
+    return [output / files[key]["archive"] for key in sorted(files)]
+
+
+def corpus_is_current(
+    path: str | PathLike, archives: list[pathlib.Path], trajectory: bool = False
+) -> bool:
+    """whether a corpus file was built from exactly some archives
+
+    Args:
+        path (str | PathLike): corpus file
+        archives (list[pathlib.Path]): archives of the corpus, in order
+        trajectory (bool, optional): Whether the corpus includes the trajectories. Defaults to False.
+
+    Returns:
+        bool: False if the file is missing or unreadable, or was built from other archives or options
+    """
+    try:
+        with Corpus(path) as corpus:
+            sources = [game["source"] for game in corpus.games]
+            has_trajectory = "frames" in corpus
+    except (OSError, ValueError, KeyError):
+        return False
+    return has_trajectory == trajectory and sources == [str(a) for a in archives]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Archive the new and changed .dcl2 logs of some directories"
+    )
+    parser.add_argument("roots", type=pathlib.Path, nargs="+")
+    parser.add_argument("-o", "--output", type=pathlib.Path, required=True)
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    parser.add_argument("--trajectory", action="store_true")
+    parser.add_argument(
+        "--corpus",
+        type=pathlib.Path,
+        default=None,
+        help="corpus file rebuilt from every archive when a log was ingested",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    report = ingest(args.roots, args.output, args.workers, args.trajectory)
+    logger.info(
+        f"ingested {len(report.ingested)}, unchanged {report.unchanged}, "
+        f"failed {len(report.failed)}"
+    )
+    if args.corpus is not None:
+        archives = manifest_archives(args.output)
+        if not report.ingested and corpus_is_current(
+            args.corpus, archives, args.trajectory
+        ):
+            logger.info(f"corpus {args.corpus} : unchanged")
+            return
+        games = build_corpus(args.corpus, archives, args.trajectory)
+        logger.info(f"corpus {args.corpus} : {games} games")
+
+
+if __name__ == "__main__":
+    main()
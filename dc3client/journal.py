@@ -0,0 +1,135 @@
+"""Journal of the raw lines exchanged with the server, in the .dcl2 layout.
+
+``RawJournal`` tees every received and sent line to a file without decoding it.
+Each line is wrapped in a record laid out like the records of the server's
+.dcl2 logs, with the message under "log", so the tools that read server logs
+(dc3client.logs.read_dcl2 among them) read the journal as is::
+
+    {"ver":[1,1],"tag":"recv","id":0,"date_time":"...","monotonic":12.5,"log":{...}}
+
+"tag" is "recv" or "send", and "monotonic" is time.monotonic() when the line
+was received or written to the socket, for measuring latencies within a match.
+"""
+
+import datetime
+import os
+import pathlib
+import re
+import threading
+import time
+from os import PathLike
+
+RECEIVED = "recv"
+SENT = "send"
+
+_HEADER = re.compile(rb'\{"ver":\[[^\]]*\],"tag":"[^"]*","id":(\d+),')
+
+
+def _last_id(path: str | PathLike, chunk_size: int = 2**16) -> int | None:
+    """id of the last record of a journal, read from the end of the file
+
+    Args:
+        path (str | PathLike): journal file
+        chunk_size (int, optional): Bytes read at once while looking for the start of the last record. Defaults to 64 KiB.
+
+    Returns:
+        int | None: id of the last record, None if the file is missing or has no record
+    """
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return None
+    with f:
+        end = f.seek(0, os.SEEK_END)
+        tail = b""
+        while end > 0:
+            start = max(end - chunk_size, 0)
+            f.seek(start)
+            tail = f.read(end - start) + tail
+            end = start
+            lines = tail.split(b"\n")
+            # the first line may be cut in the middle unless the file starts there
+            for line in reversed(lines if end == 0 else lines[1:]):
+                if (match := _HEADER.match(line)) is not None:
+                    return int(match.group(1))
+    return None
+
+
+class RawJournal:
+    """Append the raw lines exchanged with the server to a .dcl2 style file"""
+
+    def __init__(self, path: str | PathLike, flush: bool = True) -> None:
+        """initialize raw journal, the file is created or appended to
+
+        When appending, the ids continue from the last record of the file.
+
+        Args:
+            path (str | PathLike): Journal file, its directory is created if missing.
+            flush (bool, optional): Flush after every line, so that a crash loses nothing. Defaults to True.
+        """
+        self.path = pathlib.Path(path)
+        self.flush_each = flush
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        previous = _last_id(self.path)
+        self._file = open(self.path, "ab")
+        self._id = 0 if previous is None else previous + 1
+        # send() may run on the writer thread of the send queue
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"RawJournal(path={self.path}, records={self._id})"
+
+    def __enter__(self) -> "RawJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        """whether the file is closed"""
+        return self._file.closed
+
+    def received(self, line: bytes) -> None:
+        """append a line received from the server
+
+        Args:
+            line (bytes): JSON message, with or without the trailing newline.
+        """
+        self.write(RECEIVED, line)
+
+    def sent(self, line: bytes) -> None:
+        """append a line sent to the server
+
+        Args:
+            line (bytes): JSON message, with or without the trailing newline.
+        """
+        self.write(SENT, line)
+
+    def write(self, tag: str, line: bytes) -> None:
+        """append one record, the line is copied without decoding
+
+        Args:
+            tag (str): "recv" or "send".
+            line (bytes): JSON message, with or without the trailing newline.
+        """
+        monotonic = time.monotonic()
+        date_time = datetime.datetime.now(datetime.timezone.utc).isoformat(
+            timespec="seconds"
+        )
+        with self._lock:
+            if self._file.closed:
+                return
+            header = (
+                f'{{"ver":[1,1],"tag":"{tag}","id":{self._id},'
+                f'"date_time":"{date_time}","monotonic":{monotonic!r},"log":'
+            )
+            self._file.write(header.encode() + line.rstrip(b"\r\n") + b"}\n")
+            self._id += 1
+            if self.flush_each:
+                self._file.flush()
+
+    def close(self) -> None:
+        """close the journal file"""
+        with self._lock:
+            self._file.close()
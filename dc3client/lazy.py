@@ -0,0 +1,236 @@
+"""Update objects that decode their fields on first access.
+
+Most agents only read ``next_team``, ``state.stones`` and ``state.game_result``
+every turn. ``LazyUpdate`` keeps the decoded message and builds ``state`` and
+``last_move`` the first time they are read, and ``LazyLastMove`` does the same
+for the trajectory, which is by far the largest part of an update. Every built
+object is cached, so later reads cost an attribute lookup.
+
+When the raw bytes of the message are given, the decoded trajectory is dropped
+right away and decoded again from the bytes on access, which keeps a long match
+with trajectories at about its size on the wire.
+"""
+
+from typing import Any, Callable
+
+from dc3client.codec import JSONCodec, default_codec
+from dc3client.compact import (
+    CompactState,
+    CompactTrajectory,
+    parse_compact_state,
+    parse_compact_trajectory,
+)
+from dc3client.models import ActualMove, Concede, State, Trajectory
+from dc3client.protocol import parse_actual_move, parse_state, parse_trajectory
+from dc3client.trajectory import ColumnarTrajectory, parse_columnar_trajectory
+
+# Marks a field that has not been built yet, None is a valid value
+_UNSET: Any = object()
+
+
+class LazyLastMove:
+    """Results of previous shot, the trajectory is built on first access"""
+
+    __slots__ = (
+        "actual_move",
+        "free_guard_zone_foul",
+        "compact",
+        "columnar",
+        "_message",
+        "_loader",
+        "_trajectory",
+    )
+
+    def __init__(
+        self,
+        message_recv: dict[str, Any],
+        compact: bool = False,
+        loader: Callable[[], dict[str, Any] | None] | None = None,
+        columnar: bool = False,
+    ) -> None:
+        """initialize lazy last move
+
+        Args:
+            message_recv (dict[str, Any]): "last_move" of the update message.
+            compact (bool, optional): Build CompactTrajectory instead of Trajectory. Defaults to False.
+            loader (Callable[[], dict[str, Any] | None] | None, optional): Decodes the trajectory dropped from message_recv. Defaults to None.
+            columnar (bool, optional): Build ColumnarTrajectory. Defaults to False.
+        """
+        self.actual_move: ActualMove | Concede = parse_actual_move(
+            message_recv["actual_move"]
+        )
+        self.free_guard_zone_foul: bool = message_recv["free_guard_zone_foul"]
+        self.compact = compact
+        self.columnar = columnar
+        self._message = message_recv
+        self._loader = loader
+        self._trajectory: Any = _UNSET
+
+    def __repr__(self) -> str:
+        return (
+            f"LazyLastMove(actual_move={self.actual_move!r}, "
+            f"free_guard_zone_foul={self.free_guard_zone_foul!r})"
+        )
+
+    @property
+    def trajectory(self) -> Trajectory | CompactTrajectory | ColumnarTrajectory | None:
+        """Trajectory of each stone"""
+        if self._trajectory is _UNSET:
+            trajectory_recv = self.trajectory_message()
+            if self.columnar:
+                self._trajectory = parse_columnar_trajectory(trajectory_recv)
+            elif self.compact:
+                self._trajectory = parse_compact_trajectory(trajectory_recv)
+            else:
+                self._trajectory = parse_trajectory(
+                    dict(self._message, trajectory=trajectory_recv)
+                )
+        return self._trajectory
+
+    @trajectory.setter
+    def trajectory(
+        self, value: Trajectory | CompactTrajectory | ColumnarTrajectory | None
+    ) -> None:
+        self._trajectory = value
+        if value is None:
+            # release the raw frames too
+            self._message["trajectory"] = None
+            self._loader = None
+
+    def trajectory_message(self) -> dict[str, Any] | None:
+        """decode the "trajectory" of the last move without caching it"""
+        if self._loader is not None:
+            return self._loader()
+        return self._message.get("trajectory")
+
+
+class LazyUpdate:
+    """Match information on each shot, state and last_move are built on first access"""
+
+    __slots__ = (
+        "cmd",
+        "next_team",
+        "compact",
+        "columnar",
+        "_message",
+        "_state",
+        "_last_move",
+    )
+
+    def __init__(
+        self,
+        message_recv: dict[str, Any],
+        compact: bool = False,
+        raw: bytes | None = None,
+        codec: JSONCodec = default_codec,
+        columnar: bool = False,
+    ) -> None:
+        """initialize lazy update
+
+        Args:
+            message_recv (dict[str, Any]): update message.
+            compact (bool, optional): Build the compact models. Defaults to False.
+            raw (bytes | None, optional): Message as received, to decode the trajectory from. Defaults to None.
+            codec (JSONCodec, optional): JSON codec that decodes raw. Defaults to the fastest installed codec.
+            columnar (bool, optional): Build ColumnarTrajectory. Defaults to False.
+        """
+        self.cmd: str = message_recv["cmd"]
+        self.next_team: str = message_recv["next_team"]
+        self.compact = compact
+        self.columnar = columnar
+        self._message = message_recv
+        self._state: Any = _UNSET
+        self._last_move: Any = _UNSET
+
+        last_move_recv = message_recv["last_move"]
+        if last_move_recv is None:
+            self._last_move = None
+        elif raw is not None and last_move_recv.get("trajectory") is not None:
+            last_move_recv["trajectory"] = None
+            self._last_move = LazyLastMove(
+                last_move_recv,
+                compact,
+                lambda: codec.loads(raw)["last_move"]["trajectory"],
+                columnar,
+            )
+
+    def __repr__(self) -> str:
+        return f"LazyUpdate(cmd={self.cmd!r}, next_team={self.next_team!r})"
+
+    @property
+    def message(self) -> dict[str, Any]:
+        """update message as received"""
+        return self._message
+
+    @property
+    def state(self) -> State | CompactState:
+        """Match state"""
+        if self._state is _UNSET:
+            if self.compact:
+                self._state = parse_compact_state(self._message["state"])
+            else:
+                self._state = parse_state(self._message["state"])
+        return self._state
+
+    @property
+    def last_move(self) -> LazyLastMove | None:
+        """Results of previous shot"""
+        if self._last_move is _UNSET:
+            last_move_recv = self._message["last_move"]
+            if last_move_recv is None:
+                self._last_move = None
+            else:
+                self._last_move = LazyLastMove(
+                    last_move_recv, self.compact, columnar=self.columnar
+                )
+        return self._last_move
+
+    def without_trajectory(self) -> "LazyUpdate":
+        """get a copy whose last move has no trajectory, sharing the built state"""
+        update = LazyUpdate(self.to_message(), self.compact, columnar=self.columnar)
+        update._state = self._state
+        if update.last_move is not None:
+            update.last_move.trajectory = None
+        return update
+
+    def to_message(self, remove_trajectory: bool = True) -> dict[str, Any]:
+        """get the update message, optionally without the trajectory
+
+        Args:
+            remove_trajectory (bool, optional): Delete trajectory data? Defaults to True.
+
+        Returns:
+            dict[str, Any]: update message, shares its values with the received one
+        """
+        last_move = self.last_move
+        if last_move is None:
+            return self._message
+        trajectory = None if remove_trajectory else last_move.trajectory_message()
+        return dict(
+            self._message,
+            last_move=dict(self._message["last_move"], trajectory=trajectory),
+        )
+
+
+def parse_lazy_update(
+    message_recv: dict[str, Any],
+    compact: bool = False,
+    raw: bytes | None = None,
+    codec: JSONCodec = default_codec,
+    columnar: bool = False,
+) -> LazyUpdate | None:
+    """Wrap update message in LazyUpdate
+
+    Args:
+        message_recv (dict[str, Any]): update message
+        compact (bool, optional): Build the compact models on access. Defaults to False.
+        raw (bytes | None, optional): Message as received, to decode the trajectory from. Defaults to None.
+        codec (JSONCodec, optional): JSON codec that decodes raw. Defaults to the fastest installed codec.
+        columnar (bool, optional): Build ColumnarTrajectory on access. Defaults to False.
+
+    Returns:
+        LazyUpdate | None: match information, None if the message is not an update
+    """
+    if message_recv["cmd"] != "update":
+        return None
+    return LazyUpdate(message_recv, compact, raw, codec, columnar)
@@ -0,0 +1,155 @@
+"""Streaming reader of .dcl2 server logs.
+
+A .dcl2 log holds one JSON record per line, with the message exchanged with the
+server under "log"::
+
+    {"ver":[1,1],"tag":"gam","id":31,"date_time":"...","thread":"...","log":{"cmd":"dc",...}}
+
+``read_dcl2`` yields the records one line at a time, from plain or gzip logs,
+so memory stays constant however long the log is. ``iter_events`` builds on it
+and turns the dc, is_ready, new_game, update and move messages into the same
+data classes as SocketClient, with the parsers of dc3client.protocol::
+
+    for event in iter_events("game.dcl2.gz", commands=("update",)):
+        print(event.data.state.end, event.data.state.shot)
+
+Journals written by dc3client.journal.RawJournal share the layout and are read
+the same way.
+"""
+
+import gzip
+from dataclasses import dataclass
+from os import PathLike
+from typing import Any, Callable, Container, Iterator
+
+from dc3client.codec import JSONCodec, default_codec
+from dc3client.models import (
+    ActualMove,
+    Concede,
+    IsReady,
+    NewGame,
+    ServerDC,
+    Update,
+)
+from dc3client.protocol import (
+    apply_trajectory_policy,
+    parse_actual_move,
+    parse_dc,
+    parse_is_ready,
+    parse_new_game,
+    parse_update,
+)
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+EventData = ServerDC | IsReady | NewGame | Update | ActualMove | Concede | None
+
+
+@dataclass(slots=True)
+class LogEvent:
+    """One record of a .dcl2 log"""
+
+    id: int | None
+    tag: str | None
+    date_time: str | None
+    cmd: str
+    team: str | None
+    data: EventData
+    message: dict[str, Any]
+
+
+def read_dcl2(
+    path: str | PathLike, codec: JSONCodec | None = None
+) -> Iterator[dict[str, Any]]:
+    """read the records of a .dcl2 server log one line at a time
+
+    Gzip logs are detected from their content, and one cut short is read up to
+    its last complete line.
+
+    Args:
+        path (str | PathLike): .dcl2 log, plain or gzip
+        codec (JSONCodec | None, optional): JSON codec of the lines. Defaults to the fastest installed codec.
+
+    Yields:
+        dict[str, Any]: record with "date_time" and "log"
+    """
+    codec = codec or default_codec
+    with open(path, "rb") as raw:
+        compressed = raw.read(2) == _GZIP_MAGIC
+        raw.seek(0)
+        f = gzip.GzipFile(fileobj=raw, mode="rb") if compressed else raw
+        try:
+            for line in f:
+                if line.startswith(b"#") or not line.strip():
+                    continue
+                yield codec.loads(line)
+        except EOFError:
+            return  # truncated gzip stream
+
+
+# Data class of each command, the other commands have none
+PARSERS: dict[str, Callable[[dict[str, Any], bool], EventData]] = {
+    "dc": lambda message, columnar: parse_dc(message),
+    "is_ready": lambda message, columnar: parse_is_ready(message),
+    "new_game": lambda message, columnar: parse_new_game(message),
+    "update": lambda message, columnar: parse_update(message, columnar),
+    "move": lambda message, columnar: parse_actual_move(message["move"]),
+}
+
+
+def parse_record(
+    record: dict[str, Any], columnar: bool = False, trajectory: str = "full"
+) -> LogEvent:
+    """Convert a .dcl2 record to an event
+
+    Args:
+        record (dict[str, Any]): record read by read_dcl2()
+        columnar (bool, optional): Build ColumnarTrajectory instead of Trajectory. Defaults to False.
+        trajectory (str, optional): "full", "endpoints" or "drop", see apply_trajectory_policy(). Defaults to "full".
+
+    Returns:
+        LogEvent: event, its data is None for the messages without a data class (meta, dc_ok, game_over, ...)
+    """
+    message = record["log"]
+    cmd = message["cmd"]
+    parser = PARSERS.get(cmd)
+    if parser is None:
+        data = None
+    else:
+        if cmd == "update":
+            apply_trajectory_policy(message, trajectory)
+        data = parser(message, columnar)
+    return LogEvent(
+        id=record.get("id"),
+        tag=record.get("tag"),
+        date_time=record.get("date_time"),
+        cmd=cmd,
+        team=message.get("team"),
+        data=data,
+        message=message,
+    )
+
+
+def iter_events(
+    path: str | PathLike,
+    commands: Container[str] | None = None,
+    columnar: bool = False,
+    trajectory: str = "full",
+    codec: JSONCodec | None = None,
+) -> Iterator[LogEvent]:
+    """read the events of a .dcl2 server log one line at a time
+
+    Args:
+        path (str | PathLike): .dcl2 log, plain or gzip
+        commands (Container[str] | None, optional): Commands to yield, the others are skipped without parsing. Defaults to None, every command.
+        columnar (bool, optional): Build ColumnarTrajectory instead of Trajectory. Defaults to False.
+        trajectory (str, optional): "full", "endpoints" or "drop", see apply_trajectory_policy(). Defaults to "full".
+        codec (JSONCodec | None, optional): JSON codec of the lines. Defaults to the fastest installed codec.
+
+    Yields:
+        LogEvent: event, in the order of the log
+    """
+    for record in read_dcl2(path, codec):
+        if commands is not None and record["log"]["cmd"] not in commands:
+            continue
+        yield parse_record(record, columnar, trajectory)
@@ -1,6 +1,9 @@
 import enum
 from dataclasses import dataclass, field
 
+from dc3client.board import Board, board_from_stones
+from dc3client.trajectory import ColumnarTrajectory
+
 
 class StoneRotation(str, enum.Enum):
     """Stone Rotation Direction"""
@@ -11,7 +14,7 @@ class StoneRotation(str, enum.Enum):
     outturn = "ccw"
 
 
-@dataclass
+@dataclass(slots=True)
 class Version:
     """Version Info"""
 
@@ -19,7 +22,7 @@ class Version:
     minor: int
 
 
-@dataclass
+@dataclass(slots=True)
 class ServerDC:
     """Server Info"""
 
@@ -29,7 +32,7 @@ class ServerDC:
     version: Version
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayerInfo:
     """
     Maximum velocity of the stone and standard deviation of normally distributed random numbers
@@ -40,10 +43,10 @@ class PlayerInfo:
     seed: None
     stddev_angle: float
     stddev_speed: float
-    randomness: str
+    randomness: str = field(metadata={"name": "type"})
 
 
-@dataclass
+@dataclass(slots=True)
 class Players:
     """Pool of players per team"""
 
@@ -51,7 +54,7 @@ class Players:
     team1: list[PlayerInfo]
 
 
-@dataclass
+@dataclass(slots=True)
 class ThinkingTime:
     """Thinking time not including ExtraEnd"""
 
@@ -59,7 +62,7 @@ class ThinkingTime:
     team1: float
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtraEndThinkingTime:
     """Thinking time per end of ExtraEnd"""
 
@@ -67,7 +70,7 @@ class ExtraEndThinkingTime:
     team1: float
 
 
-@dataclass
+@dataclass(slots=True)
 class Setting:
     """Match Setting"""
 
@@ -78,15 +81,15 @@ class Setting:
     thinking_time: ThinkingTime
 
 
-@dataclass
+@dataclass(slots=True)
 class Simulator:
     """Simulator Settings"""
 
     seconds_per_frame: float
-    simulator_type: str
+    simulator_type: str = field(metadata={"name": "type"})
 
 
-@dataclass
+@dataclass(slots=True)
 class GameRule:
     """Game Rule"""
 
@@ -96,7 +99,7 @@ class GameRule:
     simulator: Simulator
 
 
-@dataclass
+@dataclass(slots=True)
 class IsReady:
     """Match settings"""
 
@@ -105,7 +108,7 @@ class IsReady:
     game: GameRule
 
 
-@dataclass
+@dataclass(slots=True)
 class NewGame:
     """Signal for the start of the match"""
 
@@ -113,7 +116,7 @@ class NewGame:
     name: dict
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtraEndScore:
     """ExtraEnd Score"""
 
@@ -121,7 +124,7 @@ class ExtraEndScore:
     team1: int
 
 
-@dataclass
+@dataclass(slots=True)
 class GameResult:
     """Game Result"""
 
@@ -129,7 +132,7 @@ class GameResult:
     reason: str | None
 
 
-@dataclass
+@dataclass(slots=True)
 class Scores:
     """Scores"""
 
@@ -137,7 +140,7 @@ class Scores:
     team1: list
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """Stone Position"""
 
@@ -145,7 +148,7 @@ class Position:
     y: float | None
 
 
-@dataclass
+@dataclass(slots=True)
 class Coordinate:
     """Position and Angle"""
 
@@ -153,7 +156,7 @@ class Coordinate:
     position: list[Position]
 
 
-@dataclass
+@dataclass(slots=True)
 class Stones:
     """Stone Positions of each team"""
 
@@ -161,7 +164,7 @@ class Stones:
     team1: list[Coordinate]
 
 
-@dataclass
+@dataclass(slots=True)
 class ThinkingTimeRemaining:
     """Thinking time remaining"""
 
@@ -169,7 +172,7 @@ class ThinkingTimeRemaining:
     team1: float
 
 
-@dataclass
+@dataclass(slots=True)
 class State:
     """Match State"""
 
@@ -181,9 +184,17 @@ class State:
     shot: int
     stones: Stones
     thinking_time_remaining: ThinkingTimeRemaining
+    _board: Board | None = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def board(self) -> Board:
+        """NumPy view of the stones, built on first access"""
+        if self._board is None:
+            self._board = board_from_stones(self.stones)
+        return self._board
 
 
-@dataclass
+@dataclass(slots=True)
 class Velocity:
     """Velocity"""
 
@@ -191,7 +202,7 @@ class Velocity:
     y: float | None
 
 
-@dataclass
+@dataclass(slots=True)
 class ActualMove:
     """Actual Move"""
 
@@ -200,14 +211,14 @@ class ActualMove:
     velocity: Velocity
 
 
-@dataclass
+@dataclass(slots=True)
 class Concede:
     """Concede"""
 
     type: str = "concede"
 
 
-@dataclass
+@dataclass(slots=True)
 class Start:
     """Stone placement at the start of the shot"""
 
@@ -215,7 +226,7 @@ class Start:
     team1: list[Coordinate]
 
 
-@dataclass
+@dataclass(slots=True)
 class Finish:
     """Stone placement at end of shot"""
 
@@ -223,7 +234,7 @@ class Finish:
     team1: list[Coordinate]
 
 
-@dataclass
+@dataclass(slots=True)
 class Frame:
     """
     The position and angle of the stones at each time interval, denoted by seconds_per_frame.
@@ -235,33 +246,35 @@ class Frame:
     value: Coordinate | None
 
 
-@dataclass
+@dataclass(slots=True)
 class FrameArray:
     """Frame Array"""
 
     array: Frame | None
 
 
-@dataclass
+@dataclass(slots=True)
 class Trajectory:
     """Trajectory of each stone"""
 
     seconds_per_frame: float | None
     start: Start
     finish: Finish
-    frames: list[FrameArray] | None
+    # one list per simulation step, with the stones that moved in the step,
+    # earlier versions kept every frame in one flat list
+    frames: list[list[Frame]] | None
 
 
-@dataclass
+@dataclass(slots=True)
 class LastMove:
     """Results of previous shot"""
 
     actual_move: ActualMove | Concede
     free_guard_zone_foul: bool
-    trajectory: Trajectory | None
+    trajectory: Trajectory | ColumnarTrajectory | None
 
 
-@dataclass
+@dataclass(slots=True)
 class Update:
     """Match information on each shot"""
 
@@ -271,7 +284,7 @@ class Update:
     last_move: LastMove | None
 
 
-@dataclass
+@dataclass(slots=True)
 class MatchData:
     """Match Data"""
 
@@ -281,7 +294,7 @@ class MatchData:
     update_list: list[Update] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ShotInfo:
     """Shot Info"""
 
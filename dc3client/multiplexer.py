@@ -0,0 +1,233 @@
+import logging
+import selectors
+from collections import deque
+from typing import Callable
+
+from dc3client.dc3client import SocketClient
+from dc3client.models import Update
+from dc3client.ratelimit import TokenBucket
+
+
+class _Outbox:
+    """Send queue of a multiplexed client, drained by the selector loop"""
+
+    def __init__(self, limiter: TokenBucket) -> None:
+        self.limiter = limiter
+        self.messages: deque[bytes] = deque()
+        self.partial: memoryview | None = None
+
+    def __bool__(self) -> bool:
+        return self.partial is not None or bool(self.messages)
+
+    def put(self, data: bytes) -> None:
+        self.messages.append(data)
+
+    def join(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.messages.clear()
+        self.partial = None
+
+
+class _Match:
+    """State of one multiplexed connection"""
+
+    def __init__(
+        self,
+        client: SocketClient,
+        on_update: Callable[[SocketClient, Update], None],
+        on_ready: Callable[[SocketClient], None] | None,
+        player_order: list,
+    ) -> None:
+        self.client = client
+        self.on_update = on_update
+        self.on_ready = on_ready
+        self.player_order = player_order
+        self.outbox = _Outbox(client.limiter)
+        self.events = selectors.EVENT_READ
+
+
+class MatchMultiplexer:
+    """Drive many SocketClient connections from one selectors event loop
+
+    Each match is a SocketClient created with ``auto_start=False``. The multiplexer
+    answers dc and is_ready by itself, and calls ``on_update(client, update)`` for
+    every update of that match. Calls to ``client.move()`` inside the callback are
+    queued and sent by the loop as soon as the rate limit of that client allows.
+
+    A finished match releases its connection but keeps the update history of
+    its client readable, call ``client.close()`` once it is no longer needed.
+    """
+
+    def __init__(self, log_level: int = logging.INFO) -> None:
+        """initialize multiplexer
+
+        Args:
+            log_level (int, optional): Minimum level of logging. Defaults to logging.INFO.
+        """
+        self.selector = selectors.DefaultSelector()
+        self.finished: list[SocketClient] = []
+
+        self.logger = logging.getLogger("socket_client")
+        self.logger.setLevel(log_level)
+
+    def __len__(self) -> int:
+        """number of matches still running"""
+        return len(self.selector.get_map())
+
+    def add(
+        self,
+        client: SocketClient,
+        on_update: Callable[[SocketClient, Update], None],
+        on_ready: Callable[[SocketClient], None] | None = None,
+        player_order: list = [0, 1, 2, 3],
+    ) -> SocketClient:
+        """connect a client and register it to the event loop
+
+        Args:
+            client (SocketClient): Client created with auto_start=False.
+            on_update (Callable[[SocketClient, Update], None]): Called for every update of this match.
+            on_ready (Callable[[SocketClient], None] | None, optional): Called after is_ready, before ready_ok. Defaults to None.
+            player_order (list, optional): Order of the players sent with ready_ok. Defaults to [0, 1, 2, 3].
+
+        Returns:
+            SocketClient: the registered client
+        """
+        if client.socket is not None:
+            raise Exception("Client is already connected")
+
+        client.use_send_queue = False
+        client._connect(client.server)
+        client.socket.setblocking(False)  # type: ignore
+
+        match = _Match(client, on_update, on_ready, player_order)
+        client.send_queue = match.outbox  # type: ignore
+        self.selector.register(client.socket, match.events, match)  # type: ignore
+        return client
+
+    def run(self, timeout: float | None = None) -> list[SocketClient]:
+        """run until every match is over
+
+        Args:
+            timeout (float | None, optional): Maximum time to wait for one event. Defaults to None.
+
+        Returns:
+            list[SocketClient]: clients of the finished matches
+        """
+        while len(self) > 0:
+            self.poll(timeout)
+        return self.finished
+
+    def poll(self, timeout: float | None = None) -> None:
+        """wait for events once and process them
+
+        Args:
+            timeout (float | None, optional): Maximum time to wait. Defaults to None.
+        """
+        for key, mask in self.selector.select(self._next_timeout(timeout)):
+            match: _Match = key.data
+            if mask & selectors.EVENT_READ:
+                self._receive(match)
+            if mask & selectors.EVENT_WRITE and match.client.socket is not None:
+                self._flush(match)
+
+        for key in list(self.selector.get_map().values()):
+            if key.data.outbox:
+                self._flush(key.data)
+
+    def _next_timeout(self, timeout: float | None) -> float | None:
+        """time until the earliest queued message may be sent"""
+        for key in self.selector.get_map().values():
+            match: _Match = key.data
+            if match.outbox and match.outbox.partial is None:
+                delay = match.client.limiter.delay()
+                timeout = delay if timeout is None else min(timeout, delay)
+        return timeout
+
+    def _receive(self, match: _Match) -> None:
+        client = match.client
+        try:
+            nbytes = client.framer.fill(client.socket)  # type: ignore
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self.logger.error(f"Receive failed {e}")
+            nbytes = 0
+
+        if nbytes == 0:
+            self.logger.error(f"Connection to {client.server} closed by server")
+            self._finish(match)
+            return
+
+        while (message := client.framer.next_message()) is not None:
+            if client.journal is not None:
+                client.journal.received(message)
+            self._dispatch(match, client.codec.loads(message), message)
+            if client.socket is None:
+                return
+
+    def _dispatch(self, match: _Match, message_recv: dict, raw: bytes) -> None:
+        client = match.client
+        cmd = message_recv["cmd"]
+
+        if cmd == "dc":
+            client._handle_dc(message_recv)
+            client.dc_ok()
+
+        elif cmd == "is_ready":
+            client._handle_is_ready(message_recv)
+            if match.on_ready is not None:
+                match.on_ready(client)
+            client.ready_ok(match.player_order)
+
+        elif cmd == "new_game":
+            client._handle_new_game(message_recv)
+
+        elif cmd == "update":
+            update = client._handle_update(message_recv, raw)
+            match.on_update(client, update)  # type: ignore
+            if update.state.game_result.winner is not None:  # type: ignore
+                self._flush(match)
+                self._finish(match)
+
+        else:
+            self.logger.debug(f"Ignore message : {cmd}")
+
+    def _flush(self, match: _Match) -> None:
+        """send queued messages that the rate limit allows"""
+        outbox = match.outbox
+        sock = match.client.socket
+        while outbox:
+            if outbox.partial is None:
+                if not outbox.limiter.try_acquire():
+                    break
+                outbox.partial = memoryview(outbox.messages.popleft())
+            try:
+                nbytes = sock.send(outbox.partial)  # type: ignore
+            except BlockingIOError:
+                nbytes = 0
+            outbox.partial = outbox.partial[nbytes:]
+            if len(outbox.partial) > 0:
+                break
+            outbox.partial = None
+
+        events = selectors.EVENT_READ
+        if outbox.partial is not None:
+            events |= selectors.EVENT_WRITE
+        if events != match.events:
+            match.events = events
+            self.selector.modify(sock, events, match)  # type: ignore
+
+    def _finish(self, match: _Match) -> None:
+        client = match.client
+        self.selector.unregister(client.socket)  # type: ignore
+        match.outbox.close()
+        client.send_queue = None
+        try:
+            client.socket.setblocking(True)  # type: ignore
+        except OSError:
+            pass
+        # the history of the finished match stays readable until the user closes it
+        client.close(history=False)
+        self.finished.append(client)
@@ -0,0 +1,103 @@
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+from dc3client.models import State
+
+# search(state, stop_event) -> result, returns its partial result once stop_event is set
+SearchFunction = Callable[[State, Any], Any]
+
+
+class Ponderer:
+    """Run a search on the opponent's turn and hand over its result
+
+    The search function is called as ``search(state, stop_event)`` on a worker
+    thread, or on a worker process with ``use_process=True``. It should check
+    ``stop_event.is_set()`` regularly and return whatever it has built so far
+    (a cache, a tree, ...), which becomes available through ``stop()``.
+    """
+
+    def __init__(
+        self,
+        search: SearchFunction,
+        use_process: bool = False,
+        stop_timeout: float | None = None,
+    ) -> None:
+        """initialize ponderer
+
+        Args:
+            search (SearchFunction): Function called as search(state, stop_event).
+            use_process (bool, optional): Run on a worker process instead of a thread. The search function, state and result must be picklable. Defaults to False.
+            stop_timeout (float | None, optional): Maximum time to wait for the search to return after stop. Defaults to None.
+        """
+        self.search = search
+        self.use_process = use_process
+        self.stop_timeout = stop_timeout
+
+        self.logger = logging.getLogger("socket_client")
+
+        self._executor: ThreadPoolExecutor | ProcessPoolExecutor | None = None
+        self._manager = None
+        self._future: Future | None = None
+        self._stop_event: Any = None
+
+    @property
+    def running(self) -> bool:
+        """whether a search has been started and not stopped yet"""
+        return self._future is not None
+
+    def _ensure_executor(self) -> None:
+        if self._executor is not None:
+            return
+        if self.use_process:
+            self._manager = multiprocessing.Manager()
+            self._executor = ProcessPoolExecutor(max_workers=1)
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="dc3client-ponder"
+            )
+
+    def start(self, state: State) -> None:
+        """start searching on the given state
+
+        Args:
+            state (State): State while the opponent is thinking.
+        """
+        if self._future is not None:
+            self.stop()
+        self._ensure_executor()
+        if self.use_process:
+            self._stop_event = self._manager.Event()  # type: ignore
+        else:
+            self._stop_event = threading.Event()
+        self._future = self._executor.submit(  # type: ignore
+            self.search, state, self._stop_event
+        )
+
+    def stop(self) -> Any:
+        """signal the search to stop and collect its result
+
+        Returns:
+            Any: result of the search, None if it failed or did not stop in time
+        """
+        if self._future is None:
+            return None
+        future, self._future = self._future, None
+        self._stop_event.set()
+        try:
+            return future.result(timeout=self.stop_timeout)
+        except Exception as e:
+            self.logger.error(f"Ponder failed {e!r}")
+            return None
+
+    def close(self) -> None:
+        """stop the search and shut down the worker"""
+        self.stop()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
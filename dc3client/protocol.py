@@ -0,0 +1,244 @@
+"""Parsers and encoders for the Digital Curling 3 protocol messages.
+
+These functions are shared by every client implementation so that the
+blocking, asyncio and multiplexed clients build identical data classes.
+"""
+
+from typing import Any
+
+from dc3client.codec import JSONCodec, default_codec
+from dc3client.models import (
+    Coordinate,
+    IsReady,
+    LastMove,
+    NewGame,
+    ServerDC,
+    State,
+    StoneRotation,
+    Update,
+)
+from dc3client.serialize import (
+    decode_actual_move,
+    decode_frame,
+    decode_trajectory,
+    decoder,
+)
+from dc3client.trajectory import parse_columnar_trajectory
+
+# How much of the trajectory of an update is kept, see apply_trajectory_policy()
+TRAJECTORY_POLICIES = ("full", "endpoints", "drop")
+
+
+def parse_stones(message_recv: list) -> list[Coordinate]:
+    """Convert stone positions to data class
+
+    Args:
+        message_recv (list): List of stone positions
+
+    Returns:
+        list[Coordinate]: List of data classes for stone positions
+    """
+    decode = decoder(Coordinate)
+    return [decode(data) for data in message_recv]
+
+
+def parse_dc(message_recv: dict[str, Any]) -> ServerDC:
+    """Convert dc message to data class
+
+    Args:
+        message_recv (dict[str, Any]): dc message
+
+    Returns:
+        ServerDC: server info
+    """
+    return decoder(ServerDC)(message_recv)
+
+
+def parse_is_ready(message_recv: dict[str, Any]) -> IsReady:
+    """Convert is_ready message to data class
+
+    Args:
+        message_recv (dict[str, Any]): is_ready message
+
+    Returns:
+        IsReady: match settings
+    """
+    return decoder(IsReady)(message_recv)
+
+
+def parse_new_game(message_recv: dict[str, Any]) -> NewGame:
+    """Convert new_game message to data class
+
+    Args:
+        message_recv (dict[str, Any]): new_game message
+
+    Returns:
+        NewGame: signal for the start of the match
+    """
+    return decoder(NewGame)(message_recv)
+
+
+def parse_state(state_recv: dict[str, Any]) -> State:
+    """Convert the state of an update message to data class
+
+    Args:
+        state_recv (dict[str, Any]): "state" of the update message
+
+    Returns:
+        State: match state
+    """
+    return decoder(State)(state_recv)
+
+
+# The conversions the generated decoders share with the compact and lazy models
+parse_actual_move = decode_actual_move
+parse_trajectory = decode_trajectory
+parse_frame = decode_frame
+
+
+def parse_last_move(
+    last_move_recv: dict[str, Any] | None, columnar: bool = False
+) -> LastMove | None:
+    """Convert the last move of an update message to data class
+
+    Args:
+        last_move_recv (dict[str, Any] | None): "last_move" of the update message
+        columnar (bool, optional): Build ColumnarTrajectory instead of Trajectory. Defaults to False.
+
+    Returns:
+        LastMove | None: results of previous shot, None before the first shot
+    """
+    if last_move_recv is None:
+        return None
+    if not columnar:
+        return decoder(LastMove)(last_move_recv)
+
+    return LastMove(
+        actual_move=parse_actual_move(last_move_recv["actual_move"]),
+        free_guard_zone_foul=last_move_recv["free_guard_zone_foul"],
+        trajectory=parse_columnar_trajectory(last_move_recv.get("trajectory")),
+    )
+
+
+def apply_trajectory_policy(
+    message_recv: dict[str, Any], policy: str = "full"
+) -> dict[str, Any]:
+    """Reduce the trajectory of an update message in place before it is parsed
+
+    "full" keeps the trajectory, "endpoints" keeps its start and finish without
+    frames, and "drop" removes it, so that no frame is ever built. Every model
+    (Update, CompactUpdate, LazyUpdate, with or without columnar trajectories)
+    then has ``last_move.trajectory`` None after "drop", the same as for an
+    update that came without a trajectory, and a trajectory with empty frames
+    after "endpoints".
+
+    Args:
+        message_recv (dict[str, Any]): update message
+        policy (str, optional): "full", "endpoints" or "drop". Defaults to "full".
+
+    Returns:
+        dict[str, Any]: the same message
+    """
+    if policy == "full" or message_recv.get("cmd") != "update":
+        return message_recv
+    last_move = message_recv.get("last_move")
+    if last_move is None or last_move.get("trajectory") is None:
+        return message_recv
+
+    if policy == "drop":
+        last_move["trajectory"] = None
+    elif policy == "endpoints":
+        last_move["trajectory"] = dict(last_move["trajectory"], frames=[])
+    else:
+        raise ValueError(f"Unknown trajectory policy : {policy}")
+    return message_recv
+
+
+def parse_update(message_recv: dict[str, Any], columnar: bool = False) -> Update | None:
+    """Convert update message to data class
+
+    Args:
+        message_recv (dict[str, Any]): update message
+        columnar (bool, optional): Build ColumnarTrajectory instead of Trajectory. Defaults to False.
+
+    Returns:
+        Update | None: match information, None if the message is not an update
+    """
+    if message_recv["cmd"] != "update":
+        return None
+
+    if not columnar:
+        return decoder(Update)(message_recv)
+
+    return Update(
+        cmd=message_recv["cmd"],
+        last_move=parse_last_move(message_recv["last_move"], columnar),
+        next_team=message_recv["next_team"],
+        state=parse_state(message_recv["state"]),
+    )
+
+
+def encode_dc_ok(client_name: str, codec: JSONCodec = default_codec) -> bytes:
+    """Build dc_ok message
+
+    Args:
+        client_name (str): Identification name of the client
+        codec (JSONCodec, optional): JSON codec. Defaults to the fastest installed codec.
+
+    Returns:
+        bytes: newline terminated message
+    """
+    message: dict = {"cmd": "dc_ok", "name": client_name}
+    return codec.dumps(message) + b"\n"
+
+
+def encode_ready_ok(player_order: list, codec: JSONCodec = default_codec) -> bytes:
+    """Build ready_ok message
+
+    Args:
+        player_order (list): Order of the players
+        codec (JSONCodec, optional): JSON codec. Defaults to the fastest installed codec.
+
+    Returns:
+        bytes: newline terminated message
+    """
+    ready = {"cmd": "ready_ok", "player_order": player_order}
+    return codec.dumps(ready) + b"\n"
+
+
+def encode_move(
+    x: float, y: float, rotation: StoneRotation, codec: JSONCodec = default_codec
+) -> bytes:
+    """Build move message
+
+    Args:
+        x (float): Velocity in x-axis direction.
+        y (float): Velocity in y-axis direction.
+        rotation (StoneRotation): Rotation of stone.
+        codec (JSONCodec, optional): JSON codec. Defaults to the fastest installed codec.
+
+    Returns:
+        bytes: newline terminated message
+    """
+    shot = {
+        "cmd": "move",
+        "move": {
+            "type": "shot",
+            "velocity": {"x": x, "y": y},
+            "rotation": rotation,
+        },
+    }
+    return codec.dumps(shot) + b"\n"
+
+
+def encode_concede(codec: JSONCodec = default_codec) -> bytes:
+    """Build concede message
+
+    Args:
+        codec (JSONCodec, optional): JSON codec. Defaults to the fastest installed codec.
+
+    Returns:
+        bytes: newline terminated message
+    """
+    concede = {"cmd": "move", "move": {"type": "concede"}}
+    return codec.dumps(concede) + b"\n"
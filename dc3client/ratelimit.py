@@ -0,0 +1,150 @@
+import logging
+import queue
+import threading
+import time
+from typing import Callable
+
+
+class TokenBucket:
+    """Token bucket on the monotonic clock
+
+    One token is added every ``interval`` seconds, up to ``capacity`` tokens.
+    Callers reserve a token first and then sleep for exactly the time until that
+    token becomes available, so concurrent senders never wait longer than needed.
+    """
+
+    def __init__(self, interval: float, capacity: int = 1) -> None:
+        """initialize token bucket
+
+        Args:
+            interval (float): Minimum time interval between two sends in seconds.
+            capacity (int, optional): Maximum number of sends in a burst. Defaults to 1.
+        """
+        self.interval = interval
+        self.capacity = capacity
+
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if self.interval <= 0.0:
+            self._tokens = float(self.capacity)
+        else:
+            self._tokens = min(
+                float(self.capacity),
+                self._tokens + (now - self._updated) / self.interval,
+            )
+        self._updated = now
+
+    def delay(self) -> float:
+        """seconds until the next token is available
+
+        Returns:
+            float: 0.0 if a send is allowed now
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            return max(0.0, (1.0 - self._tokens) * self.interval)
+
+    def try_acquire(self) -> bool:
+        """take a token without waiting
+
+        Returns:
+            bool: True if a token was taken
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+    def reserve(self) -> float:
+        """take a token that may become available in the future
+
+        Returns:
+            float: seconds the caller has to wait before sending
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1.0
+            return max(0.0, -self._tokens * self.interval)
+
+    def acquire(self) -> float:
+        """take a token, sleeping exactly until it is available
+
+        Returns:
+            float: seconds slept
+        """
+        if (wait_time := self.reserve()) > 0.0:
+            time.sleep(wait_time)
+        return wait_time
+
+
+class SendQueue:
+    """Non-blocking send queue drained by a writer thread under a rate limit"""
+
+    def __init__(
+        self,
+        send: Callable[[bytes], None],
+        limiter: TokenBucket,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        """initialize send queue and start the writer thread
+
+        Args:
+            send (Callable[[bytes], None]): Function that writes one message to the socket.
+            limiter (TokenBucket): Rate limit shared with the owner of the socket.
+            logger (logging.Logger | None, optional): Logger for send errors. Defaults to None.
+        """
+        self._send = send
+        self.limiter = limiter
+        self.logger = logger or logging.getLogger("socket_client")
+
+        self._queue: queue.Queue[bytes | None] = queue.Queue()
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(
+            target=self._run, name="dc3client-send-queue", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            data = self._queue.get()
+            try:
+                if data is None:
+                    return
+                if self._error is None:
+                    self.limiter.acquire()
+                    self._send(data)
+            except BaseException as e:
+                self.logger.error(f"Send failed {e}")
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def put(self, data: bytes) -> None:
+        """queue one message and return immediately
+
+        Args:
+            data (bytes): newline terminated message
+
+        Raises:
+            ConnectionError: if a previous send failed
+        """
+        if self._error is not None:
+            raise ConnectionError("Previous send failed") from self._error
+        if not self._thread.is_alive():
+            raise ConnectionError("Send queue is closed")
+        self._queue.put(data)
+
+    def join(self) -> None:
+        """wait until every queued message has been sent"""
+        self._queue.join()
+
+    def close(self) -> None:
+        """send the queued messages and stop the writer thread"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
@@ -0,0 +1,147 @@
+"""Match recorder that streams every message to an NDJSON file as it arrives.
+
+``MatchRecorder`` writes one JSON line per dc, is_ready, new_game and update on
+a background thread, in the layout of the server messages, so that they can be
+parsed again with the functions of dc3client.protocol. The client only queues
+the received models, and converting, encoding and compressing them happens off
+the game loop. The file is flushed whenever the queue runs empty, so a crash in
+the middle of a match loses at most the messages still queued.
+"""
+
+import gzip
+import logging
+import pathlib
+import queue
+import threading
+from os import PathLike
+from typing import Any, Callable, Iterator
+
+from dc3client.codec import JSONCodec, default_codec
+
+# A message dict, or a function that builds it on the writer thread
+Record = dict[str, Any] | Callable[[], dict[str, Any]]
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_CLOSE: Any = object()
+
+
+class MatchRecorder:
+    """Write the messages of a match to an NDJSON file on a background thread"""
+
+    def __init__(
+        self,
+        path: str | PathLike,
+        remove_trajectory: bool = True,
+        compress: bool | None = None,
+        codec: JSONCodec | None = None,
+        buffer_size: int = 2**16,
+    ) -> None:
+        """initialize match recorder, the file is created or truncated right away
+
+        Args:
+            path (str | PathLike): Output file, its directory is created if missing.
+            remove_trajectory (bool, optional): Delete trajectory data from the recorded updates? Defaults to True.
+            compress (bool | None, optional): Write gzip. Defaults to None, compress when path ends with ".gz".
+            codec (JSONCodec | None, optional): JSON codec of the lines. Defaults to the fastest installed codec.
+            buffer_size (int, optional): Size of the write buffer in bytes. Defaults to 64 KiB.
+        """
+        self.path = pathlib.Path(path)
+        self.remove_trajectory = remove_trajectory
+        self.compress = self.path.suffix == ".gz" if compress is None else compress
+        self.codec = codec or default_codec
+
+        self.logger = logging.getLogger("socket_client")
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._raw = open(self.path, "wb", buffering=buffer_size)
+        self._file = (
+            gzip.GzipFile(fileobj=self._raw, mode="wb") if self.compress else self._raw
+        )
+
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="dc3client-recorder", daemon=True
+        )
+        self._thread.start()
+
+    def __repr__(self) -> str:
+        return f"MatchRecorder(path={self.path}, compress={self.compress})"
+
+    def __enter__(self) -> "MatchRecorder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        """whether close() has been called"""
+        return self._closed
+
+    def record(self, message: Record) -> None:
+        """queue one message, returns without waiting for the write
+
+        Args:
+            message (Record): Message dict, or a function called on the writer thread that returns it.
+        """
+        if self._closed:
+            raise ValueError(f"recorder of {self.path} is closed")
+        self._queue.put(message)
+
+    def flush(self) -> None:
+        """wait until every queued message is written to the file"""
+        self._queue.join()
+
+    def close(self) -> None:
+        """write the queued messages and close the file"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_CLOSE)
+        self._thread.join()
+        if self._file is not self._raw:
+            self._file.close()
+        self._raw.close()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _CLOSE:
+                    return
+                message = item() if callable(item) else item
+                self._file.write(self.codec.dumps(message) + b"\n")
+                if self._queue.empty():
+                    self._file.flush()
+            except Exception:
+                self.logger.exception(f"Failed to record a message to {self.path}")
+            finally:
+                self._queue.task_done()
+
+
+def iter_records(
+    path: str | PathLike, codec: JSONCodec | None = None
+) -> Iterator[dict[str, Any]]:
+    """read back the messages of a recorded match
+
+    A gzip file cut short by a crash is read up to its last flush.
+
+    Args:
+        path (str | PathLike): File written by MatchRecorder, plain or gzip.
+        codec (JSONCodec | None, optional): JSON codec of the lines. Defaults to the fastest installed codec.
+
+    Yields:
+        dict[str, Any]: message, in the order received
+    """
+    codec = codec or default_codec
+    with open(path, "rb") as raw:
+        compressed = raw.read(2) == _GZIP_MAGIC
+        raw.seek(0)
+        f = gzip.GzipFile(fileobj=raw, mode="rb") if compressed else raw
+        try:
+            for line in f:
+                if line.strip():
+                    yield codec.loads(line)
+        except EOFError:
+            return  # truncated gzip stream
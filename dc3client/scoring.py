@@ -0,0 +1,119 @@
+"""Vectorised end scoring of many boards at once.
+
+``score_end`` scores a batch of stone layouts in one NumPy call: the team with
+the stone closest to the tee in the house scores one point for each of its
+stones in the house nearer to the tee than the opponent's closest stone::
+
+    team, points = score_end(candidates)  # candidates (N, 2, 8, 2), NaN out of play
+
+``end_scores`` applies it to the final board of every end of a recorded match,
+taken from the trajectory of the last shot, next to the scores reported by the
+server. Only logs that record trajectories have that board, the ends of other
+logs come out as unknown and are not compared.
+"""
+
+from os import PathLike
+from typing import Any
+
+import numpy as np
+
+from dc3client.archive import MOVE_SHOT, match_arrays
+from dc3client.board import SheetGeometry
+from dc3client.logs import read_dcl2
+
+
+def score_end(
+    positions: np.ndarray, geometry: SheetGeometry | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """Score the end for every board of a batch
+
+    Args:
+        positions (np.ndarray): (..., 2, 8, 2) x and y of the stones, or (..., 2, 8, 3) boards, NaN for stones not in play
+        geometry (SheetGeometry | None, optional): Geometry of the sheet. Defaults to the standard sheet.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (...,) scoring team index, -1 for a blank end, and (...,) points
+    """
+    g = geometry or SheetGeometry()
+    positions = np.asarray(positions, dtype=np.float64)
+    distance = np.hypot(positions[..., 0] - g.tee_x, positions[..., 1] - g.tee_y)
+    # stones out of play are NaN and fail the comparison
+    distance = np.where(distance <= g.house_radius + g.stone_radius, distance, np.inf)
+
+    closest = distance.min(axis=-1)
+    team = (closest[..., 1] < closest[..., 0]).astype(np.int8)
+    opponent_closest = np.take_along_axis(closest, 1 - team[..., None], axis=-1)
+    team_distance = np.take_along_axis(distance, team[..., None, None], axis=-2)
+    points = np.count_nonzero(team_distance[..., 0, :] < opponent_closest, axis=-1)
+    return np.where(points > 0, team, -1).astype(np.int8), points.astype(np.int8)
+
+
+def end_scores(
+    arrays: dict[str, np.ndarray], geometry: SheetGeometry | None = None
+) -> dict[str, np.ndarray]:
+    """Score the final board of every end of a match and read the reported scores
+
+    The final board of an end is the finish of the trajectory of its last shot,
+    so an end is only scored when that trajectory is recorded.
+
+    Args:
+        arrays (dict[str, np.ndarray]): match arrays of the match, see MatchArchive
+        geometry (SheetGeometry | None, optional): Geometry of the sheet. Defaults to the standard sheet.
+
+    Returns:
+        dict[str, np.ndarray]: per completed end (E,) "end", "known" (the final board is recorded),
+            "team" and "points" computed from the final board, "reported" (E, 2) scores of the server
+    """
+    end = arrays["end"].astype(np.int64)
+    # the update after the last shot of an end is the first one of the next end
+    last = np.flatnonzero(end[1:] != end[:-1]) + 1
+    finished = end[last - 1]
+    board = arrays["trajectory_finish"][last]
+
+    team, points = score_end(board, geometry)
+    # the extra ends are reported in extra_end_score, not per end
+    regular = finished < arrays["scores"].shape[2]
+    known = (
+        arrays["has_trajectory"][last]
+        & (arrays["move_type"][last] == MOVE_SHOT)
+        & regular
+    )
+    reported = np.full((len(last), 2), -1, dtype=np.int16)
+    reported[regular] = arrays["scores"][last[regular], :, finished[regular]]
+    return {
+        "end": finished,
+        "known": known,
+        "team": np.where(known, team, -1).astype(np.int8),
+        "points": np.where(known, points, 0).astype(np.int8),
+        "reported": reported,
+    }
+
+
+def check_dcl2_scores(
+    path: str | PathLike, geometry: SheetGeometry | None = None
+) -> dict[str, Any]:
+    """Compare the computed end scores with the scores of a .dcl2 log
+
+    Args:
+        path (str | PathLike): .dcl2 log with trajectories
+        geometry (SheetGeometry | None, optional): Geometry of the sheet. Defaults to the one of the log's is_ready.
+
+    Returns:
+        dict[str, Any]: end_scores() of the log, and "mismatch", the known ends whose computed points differ from the reported ones
+    """
+    updates = []
+    for record in read_dcl2(path):
+        message = record["log"]
+        if message["cmd"] == "update":
+            updates.append(message)
+        elif message["cmd"] == "is_ready" and geometry is None:
+            geometry = SheetGeometry.from_is_ready(message)
+    result: dict[str, Any] = end_scores(match_arrays(updates), geometry)
+
+    computed = np.zeros_like(result["reported"])
+    scored = result["team"] >= 0
+    computed[scored, result["team"][scored]] = result["points"][scored]
+    result["mismatch"] = result["end"][
+        result["known"] & np.any(computed != result["reported"], axis=1)
+    ]
+    return result
@@ -0,0 +1,379 @@
+"""Serializers and deserializers generated from the data classes in models.py.
+
+``encoder(cls)`` and ``decoder(cls)`` build, the first time a class is seen, one
+plain Python function that converts that class to and from its message dict,
+with every field access written out, and cache it. Nested data classes call
+their own generated functions, so converting an update costs one call per
+object instead of a ``dataclasses.fields()`` and ``getattr`` loop per field.
+
+The generated functions follow the wire layout of the server. A field is read
+from the key given by ``field(metadata={"name": ...})``, else its own name.
+The few places where the models differ from the messages are written by hand
+in _CLASS_CODECS and _FIELD_HOOKS below.
+"""
+
+import types
+import typing
+from dataclasses import fields, is_dataclass
+from typing import Any, Callable
+
+from dc3client.models import (
+    ActualMove,
+    Concede,
+    Coordinate,
+    Finish,
+    Frame,
+    GameResult,
+    LastMove,
+    PlayerInfo,
+    Position,
+    Start,
+    State,
+    Trajectory,
+)
+from dc3client.trajectory import (
+    ColumnarTrajectory,
+    columnar_trajectory_to_message,
+    parse_columnar_trajectory,
+)
+
+Encoder = Callable[[Any], dict[str, Any]]
+Decoder = Callable[[dict[str, Any]], Any]
+
+_ENCODERS: dict[type, Encoder] = {}
+_DECODERS: dict[type, Decoder] = {}
+
+# Field hook encoder of a field left out of the message, such as the board of
+# State that is derived from the stones
+SKIP: Any = object()
+
+
+def encoder(cls: type) -> Encoder:
+    """get the cached serializer of a data class
+
+    Args:
+        cls (type): data class in models.py
+
+    Returns:
+        Encoder: function that converts an instance to its message dict
+    """
+    try:
+        return _ENCODERS[cls]
+    except KeyError:
+        function = _ENCODERS[cls] = _generate_encoder(cls)
+        return function
+
+
+def decoder(cls: type) -> Decoder:
+    """get the cached deserializer of a data class
+
+    Args:
+        cls (type): data class in models.py
+
+    Returns:
+        Decoder: function that builds an instance from its message dict
+    """
+    try:
+        return _DECODERS[cls]
+    except KeyError:
+        function = _DECODERS[cls] = _generate_decoder(cls)
+        return function
+
+
+def to_dict(obj: Any) -> dict[str, Any]:
+    """Convert a data class to its message dict
+
+    Args:
+        obj (Any): instance of a data class in models.py
+
+    Returns:
+        dict[str, Any]: message dict in the wire layout
+    """
+    return encoder(type(obj))(obj)
+
+
+def from_dict(cls: type, message: dict[str, Any]) -> Any:
+    """Build a data class from its message dict
+
+    Args:
+        cls (type): data class in models.py
+        message (dict[str, Any]): message dict in the wire layout
+
+    Returns:
+        Any: instance of cls
+    """
+    return decoder(cls)(message)
+
+
+def wire_name(f: Any) -> str:
+    """key of a data class field in the message"""
+    return f.metadata.get("name", f.name)
+
+
+# Classes whose message is not a dict of their fields, such as the stones that
+# are None on the wire once removed: cls -> (encode, decode)
+
+
+def _encode_coordinate(coordinate: Coordinate) -> dict[str, Any] | None:
+    position = coordinate.position[0]
+    if coordinate.angle is None and position.x is None:
+        return None
+    return {"angle": coordinate.angle, "position": {"x": position.x, "y": position.y}}
+
+
+def _decode_coordinate(coordinate_recv: dict[str, Any] | None) -> Coordinate:
+    if coordinate_recv is None:
+        return Coordinate(angle=None, position=[Position(x=None, y=None)])
+    position = coordinate_recv["position"]
+    return Coordinate(
+        angle=coordinate_recv["angle"],
+        position=[Position(x=position["x"], y=position["y"])],
+    )
+
+
+_CLASS_CODECS: dict[type, tuple[Callable, Callable]] = {
+    Coordinate: (_encode_coordinate, _decode_coordinate),
+    ColumnarTrajectory: (columnar_trajectory_to_message, parse_columnar_trajectory),
+}
+
+
+# Fields converted by hand: (cls, field name) -> (encode, decode). encode gets
+# the field value and returns its message value, decode gets the whole message
+# dict of cls and returns the field value. None keeps the generated conversion.
+
+
+def decode_actual_move(move_recv: dict[str, Any]) -> ActualMove | Concede:
+    """Convert the actual move of the last move to data class
+
+    Args:
+        move_recv (dict[str, Any]): "actual_move" of the last move
+
+    Returns:
+        ActualMove | Concede: shot or concede
+    """
+    cmd_type = move_recv["type"]
+    if cmd_type == "shot":
+        return decoder(ActualMove)(move_recv)
+    if cmd_type != "concede":
+        raise Exception(f"cmd_type is not concede. cmd_type : {cmd_type}")
+    return Concede()
+
+
+def decode_trajectory(last_move_recv: dict[str, Any]) -> Trajectory | None:
+    """Convert the trajectory of the last move to data class
+
+    Args:
+        last_move_recv (dict[str, Any]): "last_move" of the update message
+
+    Returns:
+        Trajectory | None: trajectory, None if the message has none (or it was dropped), empty if the move is a concede
+    """
+    trajectory_recv = last_move_recv.get("trajectory")
+    if trajectory_recv is None:
+        return None
+    if last_move_recv["actual_move"]["type"] == "shot":
+        return decoder(Trajectory)(trajectory_recv)
+    return Trajectory(
+        seconds_per_frame=trajectory_recv["seconds_per_frame"],
+        start=Start(team0=[], team1=[]),
+        finish=Finish(team0=[], team1=[]),
+        frames=[],
+    )
+
+
+def decode_frame(frame_recv: dict[str, Any] | None) -> Frame:
+    """Convert one trajectory frame entry to data class
+
+    Args:
+        frame_recv (dict[str, Any] | None): frame entry
+
+    Returns:
+        Frame: position and angle of the stone that moved
+    """
+    if frame_recv is None:
+        return Frame(team=None, index=None, value=_decode_coordinate(None))
+    return decoder(Frame)(frame_recv)
+
+
+def _encode_frame(frame: Frame) -> dict[str, Any] | None:
+    # decode_frame() builds an empty frame for a None entry
+    if frame.team is None and frame.index is None:
+        return None
+    return encoder(Frame)(frame)
+
+
+def _encode_frames(
+    frames: list[list[Frame]] | None,
+) -> list[list[dict[str, Any] | None]] | None:
+    # one list per simulation step, with an entry per stone that moved
+    if frames is None:
+        return None
+    return [[_encode_frame(frame) for frame in step] for step in frames]
+
+
+def _decode_frames(trajectory_recv: dict[str, Any]) -> list[list[Frame]]:
+    decode = decoder(Frame)
+    return [
+        [decode_frame(frame) if frame is None else decode(frame) for frame in step]
+        for step in trajectory_recv["frames"]
+    ]
+
+
+def _encode_game_result(game_result: GameResult) -> dict[str, Any] | None:
+    # None until the match is over
+    if game_result.winner is None and game_result.reason is None:
+        return None
+    return {"winner": game_result.winner, "reason": game_result.reason}
+
+
+def _decode_game_result(state_recv: dict[str, Any]) -> GameResult:
+    game_result = state_recv["game_result"]
+    if game_result is None:
+        return GameResult(winner=None, reason=None)
+    return GameResult(winner=game_result["winner"], reason=game_result["reason"])
+
+
+def _decode_last_actual_move(last_move_recv: dict[str, Any]) -> ActualMove | Concede:
+    return decode_actual_move(last_move_recv["actual_move"])
+
+
+def _decode_seed(player_recv: dict[str, Any]) -> None:
+    return None
+
+
+_FIELD_HOOKS: dict[tuple[type, str], tuple[Callable | None, Callable | None]] = {
+    (State, "game_result"): (_encode_game_result, _decode_game_result),
+    (State, "_board"): (SKIP, None),
+    (LastMove, "actual_move"): (None, _decode_last_actual_move),
+    (LastMove, "trajectory"): (None, decode_trajectory),
+    (Trajectory, "frames"): (_encode_frames, _decode_frames),
+    (PlayerInfo, "seed"): (None, _decode_seed),
+}
+
+
+def _bind(namespace: dict[str, Any], value: Any) -> str:
+    """name under which the generated code reaches value"""
+    name = f"_f{len(namespace)}"
+    namespace[name] = value
+    return name
+
+
+def _optional(tp: Any) -> tuple[Any, bool]:
+    """(inner type, True) for X | None, else (tp, False)"""
+    if typing.get_origin(tp) in (typing.Union, types.UnionType):
+        args = [arg for arg in typing.get_args(tp) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0], True
+    return tp, False
+
+
+def _encode_expr(tp: Any, expr: str, namespace: dict[str, Any], depth: int) -> str:
+    """source that converts expr of type tp to its message value"""
+    if tp in _CLASS_CODECS:
+        return f"{_bind(namespace, _CLASS_CODECS[tp][0])}({expr})"
+    if is_dataclass(tp):
+        return f"{_bind(namespace, encoder(tp))}({expr})"
+
+    inner, optional = _optional(tp)
+    if optional:
+        value = _encode_expr(inner, f"_v{depth}", namespace, depth + 1)
+        if value == f"_v{depth}":
+            return expr
+        return f"(None if (_v{depth} := {expr}) is None else {value})"
+
+    origin = typing.get_origin(tp)
+    if origin is list:
+        (item,) = typing.get_args(tp) or (Any,)
+        value = _encode_expr(item, f"_v{depth}", namespace, depth + 1)
+        if value == f"_v{depth}":
+            return expr
+        return f"[{value} for _v{depth} in {expr}]"
+    if origin in (typing.Union, types.UnionType):
+        # pick the serializer of the class the value turns out to be
+        name = _bind(namespace, to_dict)
+        if type(None) not in typing.get_args(tp):
+            return f"{name}({expr})"
+        return f"(None if (_v{depth} := {expr}) is None else {name}(_v{depth}))"
+    return expr
+
+
+def _decode_expr(tp: Any, expr: str, namespace: dict[str, Any], depth: int) -> str:
+    """source that builds a value of type tp from the message value expr"""
+    if tp in _CLASS_CODECS:
+        return f"{_bind(namespace, _CLASS_CODECS[tp][1])}({expr})"
+    if is_dataclass(tp):
+        return f"{_bind(namespace, decoder(tp))}({expr})"
+
+    inner, optional = _optional(tp)
+    if optional:
+        if inner in _CLASS_CODECS:  # the class codec decodes None itself
+            return _decode_expr(inner, expr, namespace, depth)
+        value = _decode_expr(inner, f"_v{depth}", namespace, depth + 1)
+        if value == f"_v{depth}":
+            return expr
+        return f"(None if (_v{depth} := {expr}) is None else {value})"
+
+    origin = typing.get_origin(tp)
+    if origin is list:
+        (item,) = typing.get_args(tp) or (Any,)
+        value = _decode_expr(item, f"_v{depth}", namespace, depth + 1)
+        if value == f"_v{depth}":
+            return expr
+        return f"[{value} for _v{depth} in {expr}]"
+    if origin in (typing.Union, types.UnionType):
+        raise TypeError(f"{tp} needs a field hook to be decoded")
+    return expr
+
+
+def _compile(source: str, namespace: dict[str, Any], name: str) -> Callable:
+    exec(compile(source, f"<dc3client.serialize {name}>", "exec"), namespace)
+    return namespace[name]
+
+
+def _generate_encoder(cls: type) -> Encoder:
+    if cls in _CLASS_CODECS:
+        return _CLASS_CODECS[cls][0]
+    if not is_dataclass(cls):
+        raise TypeError(f"{cls!r} is not a data class")
+
+    namespace: dict[str, Any] = {}
+    items = []
+    for f in fields(cls):
+        hook, _ = _FIELD_HOOKS.get((cls, f.name), (None, None))
+        if hook is SKIP:
+            continue
+        if hook is not None:
+            value = f"{_bind(namespace, hook)}(obj.{f.name})"
+        else:
+            value = _encode_expr(f.type, f"obj.{f.name}", namespace, 0)
+        items.append(f"        {wire_name(f)!r}: {value},")
+
+    lines = [f"def encode_{cls.__name__}(obj):", "    return {", *items, "    }"]
+    return _compile("\n".join(lines), namespace, f"encode_{cls.__name__}")
+
+
+def _generate_decoder(cls: type) -> Decoder:
+    if cls in _CLASS_CODECS:
+        return _CLASS_CODECS[cls][1]
+    if not is_dataclass(cls):
+        raise TypeError(f"{cls!r} is not a data class")
+
+    namespace: dict[str, Any] = {"cls": cls}
+    arguments = []
+    for f in fields(cls):
+        if not f.init:
+            continue
+        _, hook = _FIELD_HOOKS.get((cls, f.name), (None, None))
+        if hook is not None:
+            value = f"{_bind(namespace, hook)}(message)"
+        else:
+            value = _decode_expr(f.type, f"message[{wire_name(f)!r}]", namespace, 0)
+        arguments.append(f"        {value},")  # positional, in the order of __init__
+
+    lines = [
+        f"def decode_{cls.__name__}(message):",
+        "    return cls(",
+        *arguments,
+        "    )",
+    ]
+    return _compile("\n".join(lines), namespace, f"decode_{cls.__name__}")
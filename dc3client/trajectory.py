@@ -0,0 +1,190 @@
+"""Columnar NumPy storage of shot trajectories.
+
+The server sends a trajectory as its start and finish placements plus, for
+every ``seconds_per_frame`` step, the stones that changed in that step with
+their new absolute position (None once a stone is removed). Instead of one
+Frame, Coordinate and Position object per entry, ``ColumnarTrajectory`` keeps
+the entries in a single structured array, and ``positions()`` replays them with
+a vectorized forward fill into the placement of all 16 stones at every step.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from dc3client.board import (
+    STONES_PER_TEAM,
+    TEAMS,
+    Board,
+    board_to_stones,
+    parse_board,
+)
+
+# One row per stone that changed in a frame
+FRAME_DTYPE = np.dtype(
+    [
+        ("frame", np.int32),
+        ("team", np.int8),
+        ("index", np.int8),
+        ("x", np.float64),
+        ("y", np.float64),
+        ("angle", np.float64),
+    ]
+)
+
+_TEAM_INDEX = {team: t for t, team in enumerate(TEAMS)}
+_N_STONES = len(TEAMS) * STONES_PER_TEAM
+
+
+@dataclass(slots=True, eq=False)
+class ColumnarTrajectory:
+    """Trajectory of the last shot as arrays"""
+
+    seconds_per_frame: float | None
+    # (2, 8, 3) x, y and angle at the start and at the finish, NaN for stones not in play
+    start: np.ndarray
+    finish: np.ndarray
+    # FRAME_DTYPE entries, x, y and angle are NaN for a stone removed in that frame
+    frames: np.ndarray
+    n_frames: int
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ColumnarTrajectory):
+            return NotImplemented
+        return (
+            self.seconds_per_frame == other.seconds_per_frame
+            and self.n_frames == other.n_frames
+            and np.array_equal(self.start, other.start, equal_nan=True)
+            and np.array_equal(self.finish, other.finish, equal_nan=True)
+            and self.frames.tobytes() == other.frames.tobytes()
+        )
+
+    def __len__(self) -> int:
+        """number of frames"""
+        return self.n_frames
+
+    def times(self) -> np.ndarray:
+        """(n_frames + 1,) time of each row of positions() in seconds"""
+        return np.arange(self.n_frames + 1) * (self.seconds_per_frame or 0.0)
+
+    def positions(self) -> np.ndarray:
+        """absolute placement of every stone at every step
+
+        Returns:
+            np.ndarray: (n_frames + 1, 2, 8, 3) x, y and angle, row 0 is the start
+                and row i the placement after frame i - 1, NaN for stones not in play
+        """
+        return decode_positions(self.start, self.frames, self.n_frames)
+
+
+def decode_positions(
+    start: np.ndarray, frames: np.ndarray, n_frames: int
+) -> np.ndarray:
+    """replay trajectory frames from the start placement
+
+    Every stone keeps its last written value until a later frame changes it,
+    which is a forward fill along the frame axis done with one
+    ``np.maximum.accumulate`` over the row index of the last write.
+
+    Args:
+        start (np.ndarray): (2, 8, 3) placement at the start.
+        frames (np.ndarray): FRAME_DTYPE entries.
+        n_frames (int): Number of frames.
+
+    Returns:
+        np.ndarray: (n_frames + 1, 2, 8, 3) placement, row 0 is the start
+    """
+    values = np.empty((n_frames + 1, _N_STONES, 3), dtype=np.float64)
+    written = np.zeros((n_frames + 1, _N_STONES), dtype=bool)
+    values[0] = start.reshape(_N_STONES, 3)
+    written[0] = True
+
+    rows = frames["frame"].astype(np.intp) + 1
+    slots = frames["team"].astype(np.intp) * STONES_PER_TEAM + frames["index"]
+    values[rows, slots, 0] = frames["x"]
+    values[rows, slots, 1] = frames["y"]
+    values[rows, slots, 2] = frames["angle"]
+    written[rows, slots] = True
+
+    last = np.where(written, np.arange(n_frames + 1)[:, None], 0)
+    np.maximum.accumulate(last, axis=0, out=last)
+    placement = values[last, np.arange(_N_STONES)]
+    return placement.reshape(n_frames + 1, len(TEAMS), STONES_PER_TEAM, 3)
+
+
+def parse_columnar_trajectory(
+    trajectory_recv: dict[str, Any] | None,
+) -> ColumnarTrajectory | None:
+    """Convert the trajectory of the wire message to ColumnarTrajectory
+
+    Args:
+        trajectory_recv (dict[str, Any] | None): "trajectory" of the last move
+
+    Returns:
+        ColumnarTrajectory | None: trajectory, None if the message has none
+    """
+    if trajectory_recv is None:
+        return None
+
+    nan = np.nan
+    rows = []
+    frames_recv = trajectory_recv.get("frames") or []
+    for f, changes in enumerate(frames_recv):
+        for change in changes:
+            if change is None or change.get("team") not in _TEAM_INDEX:
+                continue
+            value = change.get("value")
+            if value is None:
+                rows.append(
+                    (f, _TEAM_INDEX[change["team"]], change["index"], nan, nan, nan)
+                )
+            else:
+                position = value["position"]
+                rows.append(
+                    (
+                        f,
+                        _TEAM_INDEX[change["team"]],
+                        change["index"],
+                        position["x"],
+                        position["y"],
+                        value["angle"],
+                    )
+                )
+
+    empty = {team: [None] * STONES_PER_TEAM for team in TEAMS}
+    return ColumnarTrajectory(
+        seconds_per_frame=trajectory_recv.get("seconds_per_frame"),
+        start=parse_board(trajectory_recv.get("start") or empty).array,
+        finish=parse_board(trajectory_recv.get("finish") or empty).array,
+        frames=np.array(rows, dtype=FRAME_DTYPE),
+        n_frames=len(frames_recv),
+    )
+
+
+def columnar_trajectory_to_message(trajectory: ColumnarTrajectory) -> dict[str, Any]:
+    """Convert ColumnarTrajectory back to the "trajectory" of the wire message
+
+    Args:
+        trajectory (ColumnarTrajectory): trajectory
+
+    Returns:
+        dict[str, Any]: trajectory message
+    """
+    frames: list[list[dict[str, Any]]] = [[] for _ in range(trajectory.n_frames)]
+    for f, t, index, x, y, angle in trajectory.frames.tolist():
+        value = None
+        if x == x:  # not NaN
+            value = {"angle": angle, "position": {"x": x, "y": y}}
+        frames[f].append({"team": TEAMS[t], "index": index, "value": value})
+
+    return {
+        "seconds_per_frame": trajectory.seconds_per_frame,
+        "start": board_to_stones(_board(trajectory.start)),
+        "finish": board_to_stones(_board(trajectory.finish)),
+        "frames": frames,
+    }
+
+
+def _board(array: np.ndarray) -> Board:
+    return Board(array=array, in_play=~np.isnan(array[..., 0]))
@@ -1,4 +1,3 @@
-import json
 import pathlib
 
 from dc3client import SocketClient
@@ -32,25 +31,25 @@ if __name__ == "__main__":
     # auto_start : サーバーに接続した際に自動で試合を開始するかどうかを指定します。デフォルトではTrueとなっています。
     # これは、dc3のコンバート機能のみを使用したいときにサーバーを起動する必要をなくすために用意されています。
     # rate_limit : 通信のレート制限を指定します。デフォルトでは0.2秒に1回となっています。早すぎるとサーバーから切断される可能性があります。
-    cli = SocketClient(host="dc3-server", port=10000, client_name="SAMPLE_AI0", auto_start=True, rate_limit=0.2)
+    # record : 受信したメッセージを、受信するたびにNDJSON形式でファイルへ書き込みます。".gz"で終わるとgzipで圧縮します。
+    # 書き込みはバックグラウンドのスレッドで行われるため、試合の進行を妨げず、途中で異常終了してもそれまでのデータが残ります。
 
     # ログを出力するディレクトリを指定します。デフォルトでは"logs/"となっています。
     log_dir = pathlib.Path("logs")
 
-    # データ保存時に、軌跡データを削除するかどうかを指定します。デフォルトではTrueとなっています。
-    # 軌跡データを保存すると容量が膨大になるため、必要ない場合はTrueにしてください。
-    remove_trajectory = True
+    cli = SocketClient(
+        host="dc3-server",
+        port=10000,
+        client_name="SAMPLE_AI0",
+        auto_start=True,
+        rate_limit=0.2,
+        record=log_dir / "match.ndjson.gz",
+    )
 
     # 自分がteam0かteam1かを取得します
     my_team = cli.get_my_team()
     cli.logger.info(f"my_team :{my_team}")
 
-    # dcやis_readyをdataclass形式で取得し、保存しやすいようにdict形式に変換します。
-    dc = cli.get_dc()
-    dc_message = cli.convert_dc(dc)
-    is_ready = cli.get_is_ready()
-    is_ready_message = cli.convert_is_ready(is_ready)
-
     # 試合を開始します
     while True:
 
@@ -92,17 +91,9 @@ if __name__ == "__main__":
             # 次のチームが自分のチームでなければ、何もしません
             continue
 
-    # 試合が終了したら、clientから試合データを取得します
-    move_info = cli.get_move_info()
-    update_list, trajectory_list = cli.get_update_and_trajectory(remove_trajectory)
-
-    # 試合データを保存します、
-    update_dict = {}
-
-    for update in update_list:
-        # updateをdict形式に変換します
-        update_dict = cli.convert_update(update, remove_trajectory)
+    # 試合データは、受信するたびにrecordで指定したlogs/match.ndjson.gzへ保存されています
+    # 試合終了後にまとめて変換・保存する必要はありません
+    # 保存したデータは、dc3client.recorder.iter_recordsで1メッセージずつ読み込めます
 
-    # updateを保存します、どのように保存するかは任意です
-    with open("data.json", "w", encoding="UTF-8") as f:
-        json.dump(update_dict, f, indent=4)
+    # 記録を終了し、接続を閉じます
+    cli.close()
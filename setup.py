@@ -13,6 +13,7 @@ LICENSE = "MIT"
 DOWNLOAD_URL = URL
 VERSION = "0.0.9"
 INSTALL_REQUIRES = ["numpy >= 1.25.1 , < 2.0.0"]
+EXTRAS_REQUIRE = {"fast": ["orjson"]}
 PACKAGES = ["dc3client"]
 KEYWORDS = "digital-curing3 dc3client"
 CLASSIFIERS = [
@@ -41,4 +42,5 @@ setup(
     license=LICENSE,
     keywords=KEYWORDS,
     install_requires=INSTALL_REQUIRES,
+    extras_require=EXTRAS_REQUIRE,
 )